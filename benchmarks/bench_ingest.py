@@ -0,0 +1,368 @@
+"""
+Ingest benchmark suite: each ingest stage in isolation plus ``run_pipeline`` end to end.
+
+Usage:
+    python -m benchmarks.bench_ingest --items 1000 --sources 8 --output results.json
+    python -m benchmarks.bench_ingest --output new.json --baseline results.json
+
+Feeds are served by ``benchmarks.fixture_server`` on 127.0.0.1 with the given latency and
+error rate, so no network is involved. Each case keeps the best of ``--repeat`` timings.
+Results are printed as JSON lines and, with ``--output``, saved together with the commit,
+Python and DuckDB versions. ``--baseline`` compares against an earlier results file and
+exits non-zero when a case got slower by more than ``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import duckdb
+import yaml
+
+from benchmarks.fixture_server import FixtureServer, make_estat, make_rss
+from src.app import pipeline
+from src.app.ingest.estat import iter_estat_observations, parse_estat
+from src.app.ingest.rss import parse_rss
+from src.storage.db import connect
+from src.storage.items import upsert_items
+from src.storage.migrate import init_db
+from src.storage.queries import get_source_health
+
+SOURCE = {"id": "bench", "name": "Bench", "category": "jp", "kind": "rss", "url": ""}
+
+
+def _best_of(
+    repeat: int, func: Callable[[], object], setup: Optional[Callable[[], object]] = None
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _result(benchmark: str, seconds: float, items: int, **params) -> dict:
+    return {
+        "benchmark": benchmark,
+        **params,
+        "items": items,
+        "seconds": round(seconds, 5),
+        "us_per_item": round(seconds / max(items, 1) * 1e6, 2),
+    }
+
+
+@contextmanager
+def _env(**values: str) -> Iterator[None]:
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def bench_parsers(items: int, repeat: int) -> list[dict]:
+    rss = make_rss(items).decode("utf-8")
+    atom = make_rss(items, atom=True).decode("utf-8")
+    estat = make_estat(items).decode("utf-8")
+    estat_source = {**SOURCE, "kind": "estat_api"}
+    return [
+        _result("parse_rss", _best_of(repeat, lambda: parse_rss(rss, SOURCE)), items),
+        _result("parse_atom", _best_of(repeat, lambda: parse_rss(atom, SOURCE)), items),
+        _result("parse_estat", _best_of(repeat, lambda: parse_estat(estat, estat_source)), items),
+        _result(
+            "parse_estat_observations",
+            _best_of(repeat, lambda: list(iter_estat_observations([estat], estat_source))),
+            items,
+        ),
+    ]
+
+
+def bench_dedupe(items: int, repeat: int) -> dict:
+    parsed = parse_rss(make_rss(items).decode("utf-8"), SOURCE)
+    # Every tenth item arrives twice, as when a feed repeats entries.
+    batch = parsed + parsed[::10]
+    return _result(
+        "dedupe_items", _best_of(repeat, lambda: pipeline._dedupe_items(batch)), len(batch)
+    )
+
+
+def bench_upsert(items: int, repeat: int, workdir: Path) -> list[dict]:
+    parsed = parse_rss(make_rss(items).decode("utf-8"), SOURCE)
+    edited = [{**item, "title": item["title"] + " (updated)"} for item in parsed]
+    db_path = workdir / "upsert.duckdb"
+    conn = None
+
+    def fresh_db() -> None:
+        nonlocal conn
+        if conn is not None:
+            conn.close()
+        db_path.unlink(missing_ok=True)
+        init_db(db_path=db_path)
+        conn = connect(db_path)
+
+    def write(run_id: str, rows: list[dict]) -> None:
+        conn.execute("BEGIN TRANSACTION")
+        upsert_items(conn, run_id, rows)
+        conn.execute("COMMIT")
+
+    insert = _best_of(repeat, lambda: write("r1", parsed), setup=fresh_db)
+    write("r1", parsed)
+    unchanged = _best_of(repeat, lambda: write("r2", parsed))
+    changed = _best_of(1, lambda: write("r3", edited))
+    conn.close()
+    return [
+        _result("upsert_items", insert, items, case="insert"),
+        _result("upsert_items", unchanged, items, case="unchanged"),
+        _result("upsert_items", changed, items, case="changed"),
+    ]
+
+
+def bench_write_exports(items: int, repeat: int, workdir: Path) -> dict:
+    stats = {
+        "run_id": "bench",
+        "sources": {f"source_{i}": {"status": "success", "count": 10} for i in range(50)},
+    }
+    alerts = [
+        {"run_id": "bench", "alert_type": "score", "message": f"alert {i}", "url": f"u/{i}"}
+        for i in range(items)
+    ]
+    with _env(APP_OUTPUT_ROOT=str(workdir / "exports")):
+        seconds = _best_of(repeat, lambda: pipeline._write_exports("bench", stats, alerts))
+    return _result("write_exports", seconds, items)
+
+
+def bench_source_health(runs: int, sources: int, repeat: int, workdir: Path) -> dict:
+    db_path = workdir / "health.duckdb"
+    init_db(db_path=db_path)
+    conn = connect(db_path)
+    started = datetime(2024, 1, 1)
+    conn.execute(
+        """
+        INSERT INTO fact_run (run_id, started_at, ended_at, status, run_mode, params_json)
+        SELECT 'run-' || r, ? + to_hours(r), ? + to_hours(r), 'success', 'bench', '{}'
+        FROM range(?) AS t(r)
+        """,
+        [started, started, runs],
+    )
+    conn.execute(
+        """
+        INSERT INTO fact_source_run (
+            run_id, source_id, started_at, ended_at, status, item_count
+        )
+        SELECT
+            'run-' || r, 'source_' || s, ? + to_hours(r), ? + to_hours(r) + to_seconds(2),
+            CASE WHEN (r + s) % 7 = 0 THEN 'failed' ELSE 'success' END, 10
+        FROM range(?) AS t(r), range(?) AS u(s)
+        """,
+        [started, started, runs, sources],
+    )
+    latest = f"run-{runs - 1}"
+    seconds = _best_of(repeat, lambda: get_source_health(conn, latest))
+    conn.close()
+    return _result("get_source_health", seconds, runs * sources, runs=runs, sources=sources)
+
+
+def bench_pipeline(
+    server: FixtureServer,
+    sources: int,
+    items: int,
+    latency_ms: int,
+    error_rate: float,
+    workdir: Path,
+    estat_page_size: int | None = None,
+) -> dict:
+    config_dir = workdir / "config"
+    config_dir.mkdir(exist_ok=True)
+    entries = []
+    for i in range(sources):
+        # Every fourth source is an e-Stat table; the rest alternate RSS and Atom.
+        if i % 4 == 3:
+            entries.append(
+                {
+                    "id": f"estat_{i}",
+                    "name": f"e-Stat {i}",
+                    "category": "stats",
+                    "kind": "estat_api",
+                    "url": server.url("/estat"),
+                    "params": {
+                        "app_id": "bench",
+                        "stats_data_id": str(i),
+                        "query": {
+                            "values": items,
+                            "seed": i,
+                            "latency_ms": latency_ms,
+                            "error_rate": error_rate,
+                            **({"limit": estat_page_size} if estat_page_size else {}),
+                        },
+                    },
+                }
+            )
+            continue
+        path = "/atom" if i % 2 else "/rss"
+        entries.append(
+            {
+                "id": f"feed_{i}",
+                "name": f"Feed {i}",
+                "category": "jp",
+                "kind": "rss",
+                "url": server.url(
+                    path, items=items, seed=i, latency_ms=latency_ms, error_rate=error_rate
+                ),
+            }
+        )
+    # All sources share 127.0.0.1, so lift the per-host limit to the global one.
+    fetch = {"max_concurrency": 8, "per_host_limit": 8}
+    (config_dir / "sources.yml").write_text(
+        yaml.safe_dump({"fetch": fetch, "sources": entries}), encoding="utf-8"
+    )
+
+    with _env(
+        APP_DB_PATH=str(workdir / "pipeline.duckdb"),
+        APP_OUTPUT_ROOT=str(workdir / "runs"),
+        RUN_ID="bench-run",
+    ):
+        started = time.perf_counter()
+        run_id, output_dir = pipeline.run_pipeline(config_dir=config_dir, overwrite_run=True)
+        seconds = time.perf_counter() - started
+    stats = json.loads((output_dir / "run_stats.json").read_text(encoding="utf-8"))
+    stages: dict = {}
+    for span in stats.get("stages", []):
+        if span["source_id"] is None:
+            stages[span["stage"]] = span["wall_ms"]
+    return {
+        **_result(
+            "run_pipeline",
+            seconds,
+            stats["item_count"],
+            sources=sources,
+            items_per_source=items,
+            latency_ms=latency_ms,
+            error_rate=error_rate,
+            estat_page_size=estat_page_size,
+        ),
+        "status": stats["status"],
+        "failed_sources": sum(1 for s in stats["sources"].values() if s["status"] == "failed"),
+        "stage_wall_ms": stages,
+    }
+
+
+def _case_key(result: dict) -> str:
+    params = {
+        key: value
+        for key, value in result.items()
+        if key not in ("seconds", "us_per_item", "status", "failed_sources", "stage_wall_ms")
+    }
+    return json.dumps(params, sort_keys=True)
+
+
+def compare(results: list[dict], baseline: list[dict], tolerance: float) -> list[dict]:
+    """Cases at least ``tolerance`` (0.25 = 25%) slower than in ``baseline``."""
+    previous = {_case_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get(_case_key(result))
+        if before and result["seconds"] > before["seconds"] * (1 + tolerance):
+            regressions.append(
+                {
+                    "benchmark": result["benchmark"],
+                    "case": _case_key(result),
+                    "baseline_seconds": before["seconds"],
+                    "seconds": result["seconds"],
+                    "ratio": round(result["seconds"] / max(before["seconds"], 1e-9), 2),
+                }
+            )
+    return regressions
+
+
+def _metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "duckdb": duckdb.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def run(args: argparse.Namespace) -> list[dict]:
+    results: list[dict] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        results.extend(bench_parsers(args.items, args.repeat))
+        results.append(bench_dedupe(args.items, args.repeat))
+        results.extend(bench_upsert(args.items, args.repeat, workdir))
+        results.append(bench_write_exports(args.items, args.repeat, workdir))
+        results.append(bench_source_health(args.health_runs, args.sources, args.repeat, workdir))
+        with FixtureServer(seed=args.seed) as server:
+            results.append(
+                bench_pipeline(
+                    server,
+                    args.sources,
+                    args.items,
+                    args.latency_ms,
+                    args.error_rate,
+                    workdir,
+                    args.estat_page_size,
+                )
+            )
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=1_000, help="Items per feed / stage")
+    parser.add_argument("--sources", type=int, default=8)
+    parser.add_argument("--latency-ms", type=int, default=20)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--estat-page-size", type=int, default=None, help="Rows per e-Stat response (paged)"
+    )
+    parser.add_argument("--health-runs", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results (with metadata) to this JSON file")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    for result in results:
+        print(json.dumps(result))
+    if args.output:
+        document = {"metadata": _metadata(), "results": results}
+        Path(args.output).write_text(json.dumps(document, indent=2), encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(json.dumps({"regression": regression}))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
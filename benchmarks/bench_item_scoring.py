@@ -0,0 +1,83 @@
+"""
+Item scoring benchmark: the set-based ``score_run_items`` statement per run size.
+
+Usage:
+    python -m benchmarks.bench_item_scoring --sizes 1000 10000 100000
+
+Items are loaded with ``upsert_items`` (not timed), then scored with one rule of every
+feature type; the second scoring pass measures re-scoring an already scored run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_item_upsert import make_items
+from src.core.config_schema import ScoringConfig
+from src.storage.db import connect
+from src.storage.items import upsert_items
+from src.storage.migrate import init_db
+from src.storage.scoring import score_run_items
+
+CONFIG = ScoringConfig(
+    default_score=0.1,
+    rules=[
+        {"name": "base", "feature": "constant", "weight": 0.5},
+        {"name": "fresh", "feature": "recency", "weight": 2.0, "half_life_hours": 12},
+        {"name": "watch", "feature": "watchlist", "weight": 1.5},
+        {"name": "jp", "feature": "category", "values": ["jp"]},
+        {"name": "wires", "feature": "source", "values": ["source_1", "source_2"]},
+        {"name": "terms", "feature": "keyword", "values": ["item 1", "revision", "yen"]},
+    ],
+)
+
+
+def _time_score(conn, run_id: str) -> float:
+    started = time.perf_counter()
+    conn.execute("BEGIN TRANSACTION")
+    score_run_items(conn, run_id, CONFIG)
+    conn.execute("COMMIT")
+    return time.perf_counter() - started
+
+
+def bench_size(size: int, workdir: Path) -> dict:
+    db_path = workdir / f"scoring-{size}.duckdb"
+    init_db(db_path=db_path)
+    conn = connect(db_path)
+    try:
+        upsert_items(conn, "bench-1", make_items(size))
+        conn.execute(
+            """
+            INSERT INTO fact_item_match (run_id, source_id, url, entity, hit_count)
+            SELECT run_id, source_id, url, 'entity', 1 FROM items USING SAMPLE 10 PERCENT
+            """
+        )
+        first = _time_score(conn, "bench-1")
+        again = _time_score(conn, "bench-1")
+    finally:
+        conn.close()
+    return {
+        "benchmark": "item_scoring",
+        "items": size,
+        "rules": len(CONFIG.rules),
+        "score_seconds": round(first, 4),
+        "rescore_seconds": round(again, 4),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            print(json.dumps(bench_size(size, Path(tmp))))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
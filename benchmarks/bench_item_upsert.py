@@ -0,0 +1,143 @@
+"""
+Item upsert benchmark: per-row ``INSERT ... ON CONFLICT`` vs. the staged bulk path.
+
+Usage:
+    python -m benchmarks.bench_item_upsert --sizes 1000 10000 100000 --rowwise-max 10000
+
+Each size runs against a fresh on-disk DuckDB file: one insert pass (all rows new), one
+update pass (all rows conflict with changed content) and one unchanged pass (the same
+content fetched again, the steady-state daily run for most feeds). ``db_bytes`` is the
+file size after the three passes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src.storage.db import connect
+from src.storage.items import upsert_items
+from src.storage.migrate import init_db
+
+
+def make_items(count: int, revision: int = 0) -> list[dict]:
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "source_id": f"source_{i % 50}",
+            "source_name": f"Source {i % 50}",
+            "category": "jp",
+            "kind": "rss",
+            "title": f"Item {i} rev {revision}",
+            "summary": f"Summary for item {i} revision {revision}",
+            "url": f"https://example.com/{i}",
+            "published_at": base + timedelta(minutes=i),
+            "fetched_at": base + timedelta(days=revision),
+        }
+        for i in range(count)
+    ]
+
+
+def upsert_items_rowwise(conn, run_id: str, items: list[dict]) -> None:
+    """The pre-bulk implementation: one statement per item."""
+    for item in items:
+        conn.execute(
+            """
+            INSERT INTO items (
+                run_id, source_id, source_name, category, kind,
+                title, summary, url, published_at, fetched_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (source_id, url) DO UPDATE SET
+                run_id = EXCLUDED.run_id,
+                source_name = EXCLUDED.source_name,
+                category = EXCLUDED.category,
+                kind = EXCLUDED.kind,
+                title = EXCLUDED.title,
+                summary = EXCLUDED.summary,
+                published_at = EXCLUDED.published_at,
+                fetched_at = EXCLUDED.fetched_at
+            """,
+            [
+                run_id,
+                item["source_id"],
+                item["source_name"],
+                item["category"],
+                item["kind"],
+                item["title"],
+                item["summary"],
+                item["url"],
+                item["published_at"],
+                item["fetched_at"],
+            ],
+        )
+
+
+def _time_pass(conn, writer, run_id: str, items: list[dict]) -> float:
+    started = time.perf_counter()
+    conn.execute("BEGIN TRANSACTION")
+    writer(conn, run_id, items)
+    conn.execute("COMMIT")
+    return time.perf_counter() - started
+
+
+def bench_size(size: int, rowwise: bool, workdir: Path) -> list[dict]:
+    writers = {"bulk": upsert_items}
+    if rowwise:
+        writers["rowwise"] = upsert_items_rowwise
+    results = []
+    for name, writer in writers.items():
+        db_path = workdir / f"{name}-{size}.duckdb"
+        init_db(db_path=db_path)
+        conn = connect(db_path)
+        try:
+            insert_seconds = _time_pass(conn, writer, "bench-1", make_items(size, 0))
+            update_seconds = _time_pass(conn, writer, "bench-2", make_items(size, 1))
+            unchanged_seconds = _time_pass(conn, writer, "bench-3", make_items(size, 1))
+        finally:
+            conn.close()
+        results.append(
+            {
+                "benchmark": "item_upsert",
+                "writer": name,
+                "items": size,
+                "insert_seconds": round(insert_seconds, 4),
+                "update_seconds": round(update_seconds, 4),
+                "unchanged_seconds": round(unchanged_seconds, 4),
+                "insert_us_per_item": round(insert_seconds / size * 1e6, 2),
+                "update_us_per_item": round(update_seconds / size * 1e6, 2),
+                "db_bytes": db_path.stat().st_size,
+            }
+        )
+    return results
+
+
+def run(sizes: list[int], rowwise_max: int) -> list[dict]:
+    results: list[dict] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            results.extend(bench_size(size, size <= rowwise_max, Path(tmp)))
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument(
+        "--rowwise-max",
+        type=int,
+        default=10_000,
+        help="Largest size to also run through the per-row writer (it is slow)",
+    )
+    args = parser.parse_args(argv)
+    for row in run(args.sizes, args.rowwise_max):
+        print(json.dumps(row))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+"""
+Near-duplicate clustering benchmark: cost of clustering one run against growing history.
+
+Usage:
+    python -m benchmarks.bench_near_dup --history 1000 10000 100000 --run-size 500
+
+History is built by clustering runs of ``--batch`` items (not timed). The timed run
+holds ``--run-size`` new items, a fifth of them reworded copies of history items; with
+LSH buckets its cost and the candidates compared per item should stay roughly flat as
+history grows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.storage.db import connect
+from src.storage.items import upsert_items
+from src.storage.migrate import init_db
+from src.storage.near_dup import cluster_run_items
+
+VOCABULARY = [f"w{i}" for i in range(5000)]
+
+
+def make_story(rng: random.Random) -> tuple[str, str]:
+    return " ".join(rng.sample(VOCABULARY, 8)), " ".join(rng.sample(VOCABULARY, 20))
+
+
+def reword(story: tuple[str, str], rng: random.Random) -> tuple[str, str]:
+    title, summary = story
+    words = summary.split()
+    words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+    return title, " ".join(words[:-2])
+
+
+def make_items(stories: list[tuple[str, str]], prefix: str, start: int) -> list[dict]:
+    base = datetime(2024, 1, 1)
+    return [
+        {
+            "source_id": f"source_{i % 50}",
+            "source_name": f"Source {i % 50}",
+            "category": "jp",
+            "kind": "rss",
+            "title": title,
+            "summary": summary,
+            "url": f"https://example.com/{prefix}/{start + i}",
+            "published_at": base + timedelta(minutes=start + i),
+            "fetched_at": base + timedelta(minutes=start + i),
+        }
+        for i, (title, summary) in enumerate(stories)
+    ]
+
+
+def _cluster(conn, run_id: str, items: list[dict]) -> dict:
+    conn.execute("BEGIN TRANSACTION")
+    upsert_items(conn, run_id, items)
+    stats = cluster_run_items(conn, run_id)
+    conn.execute("COMMIT")
+    return stats
+
+
+def bench_history(history: int, run_size: int, batch: int, workdir: Path) -> dict:
+    rng = random.Random(history)
+    db_path = workdir / f"near-dup-{history}.duckdb"
+    init_db(db_path=db_path)
+    conn = connect(db_path)
+    try:
+        stories = [make_story(rng) for _ in range(history)]
+        for start in range(0, history, batch):
+            chunk = stories[start : start + batch]
+            _cluster(conn, f"history-{start}", make_items(chunk, "h", start))
+
+        copies = [reword(rng.choice(stories), rng) for _ in range(run_size // 5)]
+        fresh = [make_story(rng) for _ in range(run_size - len(copies))]
+        items = make_items(copies + fresh, "new", history)
+        started = time.perf_counter()
+        stats = _cluster(conn, "bench-new", items)
+        elapsed = time.perf_counter() - started
+    finally:
+        conn.close()
+    return {
+        "benchmark": "near_dup",
+        "history": history,
+        "run_items": run_size,
+        "seconds": round(elapsed, 4),
+        "candidates_per_item": round(stats["candidates"] / run_size, 3),
+        "duplicates": stats["duplicates"],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--history", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--run-size", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=5_000)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        for history in args.history:
+            print(json.dumps(bench_history(history, args.run_size, args.batch, Path(tmp))))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
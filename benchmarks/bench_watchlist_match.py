@@ -0,0 +1,115 @@
+"""
+Watchlist matching benchmark: per-entity regex scan vs. the compiled automaton.
+
+Usage:
+    python -m benchmarks.bench_watchlist_match --entities 10 100 1000 10000 --items 2000
+
+Every size scans the same synthetic items, so the automaton's per-item cost should stay
+flat while the per-entity scan grows with the watchlist.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import time
+
+from src.core.config_schema import WatchEntity
+from src.core.watchlist import WatchlistMatcher
+
+_WORDS = "market rates exports yen policy shares growth outlook bank earnings".split()
+
+
+def make_entities(count: int) -> list[WatchEntity]:
+    return [WatchEntity(name=f"Entity{i} Holdings", aliases=[f"E{i}HD"]) for i in range(count)]
+
+
+def make_items(count: int, entity_count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        words = rng.choices(_WORDS, k=40)
+        words.insert(rng.randrange(len(words)), f"Entity{rng.randrange(entity_count)} Holdings")
+        items.append(
+            {
+                "source_id": "bench",
+                "url": f"https://example.com/{i}",
+                "title": " ".join(words[:8]),
+                "summary": " ".join(words[8:]),
+            }
+        )
+    return items
+
+
+class RegexScan:
+    """One compiled regex per entity name/alias, run over every field (the linear scan)."""
+
+    def __init__(self, entities: list[WatchEntity]):
+        self._patterns = [
+            (re.compile(rf"(?<!\w){re.escape(surface)}(?!\w)", re.IGNORECASE), entity.name)
+            for entity in entities
+            for surface in (entity.name, *entity.aliases)
+        ]
+
+    def match_item(self, item: dict) -> list[str]:
+        found = []
+        for field in ("title", "summary"):
+            for pattern, name in self._patterns:
+                if pattern.search(item[field]):
+                    found.append(name)
+        return found
+
+
+def _time_scan(matcher, items: list[dict]) -> float:
+    started = time.perf_counter()
+    for item in items:
+        matcher.match_item(item)
+    return time.perf_counter() - started
+
+
+def run(entity_counts: list[int], item_count: int, regex_max: int) -> list[dict]:
+    results = []
+    for entity_count in entity_counts:
+        entities = make_entities(entity_count)
+        items = make_items(item_count, entity_count)
+        started = time.perf_counter()
+        matchers = {"automaton": WatchlistMatcher(entities)}
+        build_seconds = time.perf_counter() - started
+        if entity_count <= regex_max:
+            matchers["regex_per_entity"] = RegexScan(entities)
+        for name, matcher in matchers.items():
+            seconds = _time_scan(matcher, items)
+            results.append(
+                {
+                    "benchmark": "watchlist_match",
+                    "matcher": name,
+                    "entities": entity_count,
+                    "items": item_count,
+                    "build_seconds": round(build_seconds, 4) if name == "automaton" else None,
+                    "scan_seconds": round(seconds, 4),
+                    "us_per_item": round(seconds / item_count * 1e6, 2),
+                }
+            )
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entities", type=int, nargs="+", default=[10, 100, 1_000, 10_000])
+    parser.add_argument("--items", type=int, default=2_000)
+    parser.add_argument(
+        "--regex-max",
+        type=int,
+        default=1_000,
+        help="Largest watchlist to also run through the per-entity regex scan (it is slow)",
+    )
+    args = parser.parse_args(argv)
+    for row in run(args.entities, args.items, args.regex_max):
+        print(json.dumps(row))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,200 @@
+"""
+Local HTTP stand-in for feed and e-Stat endpoints, used by the ingest benchmarks.
+
+Paths:
+    /rss?items=N      RSS 2.0 feed with N items
+    /atom?items=N     Atom feed with N entries
+    /estat?values=N   e-Stat getStatsData JSON with N values, paged by ``limit`` and
+                      ``startPosition`` like the real API
+
+Every path also takes ``latency_ms`` (delay before the response), ``error_rate`` (share of
+requests answered with HTTP 500) and ``seed`` (payload variant). Payloads are a pure
+function of their parameters and errors follow the server's seeded generator, so a run
+against a fresh server is reproducible.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
+from xml.sax.saxutils import escape
+
+_BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+# A vocabulary large enough that unrelated synthetic headlines rarely look alike, so
+# near-duplicate clustering sees realistic candidate counts.
+_WORDS = [f"{stem}{n}" for n in range(100) for stem in ("yen", "rate", "tokyo", "index")]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+@lru_cache(maxsize=64)
+def make_rss(count: int, seed: int = 0, atom: bool = False) -> bytes:
+    """Synthetic feed of ``count`` entries, newest first."""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(count):
+        title = escape(f"{_text(rng, 6)} {seed}-{i}")
+        summary = escape(_text(rng, 30))
+        link = f"https://news.example.com/{seed}/{i}"
+        published = _BASE_TIME - timedelta(minutes=i)
+        if atom:
+            entries.append(
+                f'<entry><title>{title}</title><link href="{link}"/>'
+                f"<summary>{summary}</summary>"
+                f"<updated>{published.isoformat()}</updated></entry>"
+            )
+        else:
+            entries.append(
+                f"<item><title>{title}</title><link>{link}</link>"
+                f"<description>{summary}</description>"
+                f"<pubDate>{format_datetime(published)}</pubDate></item>"
+            )
+    if atom:
+        document = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<feed xmlns="http://www.w3.org/2005/Atom"><title>Bench</title>'
+            f"{''.join(entries)}</feed>"
+        )
+    else:
+        document = (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f"<title>Bench</title>{''.join(entries)}</channel></rss>"
+        )
+    return document.encode("utf-8")
+
+
+@lru_cache(maxsize=64)
+def make_estat(count: int, seed: int = 0, start: int = 1, limit: Optional[int] = None) -> bytes:
+    """
+    Synthetic getStatsData response: a table of ``count`` values, 20 categories per
+    month. ``start``/``limit`` select one page, with ``NEXT_KEY`` set while more remain.
+    """
+    rng = random.Random(seed)
+    last = count if limit is None else min(count, start + limit - 1)
+    values = []
+    for i in range(last):
+        value = f"{rng.uniform(50, 150):.1f}"
+        if i + 1 < start:
+            continue
+        values.append(
+            {
+                "@tab": "01",
+                "@cat01": f"{i % 20:03d}",
+                "@area": "00000",
+                "@time": f"{2000 + i // 240}00{i // 20 % 12 + 1:02d}{i // 20 % 12 + 1:02d}",
+                "@unit": "index",
+                "$": value,
+            }
+        )
+    result_inf = {"TOTAL_NUMBER": count, "FROM_NUMBER": start, "TO_NUMBER": last}
+    if last < count:
+        result_inf["NEXT_KEY"] = last + 1
+    data = {
+        "GET_STATS_DATA": {
+            "RESULT": {"STATUS": 0, "ERROR_MSG": "OK"},
+            "STATISTICAL_DATA": {
+                "RESULT_INF": result_inf,
+                "TABLE_INF": {"TITLE": {"@no": "1", "@title": f"Bench index {seed}"}},
+                "DATA_INF": {"VALUE": values},
+            },
+        }
+    }
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+class FixtureServer:
+    """
+    Serve the fixtures on ``127.0.0.1`` from a background thread::
+
+        with FixtureServer() as server:
+            url = server.url("/rss", items=500, latency_ms=20)
+    """
+
+    def __init__(self, seed: int = 0) -> None:
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _should_fail(self, error_rate: float) -> bool:
+        with self._lock:
+            self.requests += 1
+            failed = error_rate > 0 and self._rng.random() < error_rate
+            self.errors += failed
+            return failed
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                parts = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+                time.sleep(float(query.get("latency_ms", 0)) / 1000)
+                if server._should_fail(float(query.get("error_rate", 0))):
+                    self._send(500, b"fixture error", "text/plain")
+                    return
+                seed = int(query.get("seed", 0))
+                if parts.path in ("/rss", "/atom"):
+                    body = make_rss(int(query.get("items", 50)), seed, parts.path == "/atom")
+                    self._send(200, body, "application/xml")
+                elif parts.path == "/estat":
+                    limit = int(query["limit"]) if "limit" in query else None
+                    start = int(query.get("startPosition", 1))
+                    body = make_estat(int(query.get("values", 100)), seed, start, limit)
+                    self._send(200, body, "application/json")
+                else:
+                    self._send(404, b"not found", "text/plain")
+
+            def _send(self, status: int, body: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "FixtureServer":
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        assert self._httpd is not None, "server not started"
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str, **params) -> str:
+        query = urlencode({key: value for key, value in params.items() if value is not None})
+        return f"{self.base_url}{path}{'?' + query if query else ''}"
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import os
+import smtplib
+import threading
+from datetime import datetime, timezone
+from email.message import EmailMessage
+from email.utils import format_datetime, make_msgid
+from pathlib import Path
+from typing import Dict, Optional, Protocol, Sequence, Type
+
+import httpx
+
+DEFAULT_SEND_TIMEOUT = 10.0
+DEFAULT_ALERT_FILE = Path("output/alerts/alerts.jsonl")
+DEFAULT_SPOOL_DIR = Path("output/alerts/spool")
+
+
+class AlertChannelError(Exception):
+    """Raised when a channel cannot be built from its configuration."""
+
+
+class Channel(Protocol):
+    def send(self, alerts: Sequence[dict]) -> None:
+        """Deliver one batch; raise to have the whole batch retried."""
+
+
+def send_timeout_seconds() -> float:
+    return float(os.getenv("APP_ALERT_SEND_TIMEOUT", DEFAULT_SEND_TIMEOUT))
+
+
+class FileChannel:
+    """Appends each alert as one JSON line to ``target`` (a local stand-in for delivery)."""
+
+    _lock = threading.Lock()
+
+    def __init__(self, target: Optional[str] = None):
+        self.path = Path(target) if target else DEFAULT_ALERT_FILE
+
+    def send(self, alerts: Sequence[dict]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        lines = "".join(json.dumps(alert, ensure_ascii=False) + "\n" for alert in alerts)
+        with self._lock, self.path.open("a", encoding="utf-8") as file:
+            file.write(lines)
+
+
+class EmailChannel:
+    """
+    One digest mail per batch to ``target``.
+
+    Sent through ``APP_SMTP_HOST``/``APP_SMTP_PORT`` when a host is configured; otherwise
+    the message is written as an ``.eml`` file under ``APP_ALERT_SPOOL_DIR`` (an SMTP
+    stub for local runs and tests).
+    """
+
+    def __init__(self, target: Optional[str] = None):
+        if not target:
+            raise AlertChannelError("email channel needs a target address")
+        self.target = target
+        self.sender = os.getenv("APP_SMTP_FROM", "daily-brief@localhost")
+        self.host = os.getenv("APP_SMTP_HOST")
+        self.port = int(os.getenv("APP_SMTP_PORT", "25"))
+        self.spool_dir = Path(os.getenv("APP_ALERT_SPOOL_DIR", DEFAULT_SPOOL_DIR))
+
+    def build_message(self, alerts: Sequence[dict]) -> EmailMessage:
+        runs = sorted({str(alert.get("run_id")) for alert in alerts})
+        message = EmailMessage()
+        message["Subject"] = f"[Daily Brief] {len(alerts)} alert(s) for {', '.join(runs)}"
+        message["From"] = self.sender
+        message["To"] = self.target
+        message["Date"] = format_datetime(datetime.now(timezone.utc))
+        message["Message-ID"] = make_msgid(domain="daily-brief.local")
+        lines = []
+        for alert in alerts:
+            lines.append(f"[{alert.get('severity')}] {alert.get('rule_name')}: {alert['message']}")
+            if alert.get("url"):
+                lines.append(f"    {alert['url']}")
+        message.set_content("\n".join(lines) + "\n")
+        return message
+
+    def send(self, alerts: Sequence[dict]) -> None:
+        message = self.build_message(alerts)
+        if self.host:
+            with smtplib.SMTP(self.host, self.port, timeout=send_timeout_seconds()) as smtp:
+                smtp.send_message(message)
+            return
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        name = message["Message-ID"].strip("<>").replace("@", "_")
+        (self.spool_dir / f"{name}.eml").write_bytes(bytes(message))
+
+
+class WebhookChannel:
+    """POSTs ``{"alerts": [...]}`` as JSON to the ``target`` URL."""
+
+    def __init__(self, target: Optional[str] = None):
+        if not target:
+            raise AlertChannelError("webhook channel needs a target URL")
+        self.target = target
+
+    def send(self, alerts: Sequence[dict]) -> None:
+        response = httpx.post(
+            self.target, json={"alerts": list(alerts)}, timeout=send_timeout_seconds()
+        )
+        response.raise_for_status()
+
+
+CHANNEL_TYPES: Dict[str, Type] = {
+    "file": FileChannel,
+    "email": EmailChannel,
+    "smtp": EmailChannel,
+    "webhook": WebhookChannel,
+}
+
+
+def build_channel(channel: str, target: Optional[str]) -> Channel:
+    try:
+        channel_type = CHANNEL_TYPES[channel]
+    except KeyError:
+        raise AlertChannelError(f"unknown alert channel: {channel}") from None
+    return channel_type(target)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from duckdb import DuckDBPyConnection
+
+from src.app.alerts.channels import Channel, build_channel, send_timeout_seconds
+from src.core.config_schema import AlertsConfig
+from src.core.logging import get_logger
+from src.storage.alerts import due_deliveries, mark_delivered, mark_failed, utc_now
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+
+_GroupKey = Tuple[str, Optional[str]]
+
+
+class AlertDispatcher:
+    """
+    Delivers queued ``alert_outbox`` rows.
+
+    Due rows are grouped per channel and target and cut into batches of the channel's
+    ``batch_size``. Channel groups are delivered concurrently on an asyncio loop (blocking
+    sends run on a small thread pool, each bounded by ``send_timeout``), so one slow mail
+    server or webhook only delays its own group. A failed batch is retried on a later pass
+    after an exponential backoff and given up (``dead``) after ``max_attempts``; delivery
+    is at-least-once. Outbox updates are written by the calling thread in one transaction.
+
+    Pass ``connect`` instead of ``conn`` to open the database only while reading the due
+    rows and recording the outcomes, so other processes (the web tier's read-only
+    connection, the next run) are not locked out while sends are in flight.
+    """
+
+    def __init__(
+        self,
+        conn: Optional[DuckDBPyConnection] = None,
+        max_attempts: int = 5,
+        backoff_seconds: float = 60.0,
+        send_timeout: Optional[float] = None,
+        channels: Optional[Mapping[str, Channel]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        connect: Optional[Callable[[], DuckDBPyConnection]] = None,
+    ) -> None:
+        if conn is None and connect is None:
+            raise ValueError("conn or connect is required")
+        self.conn = conn
+        self.connect = connect
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.send_timeout = send_timeout if send_timeout is not None else send_timeout_seconds()
+        # Channel instances by name, overriding ``build_channel`` (used by tests).
+        self.channels = dict(channels or {})
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_config(cls, conn: Optional[DuckDBPyConnection], config: AlertsConfig, **kwargs):
+        return cls(
+            conn,
+            max_attempts=config.max_attempts,
+            backoff_seconds=config.retry_backoff_seconds,
+            **kwargs,
+        )
+
+    @contextmanager
+    def _db(self) -> Iterator[DuckDBPyConnection]:
+        if self.conn is not None:
+            yield self.conn
+            return
+        conn = self.connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _channel(self, name: str, target: Optional[str]) -> Channel:
+        if name in self.channels:
+            return self.channels[name]
+        return build_channel(name, target)
+
+    @staticmethod
+    def _batches(deliveries: List[dict]) -> Dict[_GroupKey, List[List[dict]]]:
+        groups: Dict[_GroupKey, List[dict]] = defaultdict(list)
+        for delivery in deliveries:
+            groups[(delivery["channel"], delivery["target"])].append(delivery)
+        batched: Dict[_GroupKey, List[List[dict]]] = {}
+        for key, rows in groups.items():
+            size = max(rows[0]["batch_size"] or 1, 1)
+            batched[key] = [rows[i : i + size] for i in range(0, len(rows), size)]
+        return batched
+
+    async def _deliver_group(
+        self, executor: ThreadPoolExecutor, key: _GroupKey, batches: List[List[dict]]
+    ) -> List[Tuple[List[int], Optional[str]]]:
+        loop = asyncio.get_running_loop()
+        results: List[Tuple[List[int], Optional[str]]] = []
+        try:
+            channel = self._channel(*key)
+        except Exception as exc:
+            error = f"{exc.__class__.__name__}: {exc}"
+            return [([row["outbox_id"] for row in batch], error) for batch in batches]
+        for batch in batches:
+            ids = [row["outbox_id"] for row in batch]
+            alerts = [row["alert"] for row in batch]
+            try:
+                await asyncio.wait_for(
+                    loop.run_in_executor(executor, channel.send, alerts), self.send_timeout
+                )
+            except asyncio.TimeoutError:
+                results.append((ids, f"timed out after {self.send_timeout}s"))
+                break
+            except Exception as exc:
+                results.append((ids, f"{exc.__class__.__name__}: {exc}"))
+                # The endpoint is failing; leave the group's remaining batches for later.
+                break
+            results.append((ids, None))
+        return results
+
+    async def _deliver(
+        self, batches: Dict[_GroupKey, List[List[dict]]]
+    ) -> List[Tuple[List[int], Optional[str]]]:
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="alert-dispatch"
+        )
+        try:
+            grouped = await asyncio.gather(
+                *(self._deliver_group(executor, key, group) for key, group in batches.items())
+            )
+        finally:
+            # Do not wait for a send that outlived its timeout.
+            executor.shutdown(wait=False, cancel_futures=True)
+        return [result for group in grouped for result in group]
+
+    def dispatch(self, now: Optional[datetime] = None) -> dict:
+        """Deliver everything due at ``now``; returns counts of outbox rows by outcome."""
+        now = now or utc_now()
+        with self._db() as conn:
+            deliveries = due_deliveries(conn, now)
+        stats = {"due": len(deliveries), "batches": 0, "sent": 0, "failed": 0}
+        if not deliveries:
+            return stats
+        results = asyncio.run(self._deliver(self._batches(deliveries)))
+
+        with self._db() as conn:
+            conn.begin()
+            try:
+                for ids, error in results:
+                    stats["batches"] += 1
+                    if error is None:
+                        mark_delivered(conn, ids, now=now)
+                        stats["sent"] += len(ids)
+                    else:
+                        mark_failed(
+                            conn,
+                            ids,
+                            error,
+                            max_attempts=self.max_attempts,
+                            backoff_seconds=self.backoff_seconds,
+                            now=now,
+                        )
+                        stats["failed"] += len(ids)
+                        logger.warning("Alert batch of %d failed: %s", len(ids), error)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        logger.info(
+            "Dispatched alerts: %d sent, %d failed in %d batches",
+            stats["sent"],
+            stats["failed"],
+            stats["batches"],
+        )
+        return stats
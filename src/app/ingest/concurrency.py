@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Sequence, TypeVar
+from urllib.parse import urlsplit
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_PER_HOST_LIMIT = 2
+
+
+def host_of(url: str) -> str:
+    return (urlsplit(str(url)).hostname or "").lower()
+
+
+def run_bounded(
+    tasks: Sequence[T],
+    worker: Callable[[T], R],
+    url_of: Callable[[T], str],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    per_host_limit: int = DEFAULT_PER_HOST_LIMIT,
+) -> List[R]:
+    """
+    Run ``worker`` over ``tasks`` on a thread pool and return results in task order.
+
+    At most ``max_concurrency`` tasks run at once, and at most ``per_host_limit`` of them
+    target the same host. Tasks are only handed to the pool once their host has a free slot,
+    so a busy host never parks worker threads that other hosts could use.
+    Exceptions raised by ``worker`` propagate; callers wanting per-task isolation should
+    catch inside the worker.
+    """
+    if not tasks:
+        return []
+    max_concurrency = max(1, max_concurrency)
+    per_host_limit = max(1, per_host_limit)
+
+    results: Dict[int, R] = {}
+    pending = deque(enumerate(tasks))
+    active_per_host: Dict[str, int] = defaultdict(int)
+    running: Dict[Future, tuple[int, str]] = {}
+
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, len(tasks))) as pool:
+        while pending or running:
+            deferred: deque = deque()
+            while pending and len(running) < max_concurrency:
+                index, task = pending.popleft()
+                host = host_of(url_of(task))
+                if active_per_host[host] >= per_host_limit:
+                    deferred.append((index, task))
+                    continue
+                active_per_host[host] += 1
+                running[pool.submit(worker, task)] = (index, host)
+            # Keep original order for tasks that were waiting on a busy host.
+            deferred.extend(pending)
+            pending = deferred
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, host = running.pop(future)
+                active_per_host[host] -= 1
+                results[index] = future.result()
+
+    return [results[index] for index in range(len(tasks))]
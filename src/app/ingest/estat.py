@@ -1,14 +1,39 @@
 from __future__ import annotations
 
+import codecs
 import json
-from datetime import datetime, timezone
-from typing import Any, Dict, Iterable, List
+import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from urllib.parse import urlencode
 
 from src.app.ingest.normalize import clean_text, parse_date
 
+try:  # orjson is optional (``pip install orjson``); the stdlib decoder is the fallback
+    import orjson
 
-def build_estat_url(base_url: str, params: Dict[str, Any]) -> str:
+    _loads: Callable[[str], Any] = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover - depends on environment
+    _loads = json.loads
+    JSON_BACKEND = "json"
+
+VALUE_PATH = ("GET_STATS_DATA", "STATISTICAL_DATA", "DATA_INF", "VALUE")
+# A JSON string (group 1 is empty when the closing quote has not arrived yet) or a
+# structural character. Scanning these is enough to track nesting without decoding.
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*(")?|[{}\[\]:,]')
+_CLOSERS = {"{": "}", "[": "]"}
+# VALUE attributes that are not dimension codes (``@tab``, ``@cat01``..``@cat15``, ``@area``).
+_NON_DIMENSIONS = {"$", "@time", "@time_code", "@unit", "@annotation", "@date"}
+# Per-parse memo of titles and dates by time code, cleared when it grows past this.
+_MEMO_LIMIT = 4096
+
+
+def build_estat_url(
+    base_url: str, params: Dict[str, Any], start_position: Optional[int] = None
+) -> str:
     query = {
         "appId": params.get("app_id", ""),
         "statsDataId": params.get("dataset_id") or params.get("stats_data_id"),
@@ -20,33 +45,426 @@ def build_estat_url(base_url: str, params: Dict[str, Any]) -> str:
     extra = params.get("query")
     if isinstance(extra, dict):
         query.update(extra)
+    if start_position is not None:
+        query["startPosition"] = start_position
     return f"{base_url}?{urlencode(query)}"
 
 
-def parse_estat(content: str, source: Dict[str, Any]) -> List[Dict[str, Any]]:
-    data = json.loads(content)
-    stats_data = data.get("GET_STATS_DATA", {}).get("STATISTICAL_DATA", {})
-    title = stats_data.get("TABLE_INF", {}).get("TITLE", {}).get("@title", source["name"])
-    values: Iterable[dict[str, Any]] = stats_data.get("DATA_INF", {}).get("VALUE", []) or []
+def _decoded(chunks: Iterable[Union[str, bytes]]) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _read_header(texts: Iterator[str]) -> Tuple[dict, Optional[str], str]:
+    """
+    Read up to the opening bracket of ``DATA_INF.VALUE``.
+
+    Returns the document parsed without ``VALUE`` (the containers still open at that
+    point are closed), the text following the bracket and the bracket itself. When the
+    document has no ``VALUE`` container it is parsed whole and the text is ``None``.
+    """
+    buffer = ""
+    pos = 0
+    stack: List[str] = []
+    paths: List[Tuple[str, ...]] = []
+    key: Optional[str] = None
+    key_start = 0
+    last_string: Optional[re.Match] = None
+    for text in texts:
+        buffer += text
+        while True:
+            match = _TOKEN.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            token = match.group()
+            if token[0] == '"':
+                if match.group(1) is None:
+                    break  # the string continues in the next chunk
+                last_string = match
+            elif token == ":" and last_string is not None:
+                key, key_start = _loads(last_string.group()), last_string.start()
+            elif token in _CLOSERS:
+                path = (*paths[-1], key) if paths and key is not None else ()
+                if path == VALUE_PATH:
+                    header = buffer[:key_start].rstrip().rstrip(",")
+                    header += "".join(_CLOSERS[opener] for opener in reversed(stack))
+                    return _loads(header), buffer[match.end() :], token
+                stack.append(token)
+                paths.append(path)
+                key = None
+            elif token in "}]":
+                stack.pop()
+                paths.pop()
+                key = None
+            else:
+                key = None
+            pos = match.end()
+    return _loads(buffer), None, ""
+
+
+def _take_records(buffer: str, single: bool) -> Tuple[List[dict], int, bool]:
+    """
+    Decode the complete records at the start of ``buffer``.
+
+    Returns the records, how much of the buffer they used and whether the end of
+    ``VALUE`` was reached. Usually every record up to the last ``}`` before the first
+    ``]`` is decoded in one call and only the rest is scanned token by token; a brace or
+    bracket inside a value makes the whole buffer go through the scan.
+    """
+    records: List[dict] = []
+    consumed = 0
+    bracket = buffer.find("]")
+    end = buffer.rfind("}", 0, bracket if bracket >= 0 else len(buffer))
+    if not single and end >= 0:
+        try:
+            records = _loads("[" + buffer[: end + 1].lstrip(" \t\r\n,") + "]")
+            consumed = end + 1
+        except ValueError:
+            records = []
+        if consumed and bracket < 0:
+            return records, consumed, False
+    depth = 0
+    start = 0
+    for match in _TOKEN.finditer(buffer, consumed):
+        token = match.group()
+        if token[0] == '"':
+            if match.group(1) is None:
+                break
+        elif token in _CLOSERS:
+            if depth == 0:
+                start = match.start()
+            depth += 1
+        elif token in "}]":
+            if depth == 0:
+                return records, consumed, True
+            depth -= 1
+            if depth == 0:
+                records.append(_loads(buffer[start : match.end()]))
+                consumed = match.end()
+                if single:
+                    return records, consumed, True
+    return records, consumed, False
+
+
+def _iter_values(texts: Iterator[str], buffer: str, single: bool) -> Iterator[dict]:
+    """Yield ``VALUE`` records from ``buffer`` and ``texts`` as they are completed."""
+    done = False
+    for text in texts:
+        buffer += text
+        records, consumed, done = _take_records(buffer, single)
+        yield from records
+        if done:
+            return
+        buffer = buffer[consumed:]
+    records, _, done = _take_records(buffer, single)
+    yield from records
+    if not done:
+        raise ValueError("e-Stat response ended inside DATA_INF.VALUE")
+
+
+def _open_table(
+    chunks: Iterable[Union[str, bytes]], result_info: Optional[Dict[str, Any]]
+) -> Tuple[Dict[str, Any], Iterable[Dict[str, Any]]]:
+    """Read a response's header; returns its ``TABLE_INF`` and the lazy ``VALUE`` records."""
+    texts = iter(_decoded(chunks))
+    header, rest, opener = _read_header(texts)
+    stats_data = header.get("GET_STATS_DATA", {}).get("STATISTICAL_DATA", {})
+    if result_info is not None:
+        result_info.update(stats_data.get("RESULT_INF") or {})
+    values: Iterable[Dict[str, Any]]
+    if rest is None:
+        values = stats_data.get("DATA_INF", {}).get("VALUE", []) or []
+        if isinstance(values, dict):
+            values = [values]
+    elif opener == "{":
+        values = _iter_values(texts, "{" + rest, single=True)
+    else:
+        values = _iter_values(texts, rest, single=False)
+    return stats_data.get("TABLE_INF", {}), values
+
+
+def _table_title(table_inf: Dict[str, Any], default: str) -> str:
+    title = table_inf.get("TITLE")
+    if isinstance(title, dict):
+        return title.get("@title") or title.get("$") or default
+    return title or default
+
+
+def iter_estat(
+    chunks: Iterable[Union[str, bytes]],
+    source: Dict[str, Any],
+    result_info: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse a ``getStatsData`` response fed as text or byte chunks.
+
+    The document is scanned up to ``DATA_INF.VALUE`` (``TABLE_INF`` comes before it in
+    e-Stat responses), then the value records are decoded in batches as chunks arrive and
+    yielded one by one, so memory stays bounded by the chunk size rather than the table.
+    Decoding uses orjson when it is installed. ``result_info``, if given, is filled with
+    the response's ``RESULT_INF`` (counts and ``NEXT_KEY``) before the first item.
+    """
+    table_inf, values = _open_table(chunks, result_info)
+    title = _table_title(table_inf, source["name"])
     now = datetime.now(timezone.utc)
-    items: List[Dict[str, Any]] = []
-    for idx, record in enumerate(values):
-        val = clean_text(record.get("$"))
+    url = source.get("url") or ""
+    # Tables repeat a handful of time codes across many cells.
+    titles: Dict[str, str] = {}
+    dates: Dict[str, datetime] = {}
+    for record in values:
+        if len(dates) > _MEMO_LIMIT or len(titles) > _MEMO_LIMIT:
+            titles.clear()
+            dates.clear()
         time_label = record.get("@time") or record.get("@time_code") or ""
-        full_title = clean_text(f"{title} {time_label}".strip())
-        url = source.get("url") or ""
-        published_at = parse_date(record.get("@date") or record.get("@time") or "")
-        items.append(
-            {
-                "source_id": source["id"],
-                "source_name": source["name"],
-                "category": source["category"],
-                "kind": source["kind"],
-                "title": full_title or source["name"],
-                "summary": val,
-                "url": url,
-                "published_at": published_at,
-                "fetched_at": now,
-            }
-        )
-    return items
+        full_title = titles.get(time_label)
+        if full_title is None:
+            full_title = clean_text(f"{title} {time_label}".strip()) or source["name"]
+            titles[time_label] = full_title
+        date_raw = record.get("@date") or record.get("@time") or ""
+        published_at = dates.get(date_raw)
+        if published_at is None:
+            published_at = dates[date_raw] = parse_date(date_raw)
+        yield {
+            "source_id": source["id"],
+            "source_name": source["name"],
+            "category": source["category"],
+            "kind": source["kind"],
+            "title": full_title,
+            "summary": clean_text(record.get("$")),
+            "url": url,
+            "published_at": published_at,
+            "fetched_at": now,
+        }
+
+
+def parse_estat(content: str, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return list(iter_estat([content], source))
+
+
+def period_start(time_code: str) -> Optional[date]:
+    """
+    First day of the period an e-Stat time code stands for, or ``None`` if unknown.
+
+    Codes are ``YYYY`` + kind + ``MMmm``: kind ``00`` is a calendar period starting in
+    month ``MM`` (``00`` for the whole year), kind ``10`` a fiscal year (from April).
+    """
+    code = time_code.strip()
+    try:
+        if len(code) == 4 and code.isdigit():
+            return date(int(code), 1, 1)
+        if len(code) == 10 and code.isdigit():
+            year, kind, month = int(code[:4]), code[4:6], int(code[6:8])
+            if kind == "00":
+                return date(year, month if 1 <= month <= 12 else 1, 1)
+            if kind == "10":
+                return date(year, 4, 1)
+            return None
+        return date.fromisoformat(code[:10])
+    except ValueError:
+        return None
+
+
+def _number(raw: str) -> Optional[float]:
+    try:
+        return float(raw.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def iter_estat_observations(
+    chunks: Iterable[Union[str, bytes]],
+    source: Dict[str, Any],
+    result_info: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Parse a ``getStatsData`` response into typed observations for ``fact_observation``.
+
+    Streams like ``iter_estat``. Each cell becomes its dimension codes (``@tab``,
+    ``@cat01``.., ``@area``; all of them joined in ``dimension_key``), time code and
+    period, a float ``value`` and ``unit``. Cells that are not numbers (``-``, ``***``)
+    get ``value`` None and keep the text in ``annotation``. The table id is
+    ``TABLE_INF/@id``, falling back to the source's ``stats_data_id``/``dataset_id``.
+    """
+    table_inf, values = _open_table(chunks, result_info)
+    params = source.get("params") or {}
+    stats_data_id = str(
+        table_inf.get("@id")
+        or params.get("dataset_id")
+        or params.get("stats_data_id")
+        or source["id"]
+    )
+    table_title = _table_title(table_inf, source["name"])
+    series_key = params.get("series_key")
+    periods: Dict[str, Optional[date]] = {}
+    dimension_keys: Dict[Tuple[Tuple[str, str], ...], str] = {}
+    for record in values:
+        if len(periods) > _MEMO_LIMIT or len(dimension_keys) > _MEMO_LIMIT:
+            periods.clear()
+            dimension_keys.clear()
+        time_code = record.get("@time") or record.get("@time_code") or ""
+        if time_code not in periods:
+            periods[time_code] = period_start(time_code)
+        codes = tuple(sorted((k, v) for k, v in record.items() if k not in _NON_DIMENSIONS))
+        dimension_key = dimension_keys.get(codes)
+        if dimension_key is None:
+            dimension_key = ";".join(f"{key.lstrip('@')}={code}" for key, code in codes)
+            dimension_keys[codes] = dimension_key
+        raw = (record.get("$") or "").strip()
+        value = _number(raw)
+        yield {
+            "source_id": source["id"],
+            "stats_data_id": stats_data_id,
+            "series_key": series_key,
+            "table_title": table_title,
+            "dimension_key": dimension_key,
+            "tab_code": record.get("@tab"),
+            "cat01_code": record.get("@cat01"),
+            "area_code": record.get("@area"),
+            "time_code": time_code,
+            "period": periods[time_code],
+            "value": value,
+            "annotation": record.get("@annotation") or (raw if value is None else None),
+            "unit": record.get("@unit"),
+        }
+
+
+def estat_table_item(observation: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The feed item for an e-Stat table, built from its first observation.
+
+    Every cell of a table shares the source URL, so a table only ever kept one item; the
+    cells themselves live in ``fact_observation``.
+    """
+    value = observation["value"]
+    summary = (observation["annotation"] or "") if value is None else f"{value:.15g}"
+    time_code = observation["time_code"]
+    return {
+        "source_id": source["id"],
+        "source_name": source["name"],
+        "category": source["category"],
+        "kind": source["kind"],
+        "title": clean_text(f"{observation['table_title']} {time_code}".strip()) or source["name"],
+        "summary": summary,
+        "url": source.get("url") or "",
+        "published_at": parse_date(time_code),
+        "fetched_at": datetime.now(timezone.utc),
+    }
+
+
+def _next_key(result_info: Dict[str, Any]) -> Optional[int]:
+    next_key = result_info.get("NEXT_KEY")
+    return int(next_key) if next_key not in (None, "") else None
+
+
+def _page_starts(next_key: int, result_info: Dict[str, Any]) -> List[int]:
+    """Start positions of the remaining pages, as far as ``RESULT_INF`` tells."""
+    try:
+        page_size = int(result_info["TO_NUMBER"]) - int(result_info["FROM_NUMBER"]) + 1
+        total = int(result_info["TOTAL_NUMBER"])
+    except (KeyError, TypeError, ValueError):
+        return [next_key]
+    if page_size < 1:
+        return [next_key]
+    return list(range(next_key, total + 1, page_size)) or [next_key]
+
+
+def _close(chunks: Iterable[Any]) -> None:
+    close = getattr(chunks, "close", None)
+    if close is not None:
+        close()
+
+
+def iter_estat_pages(
+    open_page: Callable[[str], Iterable[Union[str, bytes]]],
+    base_url: str,
+    params: Dict[str, Any],
+    source: Dict[str, Any],
+    max_concurrency: int = 2,
+    parse: Callable[..., Iterator[Dict[str, Any]]] = iter_estat,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Items of every page of a ``getStatsData`` table, in table order.
+
+    e-Stat caps the rows per response and returns ``NEXT_KEY`` while more remain. The
+    first page is streamed; once its ``RESULT_INF`` gives the page size and total, the
+    remaining pages are requested with ``startPosition`` on up to ``max_concurrency``
+    threads. Pages are yielded in order, and a page is only requested once a window slot
+    frees up, so at most ``max_concurrency`` parsed pages are held at a time. The first
+    response is closed before any later page is waited for, so a fetcher that limits
+    connections per host cannot deadlock on it. If a page's ``NEXT_KEY`` does not match
+    the plan (the server paged differently or the table grew), the remaining pages are
+    re-planned from that key.
+
+    ``open_page(url)`` returns the response body as chunks; ``parse`` is ``iter_estat``
+    or ``iter_estat_observations``.
+    """
+
+    def fetch(start: int) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        info: Dict[str, Any] = {}
+        chunks = open_page(build_estat_url(base_url, params, start_position=start))
+        try:
+            return list(parse(chunks, source, result_info=info)), info
+        finally:
+            _close(chunks)
+
+    limit = max(1, max_concurrency)
+    info: Dict[str, Any] = {}
+    chunks = open_page(build_estat_url(base_url, params))
+    try:
+        first = parse(chunks, source, result_info=info)
+        try:
+            head = next(first, None)
+            next_key = _next_key(info)
+            if next_key is None:
+                if head is not None:
+                    yield head
+                    yield from first
+                return
+            pool = ThreadPoolExecutor(max_workers=limit)
+            try:
+                planned = deque(_page_starts(next_key, info))
+                window: deque[Tuple[int, Future]] = deque()
+
+                def fill() -> None:
+                    while planned and len(window) < limit:
+                        start = planned.popleft()
+                        window.append((start, pool.submit(fetch, start)))
+
+                # Later pages download while the first one is still being consumed.
+                fill()
+                if head is not None:
+                    yield head
+                    yield from first
+                # The parser stops at the end of the values, so the first response is
+                # still open; release its connection (and the fetcher's per-host slot,
+                # which the page workers may be waiting for) before waiting on them.
+                first.close()
+                _close(chunks)
+                while window:
+                    _, future = window.popleft()
+                    items, page_info = future.result()
+                    fill()
+                    yield from items
+                    del items
+                    following = _next_key(page_info)
+                    expected = window[0][0] if window else None
+                    if following != expected:
+                        for _, pending in window:
+                            pending.cancel()
+                        window.clear()
+                        if following is not None:
+                            planned = deque(_page_starts(following, page_info))
+                            fill()
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+        finally:
+            first.close()
+    finally:
+        _close(chunks)
@@ -1,36 +1,238 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
+import threading
+from typing import Dict, Iterable, Iterator, Optional
 
 import httpx
 
+from src.app.ingest.concurrency import host_of
+
+try:  # HTTP/2 needs the optional ``h2`` package (``pip install httpx[http2]``)
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on environment
+    HTTP2_AVAILABLE = False
+
 DEFAULT_TIMEOUT = 10.0
 USER_AGENT = "DailyBriefIntel/0.0.1"
 MAX_RETRIES = 2
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_PER_HOST_CONNECTIONS = 2
+DEFAULT_CHUNK_SIZE = 64 * 1024
 
 
 class FetchError(Exception):
     pass
 
 
-def fetch_text(
-    url: str,
-    allowed_urls: Optional[Iterable[str]] = None,
-    timeout: float = DEFAULT_TIMEOUT,
-) -> str:
+class NotModifiedError(Exception):
+    """Raised when a conditional GET is answered with 304 Not Modified."""
+
+
+def _ensure_allowed(url: str, allowed_urls: Optional[Iterable[str]]) -> None:
     if allowed_urls is not None:
         if not any(str(url).startswith(allowed) for allowed in allowed_urls):
             raise FetchError("URL not allowed")
 
-    headers = {"User-Agent": USER_AGENT}
+
+def _get_with_retries(client: httpx.Client, url: str, **kwargs) -> httpx.Response:
     last_exc: Exception | None = None
     for _ in range(MAX_RETRIES + 1):
         try:
-            with httpx.Client(timeout=timeout, headers=headers, follow_redirects=True) as client:
-                response = client.get(url)
-                response.raise_for_status()
-                return response.text
+            response = client.get(url, **kwargs)
+            if response.status_code == httpx.codes.NOT_MODIFIED:
+                return response
+            response.raise_for_status()
+            return response
         except (httpx.HTTPError, httpx.TimeoutException) as exc:  # pragma: no cover - network issue
             last_exc = exc
             continue
     raise FetchError(str(last_exc) if last_exc else "Fetch failed")
+
+
+def fetch_text(
+    url: str,
+    allowed_urls: Optional[Iterable[str]] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    client: Optional[httpx.Client] = None,
+) -> str:
+    _ensure_allowed(url, allowed_urls)
+    if client is not None:
+        return _get_with_retries(client, url).text
+
+    headers = {"User-Agent": USER_AGENT}
+    # One client for all attempts, so retries can reuse the connection.
+    with httpx.Client(timeout=timeout, headers=headers, follow_redirects=True) as owned:
+        return _get_with_retries(owned, url).text
+
+
+class FetchSession:
+    """
+    Run-scoped HTTP session shared by every source fetch in a run.
+
+    Keeps one pooled ``httpx.Client`` (keep-alive, HTTP/2 when ``h2`` is installed) and caps
+    concurrent requests per host. Instances are callable with the ``fetcher`` signature
+    expected by ``run_pipeline`` and are safe to use from the fetch worker threads.
+
+    ``validators`` maps URL -> {"etag", "last_modified"} from a previous run; matching
+    requests are sent as conditional GETs and a 304 raises ``NotModifiedError``. Fresh
+    validators seen during the run are available from ``updated_validators()``.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        per_host_connections: int = DEFAULT_PER_HOST_CONNECTIONS,
+        http2: Optional[bool] = None,
+        validators: Optional[Dict[str, dict]] = None,
+    ):
+        self.per_host_connections = max(1, per_host_connections)
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self._client = httpx.Client(
+            timeout=timeout,
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._requests = 0
+        self._connections_opened = 0
+        self._validators: Dict[str, dict] = dict(validators or {})
+        self._updated_validators: Dict[str, dict] = {}
+
+    def __call__(self, url: str, allowed_urls: Optional[Iterable[str]] = None) -> str:
+        return self.fetch_text(url, allowed_urls)
+
+    def __enter__(self) -> "FetchSession":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = host_of(url)
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_connections)
+                self._host_slots[host] = slot
+            return slot
+
+    def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._connections_opened += 1
+        elif event_name.endswith(".send_request_headers.started"):
+            with self._lock:
+                self._requests += 1
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        cached = self._validators.get(url) or {}
+        headers: Dict[str, str] = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def _remember_validators(self, url: str, response: httpx.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        entry = {"url": url, "etag": etag, "last_modified": last_modified}
+        with self._lock:
+            self._validators[url] = entry
+            self._updated_validators[url] = entry
+
+    def fetch_text(self, url: str, allowed_urls: Optional[Iterable[str]] = None) -> str:
+        _ensure_allowed(url, allowed_urls)
+        with self._host_slot(url):
+            response = _get_with_retries(
+                self._client,
+                url,
+                headers=self._conditional_headers(url),
+                extensions={"trace": self._trace},
+            )
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            raise NotModifiedError(url)
+        self._remember_validators(url, response)
+        return response.text
+
+    def iter_bytes(
+        self,
+        url: str,
+        allowed_urls: Optional[Iterable[str]] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        conditional: bool = True,
+    ) -> Iterator[bytes]:
+        """
+        Stream the response body in chunks without buffering the whole document.
+
+        Connection errors are retried until the first chunk has been yielded; a failure
+        after that raises ``FetchError`` because the consumer has already seen partial data.
+        Validators are remembered once the body is read, or when the consumer closes the
+        stream early after a successful status. With ``conditional=False`` (continuation
+        pages of a paged source, which must be read whenever the first page changed) no
+        validators are sent or remembered, and a 304 is an ordinary HTTP error.
+        """
+        _ensure_allowed(url, allowed_urls)
+        last_exc: Exception | None = None
+        with self._host_slot(url):
+            for _ in range(MAX_RETRIES + 1):
+                started = False
+                try:
+                    with self._client.stream(
+                        "GET",
+                        url,
+                        headers=self._conditional_headers(url) if conditional else None,
+                        extensions={"trace": self._trace},
+                    ) as response:
+                        if conditional and response.status_code == httpx.codes.NOT_MODIFIED:
+                            raise NotModifiedError(url)
+                        response.raise_for_status()
+                        for chunk in response.iter_bytes(chunk_size):
+                            started = True
+                            try:
+                                yield chunk
+                            except GeneratorExit:
+                                # The consumer stopped reading (an incremental parse hit
+                                # known items); the response was clean, so keep its
+                                # validators and let the caller decide whether to save them.
+                                if conditional:
+                                    self._remember_validators(url, response)
+                                raise
+                        # Otherwise only trust the validators once the full body arrived.
+                        if conditional:
+                            self._remember_validators(url, response)
+                        return
+                except httpx.HTTPError as exc:
+                    if started:
+                        raise FetchError(str(exc)) from exc
+                    last_exc = exc
+        raise FetchError(str(last_exc) if last_exc else "Fetch failed")
+
+    def updated_validators(self) -> list[dict]:
+        with self._lock:
+            return list(self._updated_validators.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            requests = self._requests
+            opened = self._connections_opened
+        return {
+            "requests": requests,
+            "connections_opened": opened,
+            "connections_reused": max(requests - opened, 0),
+            "http2": self.http2,
+        }
+
+    def close(self) -> None:
+        self._client.close()
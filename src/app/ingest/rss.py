@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import xml.etree.ElementTree as ET
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, Iterator, List, Union
 
 from src.app.ingest.normalize import clean_text, parse_date
 
-RSS_NAMESPACE = {"atom": "http://www.w3.org/2005/Atom"}
+ATOM_NS = "http://www.w3.org/2005/Atom"
+RSS_NAMESPACE = {"atom": ATOM_NS, "dc": "http://purl.org/dc/elements/1.1/"}
+ITEM_TAGS = {"item", f"{{{ATOM_NS}}}entry"}
 
 
 def _extract_item_fields(node: ET.Element) -> Dict[str, Any]:
@@ -16,8 +18,12 @@ def _extract_item_fields(node: ET.Element) -> Dict[str, Any]:
     link = (
         node.findtext("link") or node.findtext("atom:link", namespaces=RSS_NAMESPACE) or ""
     ).strip()
-    if not link and node.find("link") is not None and "href" in node.find("link").attrib:
-        link = node.find("link").attrib["href"]
+    if not link:
+        link_node = node.find("link")
+        if link_node is None:
+            link_node = node.find("atom:link", namespaces=RSS_NAMESPACE)
+        if link_node is not None and "href" in link_node.attrib:
+            link = link_node.attrib["href"].strip()
     summary = clean_text(
         node.findtext("description")
         or node.findtext("summary")
@@ -28,7 +34,9 @@ def _extract_item_fields(node: ET.Element) -> Dict[str, Any]:
         node.findtext("pubDate")
         or node.findtext("published")
         or node.findtext("updated")
-        or node.findtext("dc:date")
+        or node.findtext("atom:published", namespaces=RSS_NAMESPACE)
+        or node.findtext("atom:updated", namespaces=RSS_NAMESPACE)
+        or node.findtext("dc:date", namespaces=RSS_NAMESPACE)
     )
     published_at = parse_date(published_raw)
     return {
@@ -39,30 +47,57 @@ def _extract_item_fields(node: ET.Element) -> Dict[str, Any]:
     }
 
 
-def parse_rss(content: str, source: Dict[str, Any]) -> List[Dict[str, Any]]:
-    root = ET.fromstring(content)
-    items: List[Dict[str, Any]] = []
-    channel_items = root.findall(".//item")
-    if channel_items:
-        raw_items = channel_items
-    else:
-        raw_items = root.findall(".//atom:entry", namespaces=RSS_NAMESPACE)
-    now = datetime.now(timezone.utc)
-    for node in raw_items:
-        fields = _extract_item_fields(node)
+def _drain_items(
+    parser: ET.XMLPullParser,
+    open_elements: List[ET.Element],
+    source: Dict[str, Any],
+    fetched_at: datetime,
+) -> Iterator[Dict[str, Any]]:
+    for event, elem in parser.read_events():
+        if event == "start":
+            open_elements.append(elem)
+            continue
+        open_elements.pop()
+        if elem.tag not in ITEM_TAGS:
+            continue
+        fields = _extract_item_fields(elem)
+        # Detach the processed node so the tree never holds more than one item.
+        if open_elements:
+            open_elements[-1].remove(elem)
+        elem.clear()
         if not fields["title"] and not fields["url"]:
             continue
-        items.append(
-            {
-                "source_id": source["id"],
-                "source_name": source["name"],
-                "category": source["category"],
-                "kind": source["kind"],
-                "title": fields["title"],
-                "summary": fields["summary"],
-                "url": fields["url"],
-                "published_at": fields["published_at"],
-                "fetched_at": now,
-            }
-        )
-    return items
+        yield {
+            "source_id": source["id"],
+            "source_name": source["name"],
+            "category": source["category"],
+            "kind": source["kind"],
+            "title": fields["title"],
+            "summary": fields["summary"],
+            "url": fields["url"],
+            "published_at": fields["published_at"],
+            "fetched_at": fetched_at,
+        }
+
+
+def iter_rss(
+    chunks: Iterable[Union[str, bytes]], source: Dict[str, Any]
+) -> Iterator[Dict[str, Any]]:
+    """
+    Incrementally parse an RSS 2.0 / Atom document fed as text or byte chunks.
+
+    Items are yielded as soon as their closing tag has been read and are then dropped from
+    the tree, so memory stays bounded by the chunk size and the largest single item.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    open_elements: List[ET.Element] = []
+    fetched_at = datetime.now(timezone.utc)
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from _drain_items(parser, open_elements, source, fetched_at)
+    parser.close()
+    yield from _drain_items(parser, open_elements, source, fetched_at)
+
+
+def parse_rss(content: str, source: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return list(iter_rss([content], source))
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -5,8 +6,21 @@ from fastapi.responses import RedirectResponse
 from fastapi.staticfiles import StaticFiles
 
 from src.app.web.routes import router
+from src.storage.db import ReadOnlyDatabase
 
-app = FastAPI(title="Daily Brief Intel BI")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database = ReadOnlyDatabase()
+    database.start_watcher()
+    app.state.database = database
+    try:
+        yield
+    finally:
+        database.close()
+
+
+app = FastAPI(title="Daily Brief Intel BI", lifespan=lifespan)
 
 static_dir = Path(__file__).resolve().parent / "static"
 static_dir.mkdir(parents=True, exist_ok=True)
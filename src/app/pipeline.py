@@ -1,47 +1,78 @@
 from __future__ import annotations
 
-import csv
 import json
 import os
 import shutil
+import tempfile
+import threading
 from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from zoneinfo import ZoneInfo
 
 import yaml
 
-from src.app.ingest.estat import build_estat_url, parse_estat
-from src.app.ingest.fetch import fetch_text
-from src.app.ingest.rss import parse_rss
-from src.core.config_loader import load_sources_config
+from src.app.ingest.concurrency import run_bounded
+from src.app.ingest.estat import (
+    build_estat_url,
+    estat_table_item,
+    iter_estat_observations,
+    iter_estat_pages,
+)
+from src.app.ingest.fetch import FetchSession, NotModifiedError
+from src.app.ingest.rss import iter_rss
+from src.core.config_loader import (
+    load_alerts_config,
+    load_geo_config,
+    load_scoring_config,
+    load_sources_config,
+    load_watchlist_config,
+)
+from src.core.config_schema import SourceEntry
+from src.core.geo import GeoTagger
 from src.core.logging import get_logger
 from src.core.series_resolver import resolve_series_config
+from src.core.timing import RunProfiler, StageTimer
+from src.core.watchlist import WatchlistMatcher
 from src.pipeline.run_manager import (
+    RunUnitOfWork,
     create_run,
     delete_run,
     finish_run,
-    record_source_run,
     run_exists,
 )
+from src.storage.alerts import evaluate_alerts, record_alerts
 from src.storage.db import connect
+from src.storage.exports import export_formats, export_run_items
+from src.storage.http_cache import load_http_validators, upsert_http_validators
 from src.storage.indicator_series import (
     upsert_dim_indicator_series,
     upsert_fact_indicator_series_run,
 )
+from src.storage.item_geo import tag_run_items
+from src.storage.item_match import match_run_items
+from src.storage.items import (
+    carry_forward_items,
+    load_known_urls,
+    source_ids_with_items,
+    upsert_items,
+)
 from src.storage.migrate import init_db
+from src.storage.near_dup import cluster_run_items
+from src.storage.observations import spool_observations, upsert_observation_files
+from src.storage.run_stages import record_run_stages
+from src.storage.scoring import score_run_items
 
 logger = get_logger(__name__)
 
+_BYTES_LOCK = threading.Lock()
+
 
 def _output_root() -> Path:
     return Path(os.getenv("APP_OUTPUT_ROOT", "output/runs"))
 
 
-def _default_fetcher(url: str, allowed_urls: Iterable[str]) -> str:
-    return fetch_text(url, allowed_urls=allowed_urls)
-
-
 def _generate_run_id() -> str:
     jst = ZoneInfo("Asia/Tokyo")
     now = datetime.now(tz=jst)
@@ -81,52 +112,183 @@ def _ensure_run_id(
         suffix += 1
 
 
-def _write_exports(run_id: str, items: List[Dict[str, object]], stats: dict) -> Path:
+def _write_exports(run_id: str, stats: dict, alerts: List[dict]) -> Path:
+    """Write the run's JSON outputs; item exports are produced by ``export_run_items``."""
     output_dir = _output_root() / run_id
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    items_path = output_dir / "brief_items.csv"
     alerts_path = output_dir / "alerts.json"
     stats_path = output_dir / "run_stats.json"
 
-    with items_path.open("w", encoding="utf-8", newline="") as file:
-        writer = csv.DictWriter(
-            file,
-            fieldnames=[
-                "source_id",
-                "source_name",
-                "category",
-                "kind",
-                "title",
-                "summary",
-                "url",
-                "published_at",
-            ],
-        )
-        writer.writeheader()
-        for item in items:
-            writer.writerow(
-                {
-                    "source_id": item["source_id"],
-                    "source_name": item["source_name"],
-                    "category": item["category"],
-                    "kind": item["kind"],
-                    "title": item["title"],
-                    "summary": item["summary"],
-                    "url": item["url"],
-                    "published_at": (
-                        item["published_at"].isoformat()
-                        if hasattr(item["published_at"], "isoformat")
-                        else item["published_at"]
-                    ),
-                }
-            )
-
-    alerts_path.write_text(json.dumps([], indent=2), encoding="utf-8")
+    alerts_path.write_text(
+        json.dumps(alerts, indent=2, default=str, ensure_ascii=False), encoding="utf-8"
+    )
     stats_path.write_text(json.dumps(stats, indent=2, default=str), encoding="utf-8")
     return output_dir
 
 
+def _request_url(source: SourceEntry) -> str:
+    if source.kind == "estat_api":
+        return build_estat_url(source.url or "", source.params)
+    return source.url or ""
+
+
+def _take_new_items(
+    items: Iterator[Dict[str, object]],
+    known_urls: Set[str],
+    stop_after_known: int,
+) -> Tuple[List[Dict[str, object]], List[str]]:
+    """
+    Collect items whose URL is not yet stored, stopping after a run of known ones.
+
+    Feeds list newest entries first, so ``stop_after_known`` consecutive known URLs mean
+    the rest of the feed was ingested by an earlier run. Returns the new items and the
+    known URLs read before stopping.
+    """
+    new_items: List[Dict[str, object]] = []
+    known: List[str] = []
+    streak = 0
+    for item in items:
+        if item["url"] in known_urls:
+            known.append(item["url"])
+            streak += 1
+            if streak >= stop_after_known:
+                break
+            continue
+        streak = 0
+        new_items.append(item)
+    return new_items, known
+
+
+def _size(chunk: str | bytes) -> int:
+    return len(chunk.encode("utf-8")) if isinstance(chunk, str) else len(chunk)
+
+
+def _counted(chunks: Iterable[str | bytes], span: Dict[str, object]) -> Iterator[str | bytes]:
+    """Pass ``chunks`` through, adding their size to ``span["bytes"]``."""
+    try:
+        for chunk in chunks:
+            size = _size(chunk)
+            # e-Stat pages are read on several threads at once.
+            with _BYTES_LOCK:
+                span["bytes"] += size
+            yield chunk
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def _open_chunks(
+    fetch_fn: Callable[[str, Iterable[str]], str],
+    url: str,
+    allowed_urls: Iterable[str],
+    conditional: bool = True,
+) -> Iterable[str | bytes]:
+    """Stream the body when the fetcher supports it, else fetch it whole."""
+    iter_bytes = getattr(fetch_fn, "iter_bytes", None)
+    if iter_bytes is not None:
+        return iter_bytes(url, allowed_urls, conditional=conditional)
+    return [fetch_fn(url, allowed_urls)]
+
+
+def _spool_path(source_id: str) -> Path:
+    handle, name = tempfile.mkstemp(prefix=f"observations-{source_id}-", suffix=".ndjson")
+    os.close(handle)
+    return Path(name)
+
+
+def _ingest_source(
+    source: SourceEntry,
+    fetch_fn: Callable[[str, Iterable[str]], str],
+    allowed_urls: Iterable[str],
+    known_urls: Set[str] | None = None,
+    stop_after_known: int = 1,
+    timer: StageTimer | None = None,
+    page_concurrency: int = 1,
+) -> Dict[str, object]:
+    """
+    Fetch and parse one source. Runs on a pool thread, so it must not touch the DB.
+
+    Recorded as a ``fetch`` span with the bytes downloaded and items parsed; for streamed
+    feeds the span covers fetching and parsing together, as they interleave. e-Stat
+    tables follow ``NEXT_KEY`` across pages, ``page_concurrency`` at a time, and become
+    one item for the table; their cells are streamed into an ``observation_file`` (see
+    ``spool_observations``) as the pages arrive, so a table is never held in memory. The
+    caller loads the file and removes it; it is already gone if the source failed.
+    """
+    request_url = _request_url(source)
+    started_at = datetime.now(timezone.utc)
+    items: List[Dict[str, object]] = []
+    observation_file: Optional[Path] = None
+    observation_count = 0
+    known: List[str] = []
+    error: Exception | None = None
+    not_modified = False
+    with (timer or StageTimer()).span("fetch", source_id=source.id) as span:
+        span["bytes"] = 0
+        try:
+            if source.kind == "rss":
+                chunks = _open_chunks(fetch_fn, request_url, allowed_urls)
+                parsed = iter_rss(_counted(chunks, span), source.model_dump())
+            elif source.kind == "estat_api":
+                chunks = []
+                # Only the first page is a conditional request: once it has changed, a
+                # 304 on a later page must not turn the whole table into not_modified.
+                parsed = iter_estat_pages(
+                    lambda url: _counted(
+                        _open_chunks(fetch_fn, url, allowed_urls, conditional=url == request_url),
+                        span,
+                    ),
+                    source.url or "",
+                    source.params,
+                    source.model_dump(),
+                    max_concurrency=page_concurrency,
+                    parse=iter_estat_observations,
+                )
+            else:
+                raise ValueError(f"Unsupported source kind: {source.kind}")
+            try:
+                if source.kind == "estat_api":
+                    first = next(parsed, None)
+                    if first is not None:
+                        items = [estat_table_item(first, source.model_dump())]
+                        observation_file = _spool_path(source.id)
+                        observation_count = spool_observations(
+                            chain([first], parsed), observation_file
+                        )
+                elif known_urls:
+                    items, known = _take_new_items(parsed, known_urls, stop_after_known)
+                else:
+                    items = list(parsed)
+            finally:
+                # Release the connection promptly when parsing stopped early.
+                parsed.close()
+                if hasattr(chunks, "close"):
+                    chunks.close()
+        except NotModifiedError:
+            not_modified = True
+        except Exception as exc:
+            logger.warning("Source %s failed: %s", source.id, exc)
+            items = []
+            observation_count = 0
+            error = exc
+        if observation_file is not None and (error is not None or not_modified):
+            observation_file.unlink(missing_ok=True)
+            observation_file = None
+        span["items"] = observation_count or len(items)
+    return {
+        "items": items,
+        "observation_file": observation_file,
+        "observation_count": observation_count,
+        "count": observation_count or len(items),
+        "known": known,
+        "error": error,
+        "not_modified": not_modified,
+        "started_at": started_at,
+        "ended_at": datetime.now(timezone.utc),
+    }
+
+
 def _dedupe_items(items: Iterable[Dict[str, object]]) -> List[Dict[str, object]]:
     seen = set()
     unique: List[Dict[str, object]] = []
@@ -139,37 +301,71 @@ def _dedupe_items(items: Iterable[Dict[str, object]]) -> List[Dict[str, object]]
     return unique
 
 
-def _upsert_item_latest(conn, run_id: str, item: Dict[str, object]) -> None:
-    conn.execute(
-        """
-        INSERT INTO items (
-            run_id, source_id, source_name, category, kind,
-            title, summary, url, published_at, fetched_at
+def _record_stages(conn, run_id: str, timer: StageTimer) -> None:
+    """Store the run's spans in ``fact_run_stage`` after the run has committed."""
+    try:
+        record_run_stages(conn, run_id, timer.spans())
+        conn.commit()
+    except Exception as exc:  # pragma: no cover - best-effort
+        logger.warning("Could not record stage timings for %s: %s", run_id, exc)
+
+
+def _series_rows(config_dir: Path, conn, resolutions: Dict[str, dict]) -> list[dict]:
+    """
+    One row per series key in ``series.yml`` for ``fact_indicator_series_run``.
+
+    Keys resolved in this run come from ``resolutions`` (their rows are still buffered);
+    any other key falls back to its last stored resolution.
+    """
+    series_path = config_dir / "series.yml"
+    series_keys: list[str] = []
+    if series_path.exists():
+        data = yaml.safe_load(series_path.read_text(encoding="utf-8")) or {}
+        series_keys = [entry.get("key") for entry in data.get("series", []) if entry.get("key")]
+    missing = [key for key in series_keys if key not in resolutions]
+    existing: Dict[str, dict] = {}
+    if missing:
+        placeholders = ",".join("?" for _ in missing)
+        fetched = conn.execute(
+            f"""
+            SELECT series_key, resolver_type, resolver_value, resolved_id, status, message
+            FROM dim_series_resolution
+            WHERE series_key IN ({placeholders})
+            """,
+            missing,
+        ).fetchall()
+        existing = {
+            row[0]: {
+                "resolver_type": row[1],
+                "resolver_value": row[2],
+                "resolved_id": row[3],
+                "status": row[4],
+                "message": row[5],
+            }
+            for row in fetched
+        }
+    rows: list[dict] = []
+    for key in series_keys:
+        record = resolutions.get(key) or existing.get(key)
+        if record is None:
+            record = {
+                "resolver_type": None,
+                "resolver_value": None,
+                "resolved_id": None,
+                "status": "unresolved",
+                "message": "No resolution record",
+            }
+        rows.append(
+            {
+                "series_key": key,
+                "resolver_type": record.get("resolver_type"),
+                "resolver_value": record.get("resolver_value"),
+                "resolved_id": record.get("resolved_id"),
+                "status": record.get("status"),
+                "message": record.get("message"),
+            }
         )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT (source_id, url) DO UPDATE SET
-            run_id = EXCLUDED.run_id,
-            source_name = EXCLUDED.source_name,
-            category = EXCLUDED.category,
-            kind = EXCLUDED.kind,
-            title = EXCLUDED.title,
-            summary = EXCLUDED.summary,
-            published_at = EXCLUDED.published_at,
-            fetched_at = EXCLUDED.fetched_at
-        """,
-        [
-            run_id,
-            item["source_id"],
-            item["source_name"],
-            item["category"],
-            item["kind"],
-            item["title"],
-            item["summary"],
-            item["url"],
-            item["published_at"],
-            item["fetched_at"],
-        ],
-    )
+    return rows
 
 
 def run_pipeline(
@@ -178,14 +374,55 @@ def run_pipeline(
     fetcher: Callable[[str, Iterable[str]], str] | None = None,
     run_id: str | None = None,
     overwrite_run: bool = False,
+) -> Tuple[str, Path]:
+    timer = StageTimer()
+    profiler = RunProfiler()
+    profiler.start()
+    try:
+        return _run_pipeline(
+            config_dir, mode, fetcher, run_id, overwrite_run, timer=timer, profiler=profiler
+        )
+    finally:
+        profiler.stop()
+
+
+def _run_pipeline(
+    config_dir: Path | str,
+    mode: str,
+    fetcher: Callable[[str, Iterable[str]], str] | None,
+    run_id: str | None,
+    overwrite_run: bool,
+    timer: StageTimer,
+    profiler: RunProfiler,
 ) -> Tuple[str, Path]:
     config_path = Path(config_dir)
-    sources_config = load_sources_config(config_path)
+    with timer.span("config_load"):
+        sources_config = load_sources_config(config_path)
+        watchlist_config = load_watchlist_config(config_path)
+        scoring_config = load_scoring_config(config_path)
+        geo_tagger = GeoTagger.from_config(load_geo_config(config_path))
+        alerts_config = load_alerts_config(config_path)
     init_db()
     conn = connect()
     run_started_at = None
     series_stats: Dict[str, int] = {"resolved": 0, "unresolved": 0, "errors": 0}
 
+    session: FetchSession | None = None
+    outcomes: List[Dict[str, object]] = []
+    if fetcher is None:
+        # Only send conditional requests for sources that have a snapshot to carry forward.
+        cached_sources = source_ids_with_items(conn, (s.id for s in sources_config.sources))
+        validators = load_http_validators(
+            conn,
+            (_request_url(s) for s in sources_config.sources if s.id in cached_sources),
+        )
+        session = FetchSession(
+            max_connections=sources_config.fetch.max_concurrency,
+            per_host_connections=sources_config.fetch.per_host_limit,
+            validators=validators,
+        )
+    fetch_fn = fetcher or session
+
     run_id = _ensure_run_id(conn, run_id, overwrite_run)
     if overwrite_run:
         shutil.rmtree(_output_root() / run_id, ignore_errors=True)
@@ -194,67 +431,28 @@ def run_pipeline(
             run_mode=mode, params_json="{}", conn=conn, run_id=run_id
         )
 
-        # Series registry ingest (best-effort, no external fetch)
-        try:
-            resolve_series_config(config_path, conn)
-            series_path = config_path / "series.yml"
-            series_keys: list[str] = []
-            if series_path.exists():
-                data = yaml.safe_load(series_path.read_text(encoding="utf-8")) or {}
-                series_keys = [
-                    entry.get("key") for entry in data.get("series", []) if entry.get("key")
-                ]
-            series_rows: list[dict] = []
-            if series_keys:
-                placeholders = ",".join("?" for _ in series_keys)
-                query = f"""
-                    SELECT series_key, resolver_type, resolver_value, resolved_id, status, message
-                    FROM dim_series_resolution
-                    WHERE series_key IN ({placeholders})
-                """
-                fetched = conn.execute(query, series_keys).fetchall()
-                existing = {row[0]: row for row in fetched}
-                for key in series_keys:
-                    if key in existing:
-                        row = existing[key]
-                        series_rows.append(
-                            {
-                                "series_key": row[0],
-                                "resolver_type": row[1],
-                                "resolver_value": row[2],
-                                "resolved_id": row[3],
-                                "status": row[4],
-                                "message": row[5],
-                            }
-                        )
-                    else:
-                        series_rows.append(
-                            {
-                                "series_key": key,
-                                "resolver_type": None,
-                                "resolver_value": None,
-                                "resolved_id": None,
-                                "status": "unresolved",
-                                "message": "No resolution record",
-                            }
-                        )
-            resolved_rows = [
-                row for row in series_rows if row["status"] == "resolved" and row.get("resolved_id")
-            ]
-            series_stats["resolved"] = len(resolved_rows)
-            series_stats["unresolved"] = len(
-                [r for r in series_rows if r["status"] == "unresolved"]
-            )
-            series_stats["errors"] = len([r for r in series_rows if r["status"] == "error"])
-            upsert_fact_indicator_series_run(conn, run_id, series_rows)
-            upsert_dim_indicator_series(conn, resolved_rows)
-        except Exception as exc:  # pragma: no cover - best-effort
-            logger.warning("Series registry ingest skipped: %s", exc)
+        uow = RunUnitOfWork(run_id, conn)
+
+        # Series registry ingest (best-effort, no external fetch); written with the run.
+        series_rows: list[dict] = []
+        with timer.span("series_resolve"):
+            try:
+                series_rows = _series_rows(
+                    config_path, conn, resolve_series_config(config_path, conn, uow=uow)
+                )
+            except Exception as exc:  # pragma: no cover - best-effort
+                logger.warning("Series registry ingest skipped: %s", exc)
+        resolved_rows = [
+            row for row in series_rows if row["status"] == "resolved" and row.get("resolved_id")
+        ]
+        series_stats["resolved"] = len(resolved_rows)
+        series_stats["unresolved"] = len([r for r in series_rows if r["status"] == "unresolved"])
+        series_stats["errors"] = len([r for r in series_rows if r["status"] == "error"])
 
-        allowed_urls = {s.url for s in sources_config.sources if s.url}
-        fetch_fn = fetcher or _default_fetcher
+        allowed_urls = frozenset(s.url for s in sources_config.sources if s.url)
 
         collected_items: List[Dict[str, object]] = []
+        observation_files: List[Path] = []
         source_stats: Dict[str, dict] = {}
 
         for source in sources_config.sources:
@@ -262,89 +460,197 @@ def run_pipeline(
                 source_stats[source.id] = {"status": "disabled", "count": 0, "error": None}
 
         enabled_sources = [s for s in sources_config.sources if s.enabled]
-        for source in enabled_sources:
-            request_url = source.url or ""
-            source_started_at = datetime.now(timezone.utc)
-            try:
-                if source.kind == "rss":
-                    content = fetch_fn(request_url, allowed_urls)
-                    items = parse_rss(content, source.model_dump())
-                elif source.kind == "estat_api":
-                    request_url = build_estat_url(request_url, source.params)
-                    allowed_urls.add(source.url)
-                    content = fetch_fn(request_url, allowed_urls)
-                    items = parse_estat(content, source.model_dump())
+        fetch_settings = sources_config.fetch
+        known_urls: Dict[str, Set[str]] = {}
+        if fetch_settings.incremental:
+            known_urls = load_known_urls(conn, (s.id for s in enabled_sources if s.kind == "rss"))
+        # One span for the whole concurrent fetch, plus one per source from the pool.
+        with timer.span("fetch_all") as fetch_span:
+            outcomes = run_bounded(
+                enabled_sources,
+                lambda source: _ingest_source(
+                    source,
+                    fetch_fn,
+                    allowed_urls,
+                    known_urls=known_urls.get(source.id),
+                    stop_after_known=fetch_settings.stop_after_known,
+                    timer=timer,
+                    page_concurrency=fetch_settings.estat_page_concurrency,
+                ),
+                url_of=lambda source: source.url or "",
+                max_concurrency=fetch_settings.max_concurrency,
+                per_host_limit=fetch_settings.per_host_limit,
+            )
+            fetch_span["items"] = sum(outcome["count"] for outcome in outcomes)
+
+        # Single writer: fetch/parse ran on the pool, persistence stays on this thread and
+        # lands in one transaction together with the buffered run-manager rows. The
+        # ``persist`` span covers the stages below plus the final flush and commit.
+        with timer.span("persist"), uow.transaction():
+            upsert_fact_indicator_series_run(conn, run_id, series_rows, commit=False)
+            upsert_dim_indicator_series(conn, resolved_rows, commit=False)
+
+            for source, outcome in zip(enabled_sources, outcomes):
+                exc = outcome["error"]
+                if outcome["not_modified"]:
+                    carried = carry_forward_items(conn, run_id, source.id)
+                    source_stats[source.id] = {
+                        "status": "not_modified",
+                        "count": carried,
+                        "error": None,
+                    }
+                    uow.record_source_run(
+                        source_id=source.id,
+                        started_at=outcome["started_at"],
+                        ended_at=outcome["ended_at"],
+                        status="not_modified",
+                        item_count=carried,
+                        http_status=304,
+                    )
+                elif exc is None:
+                    items = outcome["items"]
+                    # Known items were skipped by the incremental parser; attach the ones the
+                    # feed still listed to this run instead of re-upserting them.
+                    carried = (
+                        carry_forward_items(conn, run_id, source.id, urls=outcome["known"])
+                        if outcome["known"]
+                        else 0
+                    )
+                    source_stats[source.id] = {
+                        "status": "success",
+                        "count": outcome["count"] + carried,
+                        "error": None,
+                    }
+                    if outcome["observation_count"]:
+                        source_stats[source.id]["observations"] = outcome["observation_count"]
+                    if fetch_settings.incremental:
+                        source_stats[source.id]["new"] = len(items)
+                        source_stats[source.id]["known"] = len(outcome["known"])
+                    collected_items.extend(items)
+                    if outcome["observation_file"] is not None:
+                        observation_files.append(outcome["observation_file"])
+                    uow.record_source_run(
+                        source_id=source.id,
+                        started_at=outcome["started_at"],
+                        ended_at=outcome["ended_at"],
+                        status="success",
+                        item_count=outcome["count"] + carried,
+                    )
                 else:
-                    raise ValueError(f"Unsupported source kind: {source.kind}")
-                source_stats[source.id] = {"status": "success", "count": len(items), "error": None}
-                collected_items.extend(items)
-                record_source_run(
-                    run_id=run_id,
-                    source_id=source.id,
-                    started_at=source_started_at,
-                    ended_at=datetime.now(timezone.utc),
-                    status="success",
-                    item_count=len(items),
-                    conn=conn,
-                )
-            except Exception as exc:
-                logger.warning("Source %s failed: %s", source.id, exc)
-                source_stats[source.id] = {"status": "failed", "count": 0, "error": str(exc)}
-                record_source_run(
-                    run_id=run_id,
-                    source_id=source.id,
-                    started_at=source_started_at,
-                    ended_at=datetime.now(timezone.utc),
-                    status="failed",
-                    item_count=0,
-                    error_class=exc.__class__.__name__,
-                    error_message=str(exc),
-                    conn=conn,
+                    source_stats[source.id] = {"status": "failed", "count": 0, "error": str(exc)}
+                    uow.record_source_run(
+                        source_id=source.id,
+                        started_at=outcome["started_at"],
+                        ended_at=outcome["ended_at"],
+                        status="failed",
+                        item_count=0,
+                        error_class=exc.__class__.__name__,
+                        error_message=str(exc),
+                    )
+
+            if session is not None:
+                # A stream closed early by a failing parse still reported its validators;
+                # only keep those of sources whose body was ingested.
+                ingested_urls = {
+                    _request_url(source)
+                    for source in enabled_sources
+                    if source_stats[source.id]["status"] == "success"
+                }
+                upsert_http_validators(
+                    conn,
+                    [v for v in session.updated_validators() if v["url"] in ingested_urls],
+                    commit=False,
                 )
 
-        unique_items = _dedupe_items(collected_items)
+            with timer.span("dedupe") as span:
+                unique_items = _dedupe_items(collected_items)
+                span["items"] = len(unique_items)
 
-        overall_status = "success"
-        if any(stat["status"] == "failed" for stat in source_stats.values()):
-            overall_status = "partial"
-        if not enabled_sources:
-            overall_status = "failed"
+            overall_status = "success"
+            if any(stat["status"] == "failed" for stat in source_stats.values()):
+                overall_status = "partial"
+            if not enabled_sources:
+                overall_status = "failed"
 
-        for source in sources_config.sources:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO sources (run_id, source_id, source_name, category, kind, enabled)
                 VALUES (?, ?, ?, ?, ?, ?)
                 """,
-                [run_id, source.id, source.name, source.category, source.kind, source.enabled],
+                [
+                    [run_id, source.id, source.name, source.category, source.kind, source.enabled]
+                    for source in sources_config.sources
+                ],
             )
 
-        for item in unique_items:
-            _upsert_item_latest(conn, run_id, item)
-
-        finished_at = datetime.now(timezone.utc)
-        conn.execute(
-            """
-            INSERT INTO runs (run_id, started_at, finished_at, status, item_count, source_count)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            [
-                run_id,
-                run_started_at,
-                finished_at,
-                overall_status,
-                len(unique_items),
-                len(enabled_sources),
-            ],
-        )
-        conn.commit()
-        finish_run(run_id=run_id, status=overall_status, conn=conn)
+            with timer.span("db_upsert") as span:
+                item_stats = upsert_items(conn, run_id, unique_items)
+                span["items"] = len(unique_items)
+            with timer.span("observations") as span:
+                observation_stats = upsert_observation_files(conn, run_id, observation_files)
+                span["items"] = sum(outcome["observation_count"] for outcome in outcomes)
+            watchlist_stats = None
+            if watchlist_config is not None and watchlist_config.watch_entities:
+                with timer.span("watchlist"):
+                    watchlist_stats = match_run_items(
+                        conn, run_id, WatchlistMatcher(watchlist_config.watch_entities)
+                    )
+            with timer.span("geo"):
+                geo_stats = tag_run_items(conn, run_id, geo_tagger)
+            with timer.span("near_dup"):
+                near_dup_stats = cluster_run_items(conn, run_id)
+            scoring_stats = None
+            if scoring_config is not None:
+                with timer.span("scoring"):
+                    scoring_stats = score_run_items(
+                        conn, run_id, scoring_config, as_of=run_started_at
+                    )
+            alerts: List[dict] = []
+            alert_stats = None
+            if alerts_config is not None and alerts_config.enabled and alerts_config.rules:
+                with timer.span("alerts"):
+                    # Source-failure rules read the health rollup, which the flush updates.
+                    uow.flush()
+                    alerts = evaluate_alerts(conn, run_id, alerts_config.rules)
+                    queued = record_alerts(conn, run_id, alerts, alerts_config.channels)
+                alert_stats = {"raised": len(alerts), "queued": queued}
+
+            # Counted from the table so items carried forward from earlier runs are included.
+            item_count = conn.execute(
+                "SELECT count(*) FROM items WHERE run_id = ?", [run_id]
+            ).fetchone()[0]
+            finished_at = datetime.now(timezone.utc)
+            conn.execute(
+                """
+                INSERT INTO runs (run_id, started_at, finished_at, status, item_count, source_count)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    run_id,
+                    run_started_at,
+                    finished_at,
+                    overall_status,
+                    item_count,
+                    len(enabled_sources),
+                ],
+            )
+            with timer.span("export"):
+                export_paths = export_run_items(
+                    conn, run_id, _output_root() / run_id, formats=export_formats()
+                )
+            finish_run(run_id=run_id, status=overall_status, uow=uow)
+        _record_stages(conn, run_id, timer)
     except Exception:
         if run_id:
             finish_run(run_id=run_id, status="failed", conn=conn)
         raise
     finally:
         conn.close()
+        if session is not None:
+            session.close()
+        for outcome in outcomes:
+            if outcome["observation_file"] is not None:
+                outcome["observation_file"].unlink(missing_ok=True)
 
     stats = {
         "run_id": run_id,
@@ -352,10 +658,29 @@ def run_pipeline(
         "mode": mode,
         "started_at": run_started_at.isoformat() if run_started_at else None,
         "finished_at": finished_at.isoformat(),
-        "item_count": len(unique_items),
+        "item_count": item_count,
         "source_count": len(enabled_sources),
         "sources": source_stats,
         "series_registry": series_stats,
+        "items": item_stats,
+        "observations": observation_stats,
     }
-    output_dir = _write_exports(run_id, unique_items, stats)
+    if watchlist_stats is not None:
+        stats["watchlist"] = watchlist_stats
+    stats["geo"] = geo_stats
+    stats["near_duplicates"] = near_dup_stats
+    if scoring_stats is not None:
+        stats["scoring"] = scoring_stats
+    if alert_stats is not None:
+        stats["alerts"] = alert_stats
+    fetch_stats = getattr(fetch_fn, "stats", None)
+    if callable(fetch_stats):
+        stats["http"] = fetch_stats()
+    stats["exports"] = {fmt: path.name for fmt, path in export_paths.items()}
+    stats["stages"] = timer.report()
+    profiler.stop()
+    profile_path = profiler.write(_output_root() / run_id)
+    if profile_path is not None:
+        stats["profile"] = profile_path.name
+    output_dir = _write_exports(run_id, stats, alerts)
     return run_id, output_dir
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from src.pipeline.run_manager import add_run_finished_listener
+
+CacheKey = Tuple[Optional[str], Optional[str]]
+
+
+def cache_key(latest_run: Optional[dict]) -> CacheKey:
+    """Identify the dashboard state: latest run id and its ``fact_run.ended_at``."""
+    if not latest_run:
+        return (None, None)
+    ended_at = latest_run.get("ended_at")
+    return (latest_run["run_id"], ended_at.isoformat() if ended_at is not None else None)
+
+
+def etag_for(key: CacheKey, variant: str) -> str:
+    digest = hashlib.sha256(repr((key, variant)).encode("utf-8")).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+class DailyPageCache:
+    """
+    Query results and rendered pages for ``/daily``.
+
+    Only the latest key is kept: a new run (or a finished run, via the ``finish_run``
+    listener) replaces everything. Rendered pages are stored per variant (the viewer).
+    """
+
+    def __init__(self, max_pages: int = 64) -> None:
+        self.max_pages = max_pages
+        self._lock = threading.Lock()
+        self._key: Optional[CacheKey] = None
+        self._data: Optional[Dict[str, Any]] = None
+        self._pages: Dict[str, bytes] = {}
+
+    def get_data(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._data if self._key == key else None
+
+    def put_data(self, key: CacheKey, data: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._key != key:
+                self._pages = {}
+            self._key = key
+            self._data = data
+
+    def latest(self) -> Optional[Tuple[CacheKey, Dict[str, Any]]]:
+        """Last cached state, served while the database is unavailable."""
+        with self._lock:
+            if self._key is None or self._data is None:
+                return None
+            return self._key, self._data
+
+    def get_page(self, key: CacheKey, variant: str) -> Optional[bytes]:
+        with self._lock:
+            return self._pages.get(variant) if self._key == key else None
+
+    def put_page(self, key: CacheKey, variant: str, body: bytes) -> None:
+        with self._lock:
+            if self._key != key:
+                return
+            if len(self._pages) >= self.max_pages:
+                self._pages.pop(next(iter(self._pages)))
+            self._pages[variant] = body
+
+    def invalidate(self, *_: Any) -> None:
+        with self._lock:
+            self._key = None
+            self._data = None
+            self._pages = {}
+
+
+daily_cache = DailyPageCache()
+add_run_finished_listener(daily_cache.invalidate)
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+from datetime import date, datetime
 from pathlib import Path
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Request, status
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
 
 from src.app.auth.deps import get_current_user, get_session_manager, require_role
 from src.app.auth.session import SessionData, authenticate_user
+from src.app.web.cache import cache_key, daily_cache, etag_for, etag_matches
 from src.core.logging import get_logger
+from src.core.text_search import highlight, query_terms
 from src.storage import queries
-from src.storage.db import connect
+from src.storage.db import DatabaseUnavailableError, ReadOnlyDatabase
+from src.storage.observations import get_series
+from src.storage.search import search_items
 
 router = APIRouter()
 
@@ -18,9 +24,18 @@ templates = Jinja2Templates(directory=Path(__file__).resolve().parent.parent / "
 logger = get_logger(__name__)
 
 
+def get_database(request: Request) -> ReadOnlyDatabase:
+    """Shared read-only database opened by the app lifespan (created lazily without it)."""
+    database = getattr(request.app.state, "database", None)
+    if database is None:
+        database = ReadOnlyDatabase()
+        request.app.state.database = database
+    return database
+
+
 @router.get("/login", response_class=HTMLResponse)
 def login_form(request: Request) -> HTMLResponse:
-    return templates.TemplateResponse("login.html", {"request": request, "error": None})
+    return templates.TemplateResponse(request, "login.html", {"error": None})
 
 
 @router.post("/login")
@@ -31,8 +46,9 @@ async def login(request: Request, manager=Depends(get_session_manager)):
     role = authenticate_user(username, password)
     if not role:
         return templates.TemplateResponse(
+            request,
             "login.html",
-            {"request": request, "error": "Invalid credentials"},
+            {"error": "Invalid credentials"},
             status_code=status.HTTP_401_UNAUTHORIZED,
         )
     token = manager.create_session(username, role)
@@ -46,43 +62,160 @@ async def login(request: Request, manager=Depends(get_session_manager)):
     return response
 
 
-@router.get("/daily", response_class=HTMLResponse)
-def daily(
-    request: Request,
-    user: SessionData = Depends(get_current_user),
-) -> HTMLResponse:
-    latest_run = None
+def _load_daily_data(conn, latest_run: dict | None) -> dict:
     items = []
     counts = []
     health = []
-    conn = None
+    if latest_run:
+        items = queries.get_items_for_run(
+            conn, latest_run["run_id"], limit=200, order_by="score", collapse_duplicates=True
+        )
+        counts = queries.get_item_counts_by_source(conn, latest_run["run_id"])
+        health = queries.get_source_health_rollup(conn, latest_run["run_id"])
+    return {"latest_run": latest_run, "items": items, "counts": counts, "health": health}
 
+
+@router.get("/daily", response_class=HTMLResponse)
+def daily(
+    request: Request,
+    user: SessionData = Depends(get_current_user),
+    database: ReadOnlyDatabase = Depends(get_database),
+) -> Response:
+    # Dashboard data only changes when a run finishes; only get_latest_run runs per request.
+    key = cache_key(None)
+    data = None
     try:
-        conn = connect()
-        latest_run = queries.get_latest_run(conn)
-        if latest_run:
-            items = queries.get_items_for_run(conn, latest_run["run_id"], limit=200)
-            counts = queries.get_item_counts_by_source(conn, latest_run["run_id"])
-            health = queries.get_source_health(conn, latest_run["run_id"], lookback_runs=20)
+        with database.cursor() as conn:
+            latest_run = queries.get_latest_run(conn)
+            key = cache_key(latest_run)
+            etag = etag_for(key, user.username)
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED,
+                    headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+                )
+            data = daily_cache.get_data(key)
+            if data is None:
+                data = _load_daily_data(conn, latest_run)
+                daily_cache.put_data(key, data)
     except Exception as exc:  # pragma: no cover - defensive
         logger.warning("Could not read run history: %s", exc)
-    finally:
-        if conn is not None:
-            conn.close()
+        cached = daily_cache.latest()
+        if cached:
+            key, data = cached
+    if data is None:
+        data = {"latest_run": None, "items": [], "counts": [], "health": []}
+
+    headers = {"ETag": etag_for(key, user.username), "Cache-Control": "private, no-cache"}
+    body = daily_cache.get_page(key, user.username)
+    if body is None:
+        rendered = templates.TemplateResponse(request, "daily.html", {"user": user, **data})
+        body = bytes(rendered.body)
+        daily_cache.put_page(key, user.username, body)
+    return HTMLResponse(body, headers=headers)
+
+
+@router.get("/search", response_class=HTMLResponse)
+def search(
+    request: Request,
+    q: str = "",
+    source_id: Optional[str] = None,
+    user: SessionData = Depends(get_current_user),
+    database: ReadOnlyDatabase = Depends(get_database),
+) -> HTMLResponse:
+    terms = query_terms(q)
+    results = []
+    error = None
+    if terms:
+        try:
+            with database.cursor() as conn:
+                results = search_items(conn, terms, limit=50, source_id=source_id)
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("Search failed for %r: %s", q, exc)
+            error = "Search is unavailable right now."
+    for item in results:
+        item["title_html"] = highlight(item["title"], terms)
+        item["snippet_html"] = highlight(item["summary"], terms, width=240)
 
     return templates.TemplateResponse(
-        "daily.html",
-        {
-            "request": request,
-            "user": user,
-            "latest_run": latest_run,
-            "items": items,
-            "counts": counts,
-            "health": health,
-        },
+        request,
+        "search.html",
+        {"user": user, "query": q, "results": results, "error": error},
     )
 
 
+@router.get("/api/items")
+def api_items(
+    run_id: Optional[str] = None,
+    source_id: List[str] = Query(default=[]),
+    category: Optional[str] = None,
+    kind: Optional[str] = None,
+    published_from: Optional[datetime] = Query(default=None, alias="from"),
+    published_to: Optional[datetime] = Query(default=None, alias="to"),
+    cursor: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    geo: Optional[str] = None,
+    _: SessionData = Depends(get_current_user),
+    database: ReadOnlyDatabase = Depends(get_database),
+) -> dict:
+    try:
+        with database.cursor() as conn:
+            items, next_cursor = queries.get_items_page(
+                conn,
+                run_id=run_id,
+                source_ids=source_id,
+                category=category,
+                kind=kind,
+                published_from=published_from,
+                published_to=published_to,
+                cursor=cursor,
+                limit=limit,
+                geo=geo,
+            )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except DatabaseUnavailableError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/api/series")
+def api_series(
+    key: List[str] = Query(min_length=1, max_length=20),
+    start: Optional[date] = Query(default=None, alias="from"),
+    end: Optional[date] = Query(default=None, alias="to"),
+    dimension: Optional[str] = None,
+    method: str = "lttb",
+    bucket: str = "month",
+    points: int = Query(default=500, ge=3, le=5000),
+    _: SessionData = Depends(get_current_user),
+    database: ReadOnlyDatabase = Depends(get_database),
+) -> dict:
+    """Indicator series over ``from``..``to``, downsampled server-side (see ``get_series``)."""
+    try:
+        with database.cursor() as conn:
+            lines = get_series(
+                conn,
+                key,
+                start=start,
+                end=end,
+                dimension_key=dimension,
+                method=method,
+                bucket=bucket,
+                points=points,
+            )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except DatabaseUnavailableError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)
+        ) from exc
+    found = {line["series_key"] for line in lines}
+    return {"series": lines, "missing": [k for k in key if k not in found]}
+
+
 @router.get("/run/manual")
 def manual_run(_: SessionData = Depends(require_role("operator"))):
     return JSONResponse({"detail": "Manual run not implemented in PR0"}, status_code=501)
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from src.core.text_search import is_word_char, normalize_text, normalize_with_offsets
+
+T = TypeVar("T")
+Match = Tuple[int, int, T]
+
+
+def leftmost_longest(matches: Iterable[Match]) -> List[Match]:
+    """
+    Non-overlapping subset of ``matches``: leftmost first and longest at each position
+    (so "New York City" wins over "York" in the same span). Values sharing the exact
+    winning span are all kept.
+    """
+    selected: List[Match] = []
+    covered = 0
+    for start, end, value in sorted(matches, key=lambda m: (m[0], m[0] - m[1])):
+        same_span = bool(selected) and selected[-1][:2] == (start, end)
+        if start < covered and not same_span:
+            continue
+        selected.append((start, end, value))
+        covered = end
+    return selected
+
+
+class AhoCorasick(Generic[T]):
+    """
+    Multi-pattern string matcher (Aho–Corasick automaton).
+
+    All patterns are compiled into one trie with failure links, so a scan reads each
+    character of the text once no matter how many patterns there are; the cost is
+    O(len(text) + matches). Patterns are matched exactly as given: normalize them and the
+    text the same way beforehand. A pattern may carry several values (e.g. two entities
+    sharing an alias).
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, T]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Per state: (pattern length, value) for every pattern ending there, including
+        # those reachable through failure links.
+        self._out: List[List[Tuple[int, T]]] = [[]]
+        self.pattern_count = 0
+        for pattern, value in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(pattern), value))
+            self.pattern_count += 1
+        self._link()
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                if self._out[self._fail[nxt]]:
+                    self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, T]]:
+        """
+        Yield ``(start, end, value)`` for every occurrence of every pattern in ``text``,
+        overlaps included, ordered by end offset (longest first for a shared end).
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                end = index + 1
+                for length, value in out[state]:
+                    yield end - length, end, value
+
+    def longest_matches(self, text: str) -> List[Tuple[int, int, T]]:
+        """``iter_matches`` reduced with ``leftmost_longest``."""
+        return leftmost_longest(self.iter_matches(text))
+
+
+def _on_word_boundaries(text: str, start: int, end: int) -> bool:
+    # Only edges made of word characters need a boundary on the outside.
+    if start > 0 and is_word_char(text[start]) and is_word_char(text[start - 1]):
+        return False
+    if end < len(text) and is_word_char(text[end - 1]) and is_word_char(text[end]):
+        return False
+    return True
+
+
+class PhraseMatcher(Generic[T]):
+    """
+    ``AhoCorasick`` over human-written phrases (names, places).
+
+    Phrases and text are compared NFKC + lowercased; phrases that start or end with a
+    Latin letter or digit only match on word boundaries ("AI" does not hit "said"), CJK
+    phrases match anywhere. Offsets refer to the original text.
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[str, T]]):
+        patterns: Dict[Tuple[str, T], None] = {}
+        for phrase, value in phrases:
+            pattern = normalize_text(phrase).strip()
+            if pattern:
+                patterns[(pattern, value)] = None
+        self._automaton: AhoCorasick[T] = AhoCorasick(patterns)
+
+    @property
+    def pattern_count(self) -> int:
+        return self._automaton.pattern_count
+
+    def find(self, text: Optional[str], longest: bool = False) -> List[Tuple[int, int, T]]:
+        """
+        ``(start, end, value)`` for each hit in ``text``; with ``longest``, overlapping
+        hits are reduced to the leftmost-longest ones.
+        """
+        if not text or not self._automaton.pattern_count:
+            return []
+        normalized, origin = normalize_with_offsets(text)
+        hits = [
+            (start, end, value)
+            for start, end, value in self._automaton.iter_matches(normalized)
+            if _on_word_boundaries(normalized, start, end)
+        ]
+        if longest:
+            hits = leftmost_longest(hits)
+        return [(origin[start], origin[end - 1] + 1, value) for start, end, value in hits]
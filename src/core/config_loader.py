@@ -2,12 +2,19 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 import yaml
 from pydantic import ValidationError
 
-from .config_schema import CONFIG_MODEL_MAP, SourcesConfig
+from .config_schema import (
+    CONFIG_MODEL_MAP,
+    AlertsConfig,
+    GeoConfig,
+    ScoringConfig,
+    SourcesConfig,
+    WatchlistConfig,
+)
 from .logging import get_logger
 
 logger = get_logger(__name__)
@@ -58,6 +65,29 @@ def load_sources_config(config_dir: Path) -> SourcesConfig:
     return SourcesConfig(**data)
 
 
+def _load_optional_config(config_dir: Path, filename: str):
+    path = config_dir / filename
+    if not path.exists():
+        return None
+    return CONFIG_MODEL_MAP[filename](**load_yaml(path))
+
+
+def load_watchlist_config(config_dir: Path) -> Optional[WatchlistConfig]:
+    return _load_optional_config(config_dir, "watchlist.yml")
+
+
+def load_alerts_config(config_dir: Path) -> Optional[AlertsConfig]:
+    return _load_optional_config(config_dir, "alerts.yml")
+
+
+def load_geo_config(config_dir: Path) -> Optional[GeoConfig]:
+    return _load_optional_config(config_dir, "geo.yml")
+
+
+def load_scoring_config(config_dir: Path) -> Optional[ScoringConfig]:
+    return _load_optional_config(config_dir, "scoring.yml")
+
+
 def print_validation_report(config_dir: Path) -> int:
     ok, messages = validate_config_dir(config_dir)
     for message in messages:
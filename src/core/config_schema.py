@@ -27,7 +27,18 @@ class SourceEntry(BaseModel):
         return self
 
 
+class FetchSettings(BaseModel):
+    max_concurrency: int = Field(default=8, ge=1)
+    per_host_limit: int = Field(default=2, ge=1)
+    # Incremental RSS ingest: stop parsing a feed after this many consecutive known items.
+    incremental: bool = False
+    stop_after_known: int = Field(default=5, ge=1)
+    # e-Stat tables spanning several responses: pages fetched at once per source.
+    estat_page_concurrency: int = Field(default=2, ge=1)
+
+
 class SourcesConfig(BaseModel):
+    fetch: FetchSettings = Field(default_factory=FetchSettings)
     sources: list[SourceEntry]
 
     @model_validator(mode="after")
@@ -48,6 +59,7 @@ class MatchingPolicy(BaseModel):
 
 class WatchEntity(BaseModel):
     name: str
+    aliases: list[str] = Field(default_factory=list)
     metadata: dict[str, str] = Field(default_factory=dict)
 
 
@@ -57,8 +69,17 @@ class WatchlistConfig(BaseModel):
     watch_entities: list[WatchEntity] = Field(default_factory=list)
 
 
+class GeoPlace(BaseModel):
+    """A place to tag in addition to the built-in prefectures and major cities."""
+
+    name: str
+    prefecture: str
+    aliases: list[str] = Field(default_factory=list)
+
+
 class GeoConfig(BaseModel):
     geo_rollups: dict[str, list[str]]
+    places: list[GeoPlace] = Field(default_factory=list)
 
     @model_validator(mode="after")
     def validate_tokyo_rollup(self) -> "GeoConfig":
@@ -88,8 +109,24 @@ class SeriesConfig(BaseModel):
 
 
 class ScoringRule(BaseModel):
+    """
+    One weighted term of an item's score. ``feature`` picks what is measured (each yields
+    a value in [0, 1] except ``watchlist``, which counts matched entities):
+
+    - constant: 1 for every item
+    - recency: halves every ``half_life_hours`` between publication and the scoring run
+    - watchlist: number of watch entities the item mentions
+    - category / source: 1 if the item's category / source id is in ``values``
+    - keyword: share of ``values`` found in the title or summary (case-insensitive)
+    """
+
     name: str
     weight: float = Field(default=1.0)
+    feature: Literal["constant", "recency", "watchlist", "category", "source", "keyword"] = (
+        "constant"
+    )
+    values: list[str] = Field(default_factory=list)
+    half_life_hours: float = Field(default=24.0, gt=0)
 
 
 class ScoringConfig(BaseModel):
@@ -100,11 +137,33 @@ class ScoringConfig(BaseModel):
 class AlertChannel(BaseModel):
     channel: str
     target: Optional[str] = None
+    batch_size: int = Field(default=50, gt=0)
+
+
+class AlertRule(BaseModel):
+    """
+    When to raise an alert for a run:
+
+    - watchlist: an item mentions a watch entity (any, or one of ``values``)
+    - score: an item's score is at least ``threshold``
+    - source_failure: a source reaches ``threshold`` consecutive failed runs
+
+    Item alerts fire once per item and rule, not again on later runs.
+    """
+
+    name: str
+    type: Literal["watchlist", "score", "source_failure"]
+    threshold: float = Field(default=1.0)
+    values: list[str] = Field(default_factory=list)
+    severity: str = Field(default="info")
 
 
 class AlertsConfig(BaseModel):
     enabled: bool = Field(default=True)
     channels: list[AlertChannel] = Field(default_factory=list)
+    rules: list[AlertRule] = Field(default_factory=list)
+    max_attempts: int = Field(default=5, gt=0)
+    retry_backoff_seconds: float = Field(default=60.0, ge=0)
 
 
 CONFIG_MODEL_MAP = {
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import List, Sequence
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    ``xs`` must be ascending. The first and last points are always kept; every bucket in
+    between keeps the point forming the largest triangle with the previously kept point
+    and the average of the next bucket, which preserves peaks and troughs a chart would
+    lose to plain averaging. Returns all indices when there are no more than
+    ``threshold`` points.
+    """
+    if threshold < 3:
+        raise ValueError("threshold must be at least 3")
+    count = len(xs)
+    if count <= threshold:
+        return list(range(count))
+
+    every = (count - 2) / (threshold - 2)
+    kept = [0]
+    previous = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_start = end
+        next_end = min(int((bucket + 2) * every) + 1, count)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        px, py = xs[previous], ys[previous]
+        best, best_area = start, -1.0
+        for index in range(start, end):
+            area = abs((px - avg_x) * (ys[index] - py) - (px - xs[index]) * (avg_y - py))
+            if area > best_area:
+                best, best_area = index, area
+        kept.append(best)
+        previous = best
+    kept.append(count - 1)
+    return kept
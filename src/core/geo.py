@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from src.core.aho_corasick import PhraseMatcher
+from src.core.config_schema import GeoConfig, GeoPlace
+
+# (name, official Japanese name, extra surface forms). The bare Japanese short form is only
+# listed where it is not also a common surname or word (山口, 石川, 大分, ...).
+PREFECTURES: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ("Hokkaido", "北海道", ("Hokkaidō",)),
+    ("Aomori", "青森県", ("青森",)),
+    ("Iwate", "岩手県", ("岩手",)),
+    ("Miyagi", "宮城県", ("宮城",)),
+    ("Akita", "秋田県", ("秋田",)),
+    ("Yamagata", "山形県", ()),
+    ("Fukushima", "福島県", ("福島",)),
+    ("Ibaraki", "茨城県", ("茨城",)),
+    ("Tochigi", "栃木県", ("栃木",)),
+    ("Gunma", "群馬県", ("群馬",)),
+    ("Saitama", "埼玉県", ("埼玉",)),
+    ("Chiba", "千葉県", ("千葉",)),
+    ("Tokyo", "東京都", ("東京", "Tōkyō")),
+    ("Kanagawa", "神奈川県", ("神奈川",)),
+    ("Niigata", "新潟県", ("新潟",)),
+    ("Toyama", "富山県", ("富山",)),
+    ("Ishikawa", "石川県", ()),
+    ("Fukui", "福井県", ()),
+    ("Yamanashi", "山梨県", ("山梨",)),
+    ("Nagano", "長野県", ()),
+    ("Gifu", "岐阜県", ("岐阜",)),
+    ("Shizuoka", "静岡県", ("静岡",)),
+    ("Aichi", "愛知県", ("愛知",)),
+    ("Mie", "三重県", ()),
+    ("Shiga", "滋賀県", ("滋賀",)),
+    ("Kyoto", "京都府", ("京都", "Kyōto")),
+    ("Osaka", "大阪府", ("大阪", "Ōsaka")),
+    ("Hyogo", "兵庫県", ("兵庫", "Hyōgo")),
+    ("Nara", "奈良県", ("奈良",)),
+    ("Wakayama", "和歌山県", ("和歌山",)),
+    ("Tottori", "鳥取県", ("鳥取",)),
+    ("Shimane", "島根県", ("島根",)),
+    ("Okayama", "岡山県", ("岡山",)),
+    ("Hiroshima", "広島県", ("広島",)),
+    ("Yamaguchi", "山口県", ()),
+    ("Tokushima", "徳島県", ("徳島",)),
+    ("Kagawa", "香川県", ()),
+    ("Ehime", "愛媛県", ("愛媛",)),
+    ("Kochi", "高知県", ("高知", "Kōchi")),
+    ("Fukuoka", "福岡県", ("福岡",)),
+    ("Saga", "佐賀県", ("佐賀",)),
+    ("Nagasaki", "長崎県", ("長崎",)),
+    ("Kumamoto", "熊本県", ("熊本",)),
+    ("Oita", "大分県", ("Ōita",)),
+    ("Miyazaki", "宮崎県", ()),
+    ("Kagoshima", "鹿児島県", ("鹿児島",)),
+    ("Okinawa", "沖縄県", ("沖縄",)),
+)
+
+# Designated cities whose names differ from their prefecture's, plus Naha:
+# (name, Japanese forms, prefecture).
+MUNICIPALITIES: Tuple[Tuple[str, Tuple[str, ...], str], ...] = (
+    ("Sapporo", ("札幌市", "札幌"), "Hokkaido"),
+    ("Sendai", ("仙台市", "仙台"), "Miyagi"),
+    ("Yokohama", ("横浜市", "横浜"), "Kanagawa"),
+    ("Kawasaki", ("川崎市",), "Kanagawa"),
+    ("Sagamihara", ("相模原市", "相模原"), "Kanagawa"),
+    ("Hamamatsu", ("浜松市", "浜松"), "Shizuoka"),
+    ("Nagoya", ("名古屋市", "名古屋"), "Aichi"),
+    ("Sakai", ("堺市",), "Osaka"),
+    ("Kobe", ("神戸市", "神戸", "Kōbe"), "Hyogo"),
+    ("Kitakyushu", ("北九州市", "北九州"), "Fukuoka"),
+    ("Naha", ("那覇市", "那覇"), "Okinawa"),
+)
+# Romanized names matched only through their Japanese forms (company names, surnames).
+_JAPANESE_ONLY = {"Kawasaki", "Sakai"}
+
+
+class GeoTagger:
+    """
+    Tags text with the places it mentions, expanded to prefectures and rollups.
+
+    All surface forms (romanized and Japanese) of the prefectures, the built-in cities
+    and ``places`` are compiled into one ``PhraseMatcher``; overlapping hits resolve to
+    the longest (東京都 is Tokyo, not 京都). A city hit also tags its prefecture, and
+    every place tags the ``rollups`` that list it or its prefecture.
+    """
+
+    def __init__(
+        self,
+        rollups: Optional[Mapping[str, Sequence[str]]] = None,
+        places: Sequence[GeoPlace] = (),
+    ):
+        prefectures = {name for name, _, _ in PREFECTURES}
+        phrases: List[Tuple[str, Tuple[str, str]]] = []
+        self._prefecture_of: Dict[str, str] = {}
+        for name, official, extra in PREFECTURES:
+            for surface in (name, official, *extra):
+                phrases.append((surface, ("prefecture", name)))
+            self._prefecture_of[name] = name
+        for name, forms, prefecture in MUNICIPALITIES:
+            surfaces = forms if name in _JAPANESE_ONLY else (name, *forms)
+            phrases.extend((surface, ("municipality", name)) for surface in surfaces)
+            self._prefecture_of[name] = prefecture
+        for place in places:
+            if place.prefecture not in prefectures:
+                raise ValueError(f"geo place {place.name}: unknown prefecture {place.prefecture}")
+            for surface in (place.name, *place.aliases):
+                phrases.append((surface, ("municipality", place.name)))
+            self._prefecture_of[place.name] = place.prefecture
+        self._rollups_of: Dict[str, List[str]] = {}
+        for rollup, members in (rollups or {}).items():
+            for member in members:
+                self._rollups_of.setdefault(member, []).append(rollup)
+        self._matcher: PhraseMatcher[Tuple[str, str]] = PhraseMatcher(phrases)
+
+    @classmethod
+    def from_config(cls, config: Optional[GeoConfig]) -> "GeoTagger":
+        if config is None:
+            return cls()
+        return cls(config.geo_rollups, config.places)
+
+    def expand(self, level: str, name: str) -> List[Tuple[str, str]]:
+        """``(level, geo_key)`` for a hit and everything it rolls up into."""
+        keys = [(level, name)]
+        prefecture = self._prefecture_of[name]
+        if prefecture != name:
+            keys.append(("prefecture", prefecture))
+        rollups = self._rollups_of.get(name, []) + self._rollups_of.get(prefecture, [])
+        keys.extend(("rollup", rollup) for rollup in dict.fromkeys(rollups))
+        return keys
+
+    def tag(self, text: Optional[str]) -> List[Tuple[int, int, str, str]]:
+        """``(start, end, level, name)`` for each place mention in ``text``."""
+        return [
+            (start, end, level, name)
+            for start, end, (level, name) in self._matcher.find(text, longest=True)
+        ]
+
+    def tag_item(self, item: dict, fields: Sequence[str] = ("title", "summary")) -> List[dict]:
+        """
+        One row per geo key (place, prefecture or rollup) the item mentions, with the
+        surface form that first implied it and the number of mentions behind it.
+        """
+        found: Dict[str, dict] = {}
+        for field in fields:
+            text = item.get(field)
+            for start, end, level, name in self.tag(text):
+                for key_level, key in self.expand(level, name):
+                    row = found.get(key)
+                    if row is None:
+                        found[key] = {
+                            "source_id": item["source_id"],
+                            "url": item["url"],
+                            "geo_key": key,
+                            "geo_level": key_level,
+                            "matched_text": text[start:end],
+                            "hit_count": 1,
+                        }
+                    else:
+                        row["hit_count"] += 1
+        return list(found.values())
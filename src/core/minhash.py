@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import struct
+from functools import lru_cache
+from hashlib import blake2b, shake_128
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from src.core.text_search import tokenize
+
+# 16 bands of 3 rows: pairs with Jaccard 0.5 share a bucket ~88% of the time, pairs at
+# 0.2 ~12% and unrelated items (< 0.1) almost never.
+BANDS = 16
+ROWS = 3
+SIGNATURE_SIZE = BANDS * ROWS
+
+_VALUES = struct.Struct(f">{SIGNATURE_SIZE}I")
+
+
+@lru_cache(maxsize=65536)
+def _feature_hashes(feature: str) -> Tuple[int, ...]:
+    # One independent 32-bit hash per signature position, cut from a single SHAKE digest.
+    return _VALUES.unpack(shake_128(feature.encode("utf-8")).digest(_VALUES.size))
+
+
+def item_features(title: Optional[str], summary: Optional[str]) -> set:
+    """Distinct search terms of an item's title and summary (CJK as bigrams)."""
+    return set(tokenize(title)) | set(tokenize(summary))
+
+
+def minhash(features: Iterable[str]) -> Optional[List[int]]:
+    """
+    MinHash signature of a feature set: for each of ``SIGNATURE_SIZE`` independent 32-bit
+    hash functions, the smallest hash of any feature. The share of equal positions between
+    two signatures estimates the Jaccard similarity of their sets. None for an empty set.
+    """
+    hashes = [_feature_hashes(feature) for feature in features]
+    if not hashes:
+        return None
+    return [min(column) for column in zip(*hashes)]
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def band_keys(signature: Sequence[int]) -> List[int]:
+    """
+    LSH bucket key per band of ``ROWS`` signature values. The band number sits in the
+    top bits so equal slices in different bands never share a bucket.
+    """
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS : (band + 1) * ROWS]
+        digest = blake2b(struct.pack(f">{ROWS}I", *rows), digest_size=6).digest()
+        keys.append((band << 48) | int.from_bytes(digest, "big"))
+    return keys
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 import yaml
 from pydantic import ValidationError
@@ -9,6 +9,9 @@ from pydantic import ValidationError
 from src.core.config_schema import SeriesConfig
 from src.storage.series_cache import upsert_series_resolution
 
+if TYPE_CHECKING:
+    from src.pipeline.run_manager import RunUnitOfWork
+
 
 def _load_series_config(config_dir: Path) -> SeriesConfig:
     path = config_dir / "series.yml"
@@ -21,7 +24,9 @@ def _load_series_config(config_dir: Path) -> SeriesConfig:
         return SeriesConfig(series=[])
 
 
-def _resolve_entry(series_entry, conn) -> Dict[str, Optional[str]]:
+def _resolve_entry(
+    series_entry, conn, uow: Optional["RunUnitOfWork"] = None
+) -> Dict[str, Optional[str]]:
     resolver_type = series_entry.resolver.type
     resolver_value = series_entry.resolver.value
     status = "resolved"
@@ -42,27 +47,47 @@ def _resolve_entry(series_entry, conn) -> Dict[str, Optional[str]]:
         status = "error"
         message = str(exc)
 
-    upsert_series_resolution(
-        conn=conn,
-        series_key=series_entry.key,
-        resolver_type=resolver_type,
-        resolver_value=resolver_value,
-        resolved_id=resolved_id,
-        status=status,
-        message=message,
-    )
+    if uow is not None:
+        uow.record_series_resolution(
+            series_key=series_entry.key,
+            resolver_type=resolver_type,
+            resolver_value=resolver_value,
+            resolved_id=resolved_id,
+            status=status,
+            message=message,
+        )
+    else:
+        upsert_series_resolution(
+            conn=conn,
+            series_key=series_entry.key,
+            resolver_type=resolver_type,
+            resolver_value=resolver_value,
+            resolved_id=resolved_id,
+            status=status,
+            message=message,
+        )
 
     return {
+        "resolver_type": resolver_type,
+        "resolver_value": resolver_value,
         "resolved_id": resolved_id,
         "status": status,
         "message": message,
     }
 
 
-def resolve_series_config(config_dir: Path, conn) -> Dict[str, dict]:
+def resolve_series_config(
+    config_dir: Path, conn, uow: Optional["RunUnitOfWork"] = None
+) -> Dict[str, dict]:
+    """
+    Resolve every series in ``series.yml``.
+
+    Resolutions are written to ``dim_series_resolution`` immediately, or buffered on
+    ``uow`` when one is given and written when its transaction commits.
+    """
     config = _load_series_config(config_dir)
     results: Dict[str, dict] = {}
     for entry in config.series:
-        result = _resolve_entry(entry, conn)
+        result = _resolve_entry(entry, conn, uow)
         results[entry.key] = result
     return results
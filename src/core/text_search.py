@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import html
+import re
+import unicodedata
+from collections import Counter
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from markupsafe import Markup
+
+# Scripts written without spaces are indexed as overlapping character bigrams.
+_CJK = "぀-ヿ㐀-䶿一-鿿豈-﫿ｦ-ﾟ"
+_WORD_RE = re.compile(r"[^\W_]+")
+_SEGMENT_RE = re.compile(f"[{_CJK}]+|[^{_CJK}]+")
+_CJK_RE = re.compile(f"[{_CJK}]")
+
+TITLE_WEIGHT = 2
+
+
+def normalize_text(text: str) -> str:
+    """NFKC + lowercase, the form every matcher compares in."""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def normalize_with_offsets(text: str) -> Tuple[str, List[int]]:
+    """
+    ``normalize_text`` applied per character, plus the index in ``text`` that each
+    normalized character came from, so match offsets map back onto the original.
+    """
+    if text.isascii():
+        # NFKC leaves ASCII alone and lowercasing keeps its length.
+        return text.lower(), list(range(len(text)))
+    pieces = [normalize_text(ch) for ch in text]
+    origin: List[int] = []
+    for index, piece in enumerate(pieces):
+        origin.extend([index] * len(piece))
+    return "".join(pieces), origin
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Search terms for ``text``: NFKC + lowercase words, with CJK runs split into bigrams
+    (a single CJK character stays a term on its own).
+    """
+    if not text:
+        return []
+    terms: List[str] = []
+    for word in _WORD_RE.findall(normalize_text(text)):
+        for segment in _SEGMENT_RE.findall(word):
+            if _CJK_RE.match(segment) and len(segment) > 1:
+                terms.extend(segment[i : i + 2] for i in range(len(segment) - 1))
+            else:
+                terms.append(segment)
+    return terms
+
+
+def document_terms(title: Optional[str], summary: Optional[str]) -> Counter:
+    """Term frequencies for an item; title terms count ``TITLE_WEIGHT`` times."""
+    counts: Counter = Counter()
+    for term in tokenize(title):
+        counts[term] += TITLE_WEIGHT
+    counts.update(tokenize(summary))
+    return counts
+
+
+def query_terms(query: Optional[str]) -> List[str]:
+    """Distinct terms of a search query, in order of appearance."""
+    return list(dict.fromkeys(tokenize(query)))
+
+
+def is_word_char(char: str) -> bool:
+    """True for letters/digits of space-delimited scripts (word-boundary checks skip CJK)."""
+    return char.isalnum() and not _CJK_RE.match(char)
+
+
+def _match_spans(text: str, terms: Iterable[str]) -> List[Tuple[int, int]]:
+    normalized, origin = normalize_with_offsets(text)
+    spans: List[Tuple[int, int]] = []
+    for term in terms:
+        whole_word = not _CJK_RE.match(term)
+        start = normalized.find(term)
+        while start != -1:
+            end = start + len(term)
+            bounded = not whole_word or (
+                (start == 0 or not is_word_char(normalized[start - 1]))
+                and (end == len(normalized) or not is_word_char(normalized[end]))
+            )
+            if bounded:
+                spans.append((origin[start], origin[end - 1] + 1))
+            start = normalized.find(term, start + 1)
+    spans.sort()
+    merged: List[Tuple[int, int]] = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def highlight(text: Optional[str], terms: Sequence[str], width: Optional[int] = None) -> Markup:
+    """
+    HTML-escaped ``text`` with query term matches wrapped in ``<mark>``.
+
+    With ``width``, only a window of about that many characters around the first match
+    is kept (ellipses mark the cut).
+    """
+    if not text:
+        return Markup("")
+    spans = _match_spans(text, terms)
+    start, end = 0, len(text)
+    if width and len(text) > width:
+        anchor = spans[0][0] if spans else 0
+        start = max(0, min(anchor - width // 3, len(text) - width))
+        end = start + width
+    parts = ["…" if start > 0 else ""]
+    cursor = start
+    for span_start, span_end in spans:
+        if span_end <= start or span_start >= end:
+            continue
+        span_start, span_end = max(span_start, start), min(span_end, end)
+        parts.append(html.escape(text[cursor:span_start]))
+        parts.append(f"<mark>{html.escape(text[span_start:span_end])}</mark>")
+        cursor = span_end
+    parts.append(html.escape(text[cursor:end]))
+    if end < len(text):
+        parts.append("…")
+    return Markup("".join(parts))
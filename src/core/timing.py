@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_ENV = "APP_PROFILE"
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+class StageTimer:
+    """
+    Collects timing spans for one run.
+
+    ``span`` records wall time and the CPU time of the thread that ran the stage
+    (``time.thread_time``), so spans from pool threads do not absorb each other's CPU;
+    work DuckDB does on its own threads is not included. Spans may be recorded from any
+    thread and are kept in completion order.
+    """
+
+    def __init__(self) -> None:
+        self._spans: List[dict] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str, source_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Time the block as ``stage``. Yields a dict for counters (``bytes``, ``items``)
+        that are stored with the span; the span is recorded even if the block raises.
+        """
+        counters: Dict[str, Any] = {}
+        started_at = datetime.now(timezone.utc)
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield counters
+        finally:
+            record = {
+                "stage": stage,
+                "source_id": source_id,
+                "started_at": started_at,
+                "wall_ms": round((time.perf_counter() - wall) * 1000, 3),
+                "cpu_ms": round((time.thread_time() - cpu) * 1000, 3),
+                "bytes": counters.get("bytes"),
+                "items": counters.get("items"),
+            }
+            with self._lock:
+                self._spans.append(record)
+
+    def spans(self) -> List[dict]:
+        with self._lock:
+            return list(self._spans)
+
+    def report(self) -> List[dict]:
+        """Spans in JSON-friendly form (ISO timestamps), for ``run_stats.json``."""
+        return [{**span, "started_at": span["started_at"].isoformat()} for span in self.spans()]
+
+
+class RunProfiler:
+    """
+    Optional whole-run profile, selected by ``APP_PROFILE=cprofile`` or
+    ``APP_PROFILE=pyinstrument`` (falls back to cProfile when pyinstrument is not
+    installed). Both sample the calling thread only; fetch pool threads show up in the
+    stage spans instead.
+    """
+
+    def __init__(self, kind: Optional[str] = None) -> None:
+        kind = (kind if kind is not None else os.getenv(PROFILE_ENV, "")).strip().lower()
+        if kind and kind not in PROFILERS:
+            logger.warning("Ignoring %s=%s (expected one of %s)", PROFILE_ENV, kind, PROFILERS)
+            kind = ""
+        self._profiler: Any = None
+        if kind == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                logger.warning("pyinstrument is not installed; profiling with cProfile")
+                kind = "cprofile"
+            else:
+                self._profiler = Profiler()
+        if kind == "cprofile":
+            self._profiler = cProfile.Profile()
+        self.kind = kind or None
+        self._running = False
+
+    @property
+    def enabled(self) -> bool:
+        return self._profiler is not None
+
+    def start(self) -> None:
+        if not self.enabled or self._running:
+            return
+        if self.kind == "cprofile":
+            self._profiler.enable()
+        else:
+            self._profiler.start()
+        self._running = True
+
+    def stop(self) -> None:
+        """Stop profiling; safe to call more than once."""
+        if not self._running:
+            return
+        if self.kind == "cprofile":
+            self._profiler.disable()
+        else:
+            self._profiler.stop()
+        self._running = False
+
+    def write(self, directory: Path) -> Optional[Path]:
+        """Save the profile into ``directory``: ``profile.pstats`` or ``profile.html``."""
+        if not self.enabled:
+            return None
+        directory.mkdir(parents=True, exist_ok=True)
+        if self.kind == "cprofile":
+            path = directory / "profile.pstats"
+            self._profiler.dump_stats(str(path))
+        else:
+            path = directory / "profile.html"
+            path.write_text(self._profiler.output_html(), encoding="utf-8")
+        return path
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+from src.core.aho_corasick import PhraseMatcher
+from src.core.config_schema import WatchEntity
+
+MATCH_FIELDS = ("title", "summary")
+
+
+class WatchlistMatcher:
+    """
+    Finds watch entities (by name or alias) in item text.
+
+    Every name and alias is compiled into a single Aho–Corasick automaton, so scanning an
+    item costs the same for 10 entities as for 10,000. Matching is case/width-insensitive
+    and respects word boundaries for Latin names (see ``PhraseMatcher``).
+    """
+
+    def __init__(self, entities: Sequence[WatchEntity]):
+        self.entity_count = len({entity.name for entity in entities})
+        self._matcher: PhraseMatcher[str] = PhraseMatcher(
+            (surface, entity.name)
+            for entity in entities
+            for surface in (entity.name, *entity.aliases)
+        )
+
+    def find(self, text: Optional[str]) -> List[tuple[int, int, str]]:
+        """``(start, end, entity)`` for each hit, as offsets into the original ``text``."""
+        return self._matcher.find(text)
+
+    def match_item(self, item: dict) -> List[dict]:
+        """
+        One row per entity found in the item's title or summary: the first field and
+        surface form it appeared as, and the total number of hits across both fields.
+        """
+        found: Dict[str, dict] = {}
+        for field in MATCH_FIELDS:
+            text = item.get(field)
+            for start, end, entity in self.find(text):
+                row = found.get(entity)
+                if row is None:
+                    found[entity] = {
+                        "source_id": item["source_id"],
+                        "url": item["url"],
+                        "entity": entity,
+                        "field": field,
+                        "matched_text": text[start:end],
+                        "position": start,
+                        "hit_count": 1,
+                    }
+                else:
+                    row["hit_count"] += 1
+        return list(found.values())
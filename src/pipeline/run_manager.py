@@ -1,16 +1,28 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Callable, Iterator, List, Optional, Tuple
 from uuid import uuid4
 
 from duckdb import DuckDBPyConnection
 
 from src.core.logging import get_logger
 from src.storage.db import connect
+from src.storage.health_rollup import rebuild_source_health_rollup, update_source_health_rollup
+from src.storage.near_dup import prune_item_signatures
+from src.storage.search import prune_search_index
 
 logger = get_logger(__name__)
 
+_run_finished_listeners: List[Callable[[str, str], None]] = []
+
+
+def add_run_finished_listener(listener: Callable[[str, str], None]) -> None:
+    """Call ``listener(run_id, status)`` whenever ``finish_run`` completes in this process."""
+    if listener not in _run_finished_listeners:
+        _run_finished_listeners.append(listener)
+
 
 def create_run(
     run_mode: str,
@@ -33,8 +45,25 @@ def create_run(
     return run_id, started_at
 
 
-def finish_run(run_id: str, status: str, conn: Optional[DuckDBPyConnection] = None) -> datetime:
-    connection = conn or connect()
+def _notify_run_finished(run_id: str, status: str) -> None:
+    for listener in list(_run_finished_listeners):
+        try:
+            listener(run_id, status)
+        except Exception as exc:  # pragma: no cover - best-effort
+            logger.warning("Run finished listener failed for %s: %s", run_id, exc)
+
+
+def finish_run(
+    run_id: str,
+    status: str,
+    conn: Optional[DuckDBPyConnection] = None,
+    uow: Optional["RunUnitOfWork"] = None,
+) -> datetime:
+    """
+    Mark the run ended. With ``uow`` the update joins the unit of work's transaction and
+    listeners are notified only once that transaction commits (not at all on rollback).
+    """
+    connection = uow.conn if uow is not None else conn or connect()
     ended_at = datetime.now(timezone.utc)
     try:
         connection.execute(
@@ -44,10 +73,15 @@ def finish_run(run_id: str, status: str, conn: Optional[DuckDBPyConnection] = No
             """,
             [ended_at, status, run_id],
         )
-        connection.commit()
+        if uow is None:
+            connection.commit()
     except Exception as exc:  # pragma: no cover - best-effort
         logger.warning("finish_run could not update fact_run for %s: %s", run_id, exc)
     logger.info("Finished run %s status=%s", run_id, status)
+    if uow is not None:
+        uow.after_commit(lambda: _notify_run_finished(run_id, status))
+    else:
+        _notify_run_finished(run_id, status)
     return ended_at
 
 
@@ -84,10 +118,138 @@ def record_source_run(
             http_status,
         ],
     )
+    update_source_health_rollup(connection, run_id)
     connection.commit()
     logger.info("Recorded source run %s for %s status=%s", run_id, source_id, status)
 
 
+_SOURCE_RUN_INSERT = """
+    INSERT INTO fact_source_run (
+        run_id, source_id, started_at, ended_at, status, item_count,
+        error_class, error_message, http_status
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SERIES_RESOLUTION_UPSERT = """
+    INSERT INTO dim_series_resolution (
+        series_key, resolver_type, resolver_value, resolved_id, status, message, updated_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(series_key) DO UPDATE SET
+        resolver_type = excluded.resolver_type,
+        resolver_value = excluded.resolver_value,
+        resolved_id = excluded.resolved_id,
+        status = excluded.status,
+        message = excluded.message,
+        updated_at = excluded.updated_at
+"""
+
+
+class RunUnitOfWork:
+    """
+    Run-scoped write buffer.
+
+    ``fact_source_run`` rows and series resolutions are collected in memory while the run
+    progresses and written with one ``executemany`` per table when the run's transaction
+    commits, so a run pays a single commit instead of one per source and series key.
+    The ``fact_run`` "running" row is not buffered: ``create_run`` commits it up front so
+    an interrupted run stays visible. Callbacks registered with ``after_commit`` run once
+    the transaction has committed and are dropped on rollback.
+    """
+
+    def __init__(self, run_id: str, conn: DuckDBPyConnection) -> None:
+        self.run_id = run_id
+        self.conn = conn
+        self._source_runs: List[Tuple] = []
+        self._series_resolutions: List[Tuple] = []
+        self._after_commit: List[Callable[[], None]] = []
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        self._after_commit.append(callback)
+
+    def record_source_run(
+        self,
+        source_id: str,
+        started_at: datetime,
+        ended_at: datetime,
+        status: str,
+        item_count: int,
+        error_class: Optional[str] = None,
+        error_message: Optional[str] = None,
+        http_status: Optional[int] = None,
+    ) -> None:
+        self._source_runs.append(
+            (
+                self.run_id,
+                source_id,
+                started_at,
+                ended_at,
+                status,
+                item_count,
+                error_class,
+                error_message,
+                http_status,
+            )
+        )
+
+    def record_series_resolution(
+        self,
+        series_key: str,
+        resolver_type: str,
+        resolver_value: Optional[str],
+        resolved_id: Optional[str],
+        status: str,
+        message: Optional[str],
+    ) -> None:
+        self._series_resolutions.append(
+            (
+                series_key,
+                resolver_type,
+                resolver_value,
+                resolved_id,
+                status,
+                message,
+                datetime.now(timezone.utc),
+            )
+        )
+
+    def flush(self) -> None:
+        """Write buffered rows on the current transaction (no commit)."""
+        if self._series_resolutions:
+            self.conn.executemany(_SERIES_RESOLUTION_UPSERT, self._series_resolutions)
+        if self._source_runs:
+            self.conn.executemany(_SOURCE_RUN_INSERT, self._source_runs)
+            update_source_health_rollup(self.conn, self.run_id)
+        logger.info(
+            "Flushed run %s: %d source runs, %d series resolutions",
+            self.run_id,
+            len(self._source_runs),
+            len(self._series_resolutions),
+        )
+        self._source_runs.clear()
+        self._series_resolutions.clear()
+
+    @contextmanager
+    def transaction(self) -> Iterator["RunUnitOfWork"]:
+        """
+        Open one transaction for the run's writes; buffered rows are flushed and
+        committed on exit, everything is rolled back on error.
+        """
+        self.conn.begin()
+        try:
+            yield self
+            self.flush()
+            self.conn.commit()
+        except BaseException:
+            self._after_commit.clear()
+            self.conn.rollback()
+            raise
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            callback()
+
+
 def run_exists(run_id: str, conn: Optional[DuckDBPyConnection] = None) -> bool:
     connection = conn or connect()
     try:
@@ -112,9 +274,15 @@ def delete_run(run_id: str, conn: Optional[DuckDBPyConnection] = None) -> None:
     for table in (
         "fact_indicator_series_run",
         "fact_source_run",
+        "fact_run_stage",
+        "fact_item_match",
+        "fact_item_score",
+        "item_geo",
+        "fact_observation",
         "items",
         "sources",
         "alerts",
+        "alert_outbox",
         "runs",
         "fact_run",
     ):
@@ -122,5 +290,9 @@ def delete_run(run_id: str, conn: Optional[DuckDBPyConnection] = None) -> None:
             connection.execute(f"DELETE FROM {table} WHERE run_id = ?", [run_id])
         except Exception:
             continue
+    # The rollup is folded forward run by run; removing a run invalidates it.
+    rebuild_source_health_rollup(connection)
+    prune_search_index(connection)
+    prune_item_signatures(connection)
     connection.commit()
     logger.info("Deleted existing run data for %s", run_id)
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+
+from duckdb import DuckDBPyConnection
+
+from src.core.config_schema import AlertChannel, AlertRule
+from src.storage.bulk import columnar_payload, columnar_select
+
+_ALERT_COLUMNS = (
+    ("run_id", "TEXT"),
+    ("alert_type", "TEXT"),
+    ("rule_name", "TEXT"),
+    ("severity", "TEXT"),
+    ("source_id", "TEXT"),
+    ("url", "TEXT"),
+    ("message", "TEXT"),
+    ("created_at", "TIMESTAMP"),
+)
+_OUTBOX_COLUMNS = (
+    ("run_id", "TEXT"),
+    ("channel", "TEXT"),
+    ("target", "TEXT"),
+    ("batch_size", "INTEGER"),
+    ("payload", "TEXT"),
+    ("created_at", "TIMESTAMP"),
+)
+
+# Items already alerted on by the same rule (in any run) are not alerted on again.
+_NOT_ALERTED = """
+    NOT EXISTS (
+        SELECT 1 FROM alerts AS a
+        WHERE a.rule_name = ? AND a.source_id = i.source_id AND a.url = i.url
+    )
+"""
+
+
+def utc_now() -> datetime:
+    """Naive UTC timestamp, the form alert tables store."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _watchlist_alerts(conn: DuckDBPyConnection, run_id: str, rule: AlertRule) -> List[tuple]:
+    entity_filter = ""
+    params: list = [run_id]
+    if rule.values:
+        entity_filter = f"AND m.entity IN ({', '.join('?' for _ in rule.values)})"
+        params.extend(rule.values)
+    params.append(rule.name)
+    rows = conn.execute(
+        f"""
+        SELECT i.source_id, i.url, i.title, list(m.entity ORDER BY m.entity)
+        FROM fact_item_match AS m
+        JOIN items AS i
+            ON i.run_id = m.run_id AND i.source_id = m.source_id AND i.url = m.url
+        WHERE m.run_id = ? {entity_filter} AND {_NOT_ALERTED}
+        GROUP BY i.source_id, i.url, i.title
+        ORDER BY i.source_id, i.url
+        """,
+        params,
+    ).fetchall()
+    return [(source_id, url, f"{', '.join(ents)}: {title}") for source_id, url, title, ents in rows]
+
+
+def _score_alerts(conn: DuckDBPyConnection, run_id: str, rule: AlertRule) -> List[tuple]:
+    rows = conn.execute(
+        f"""
+        SELECT i.source_id, i.url, i.title, s.score
+        FROM fact_item_score AS s
+        JOIN items AS i
+            ON i.run_id = s.run_id AND i.source_id = s.source_id AND i.url = s.url
+        WHERE s.run_id = ? AND s.score >= ? AND {_NOT_ALERTED}
+        ORDER BY s.score DESC, i.source_id, i.url
+        """,
+        [run_id, rule.threshold, rule.name],
+    ).fetchall()
+    return [
+        (source_id, url, f"score {score:.2f}: {title}") for source_id, url, title, score in rows
+    ]
+
+
+def _source_failure_alerts(conn: DuckDBPyConnection, run_id: str, rule: AlertRule) -> List[tuple]:
+    # Fire when the streak reaches the threshold, so one outage raises one alert.
+    rows = conn.execute(
+        """
+        SELECT source_id, consecutive_failures, last_error_message
+        FROM source_health_rollup
+        WHERE last_run_id = ? AND consecutive_failures = ?
+        ORDER BY source_id
+        """,
+        [run_id, int(rule.threshold)],
+    ).fetchall()
+    return [
+        (source_id, None, f"{source_id} failed {streak} runs in a row: {error or 'unknown error'}")
+        for source_id, streak, error in rows
+    ]
+
+
+_EVALUATORS = {
+    "watchlist": _watchlist_alerts,
+    "score": _score_alerts,
+    "source_failure": _source_failure_alerts,
+}
+
+
+def evaluate_alerts(
+    conn: DuckDBPyConnection, run_id: str, rules: Sequence[AlertRule]
+) -> List[dict]:
+    """
+    Alerts raised by ``rules`` for the run. Reads the run's watchlist matches, scores and
+    the source health rollup, so call it once those are written.
+    """
+    created_at = utc_now()
+    alerts: List[dict] = []
+    for rule in rules:
+        for source_id, url, message in _EVALUATORS[rule.type](conn, run_id, rule):
+            alerts.append(
+                {
+                    "run_id": run_id,
+                    "alert_type": rule.type,
+                    "rule_name": rule.name,
+                    "severity": rule.severity,
+                    "source_id": source_id,
+                    "url": url,
+                    "message": message,
+                    "created_at": created_at,
+                }
+            )
+    return alerts
+
+
+def record_alerts(
+    conn: DuckDBPyConnection,
+    run_id: str,
+    alerts: Sequence[dict],
+    channels: Sequence[AlertChannel],
+) -> int:
+    """
+    Store the run's alerts and queue one outbox delivery per alert and channel, in the
+    caller's transaction. No commit. Returns the number of deliveries queued.
+    """
+    if not alerts:
+        return 0
+    conn.execute(
+        f"""
+        INSERT INTO alerts (
+            run_id, alert_type, rule_name, severity, source_id, url, message, created_at
+        )
+        {columnar_select(_ALERT_COLUMNS)}
+        """,
+        [columnar_payload(alerts, _ALERT_COLUMNS)],
+    )
+    deliveries = [
+        {
+            "run_id": run_id,
+            "channel": channel.channel,
+            "target": channel.target,
+            "batch_size": channel.batch_size,
+            "payload": json.dumps(alert, default=str, ensure_ascii=False),
+            "created_at": alert["created_at"],
+        }
+        for channel in channels
+        for alert in alerts
+    ]
+    if deliveries:
+        conn.execute(
+            f"""
+            INSERT INTO alert_outbox (
+                run_id, channel, target, batch_size, payload, created_at,
+                status, attempts, next_attempt_at
+            )
+            SELECT *, 'pending', 0, created_at
+            FROM ({columnar_select(_OUTBOX_COLUMNS)})
+            """,
+            [columnar_payload(deliveries, _OUTBOX_COLUMNS)],
+        )
+    return len(deliveries)
+
+
+def due_deliveries(
+    conn: DuckDBPyConnection, now: Optional[datetime] = None, limit: int = 1000
+) -> List[dict]:
+    """Pending outbox rows whose next attempt is due, oldest first."""
+    rows = conn.execute(
+        """
+        SELECT outbox_id, channel, target, batch_size, payload, attempts
+        FROM alert_outbox
+        WHERE status = 'pending' AND next_attempt_at <= ?
+        ORDER BY outbox_id
+        LIMIT ?
+        """,
+        [now or utc_now(), limit],
+    ).fetchall()
+    return [
+        {
+            "outbox_id": r[0],
+            "channel": r[1],
+            "target": r[2],
+            "batch_size": r[3],
+            "alert": json.loads(r[4]),
+            "attempts": r[5],
+        }
+        for r in rows
+    ]
+
+
+def mark_delivered(
+    conn: DuckDBPyConnection, outbox_ids: Sequence[int], now: Optional[datetime] = None
+) -> None:
+    if not outbox_ids:
+        return
+    placeholders = ", ".join("?" for _ in outbox_ids)
+    conn.execute(
+        f"""
+        UPDATE alert_outbox
+        SET status = 'sent', attempts = attempts + 1, sent_at = ?, last_error = NULL
+        WHERE outbox_id IN ({placeholders})
+        """,
+        [now or utc_now(), *outbox_ids],
+    )
+
+
+def mark_failed(
+    conn: DuckDBPyConnection,
+    outbox_ids: Sequence[int],
+    error: str,
+    max_attempts: int,
+    backoff_seconds: float,
+    now: Optional[datetime] = None,
+) -> None:
+    """
+    Record a failed attempt: rows are retried after an exponential backoff
+    (``backoff_seconds * 2**(attempts - 1)``) and marked ``dead`` after ``max_attempts``.
+    """
+    if not outbox_ids:
+        return
+    now = now or utc_now()
+    placeholders = ", ".join("?" for _ in outbox_ids)
+    conn.execute(
+        f"""
+        UPDATE alert_outbox
+        SET
+            attempts = attempts + 1,
+            last_error = ?,
+            status = CASE WHEN attempts + 1 >= ? THEN 'dead' ELSE 'pending' END,
+            next_attempt_at = ? + to_microseconds(
+                CAST(? * pow(2, attempts) * 1000000 AS BIGINT)
+            )
+        WHERE outbox_id IN ({placeholders})
+        """,
+        [error[:1000], max_attempts, now, backoff_seconds, *outbox_ids],
+    )
+
+
+def outbox_counts(conn: DuckDBPyConnection) -> dict:
+    rows = conn.execute("SELECT status, COUNT(*) FROM alert_outbox GROUP BY status").fetchall()
+    return {status: count for status, count in rows}
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from typing import Any, Mapping, Sequence, Tuple
+
+Column = Tuple[str, str]
+
+# JSON types used to decode the payload; temporal values travel as ISO strings.
+_PAYLOAD_TYPES = {
+    "TEXT": "VARCHAR",
+    "TIMESTAMP": "VARCHAR",
+    "DATE": "VARCHAR",
+    "DOUBLE": "DOUBLE",
+    "BIGINT": "BIGINT",
+    "INTEGER": "INTEGER",
+    "BOOLEAN": "BOOLEAN",
+    "UINTEGER[]": "UINTEGER[]",
+}
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def columnar_payload(rows: Sequence[Mapping[str, Any]], columns: Sequence[Column]) -> str:
+    """Serialize ``rows`` as one JSON object holding a value list per column."""
+    return json.dumps(
+        {name: [_encode(row.get(name)) for row in rows] for name, _ in columns},
+        ensure_ascii=False,
+    )
+
+
+def columnar_select(columns: Sequence[Column]) -> str:
+    """
+    SELECT that expands a ``columnar_payload`` bound as its single ``?`` parameter.
+
+    The whole batch crosses the Python/DuckDB boundary as one string and is decoded by
+    DuckDB's JSON reader, instead of converting every value as a separate bound parameter.
+    Timestamps go through TIMESTAMPTZ so aware datetimes land exactly as they would when
+    bound directly.
+    """
+    schema = json.dumps({name: [_PAYLOAD_TYPES[sql_type]] for name, sql_type in columns})
+    expressions = []
+    for name, sql_type in columns:
+        expression = f"UNNEST(payload.{name})"
+        if sql_type == "TIMESTAMP":
+            expression = f"CAST(CAST({expression} AS TIMESTAMPTZ) AS TIMESTAMP)"
+        elif sql_type == "DATE":
+            expression = f"CAST({expression} AS DATE)"
+        expressions.append(f"{expression} AS {name}")
+    return f"SELECT {', '.join(expressions)} FROM (SELECT from_json(?, '{schema}') AS payload)"
@@ -1,10 +1,24 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 
 import duckdb
 
+from src.core.logging import get_logger
+
 DEFAULT_DB_PATH = Path("output/db/app.duckdb")
+DEFAULT_RUN_LOCK_PATH = Path("output/run.lock")
+DEFAULT_IDLE_RELEASE_SECONDS = 30.0
+DEFAULT_LOCK_WAIT_SECONDS = 5.0
+
+logger = get_logger(__name__)
+
+
+class DatabaseUnavailableError(Exception):
+    """Raised when the read-only database cannot be opened right now."""
 
 
 def get_db_path() -> Path:
@@ -19,4 +33,166 @@ def get_db_path() -> Path:
 def connect(db_path: Optional[Path] = None) -> duckdb.DuckDBPyConnection:
     path = Path(db_path) if db_path else get_db_path()
     path.parent.mkdir(parents=True, exist_ok=True)
-    return duckdb.connect(str(path))
+    # Readers release the file when the run lock appears; give them a moment to let go.
+    deadline = time.monotonic() + float(
+        os.getenv("APP_DB_LOCK_WAIT_SECONDS", DEFAULT_LOCK_WAIT_SECONDS)
+    )
+    while True:
+        try:
+            return duckdb.connect(str(path))
+        except duckdb.IOException as exc:
+            if "lock" not in str(exc).lower() or time.monotonic() >= deadline:
+                raise
+            time.sleep(0.1)
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class _Handle:
+    def __init__(self, conn: duckdb.DuckDBPyConnection, signature: Tuple[int, int, int]):
+        self.conn = conn
+        self.signature = signature
+        self.active = 0
+
+
+class ReadOnlyDatabase:
+    """
+    Application-lifetime read-only connection for the web tier.
+
+    Requests borrow a ``cursor()`` of one shared connection instead of opening the file each
+    time. The connection is reopened when the database file is replaced, and released while
+    the pipeline's run lock exists or after ``idle_release_seconds`` without requests so the
+    writer can take the file lock. Settings default to ``APP_DB_THREADS``,
+    ``APP_DB_MEMORY_LIMIT`` and ``APP_DB_IDLE_RELEASE_SECONDS``.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        threads: Optional[int] = None,
+        memory_limit: Optional[str] = None,
+        run_lock_path: Optional[Path] = None,
+        idle_release_seconds: Optional[float] = None,
+    ) -> None:
+        self.db_path = Path(db_path) if db_path else get_db_path()
+        env_threads = os.getenv("APP_DB_THREADS")
+        self.threads = threads or (int(env_threads) if env_threads else None)
+        self.memory_limit = memory_limit or os.getenv("APP_DB_MEMORY_LIMIT")
+        self.run_lock_path = Path(run_lock_path) if run_lock_path else DEFAULT_RUN_LOCK_PATH
+        if idle_release_seconds is None:
+            idle_release_seconds = float(
+                os.getenv("APP_DB_IDLE_RELEASE_SECONDS", DEFAULT_IDLE_RELEASE_SECONDS)
+            )
+        self.idle_release_seconds = idle_release_seconds
+        self._lock = threading.Lock()
+        self._current: Optional[_Handle] = None
+        self._retired: List[_Handle] = []
+        self._last_used = time.monotonic()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _config(self) -> dict:
+        config = {}
+        if self.threads:
+            config["threads"] = self.threads
+        if self.memory_limit:
+            config["memory_limit"] = self.memory_limit
+        return config
+
+    def _retire_current(self) -> None:
+        handle, self._current = self._current, None
+        if handle is None:
+            return
+        if handle.active:
+            self._retired.append(handle)
+        else:
+            handle.conn.close()
+
+    def _acquire(self) -> _Handle:
+        with self._lock:
+            if self.run_lock_path.exists():
+                self._retire_current()
+                raise DatabaseUnavailableError("A pipeline run holds the database")
+            signature = _file_signature(self.db_path)
+            if signature is None:
+                self._retire_current()
+                raise DatabaseUnavailableError(f"Database not found at {self.db_path}")
+            if self._current is not None and self._current.signature != signature:
+                logger.info("Database file changed; reopening %s", self.db_path)
+                self._retire_current()
+            if self._current is None:
+                try:
+                    conn = duckdb.connect(str(self.db_path), read_only=True, config=self._config())
+                except duckdb.Error as exc:
+                    raise DatabaseUnavailableError(str(exc)) from exc
+                self._current = _Handle(conn, signature)
+            self._current.active += 1
+            return self._current
+
+    def _release(self, handle: _Handle) -> None:
+        with self._lock:
+            handle.active -= 1
+            self._last_used = time.monotonic()
+            if handle.active == 0 and handle in self._retired:
+                self._retired.remove(handle)
+                handle.conn.close()
+
+    @contextmanager
+    def cursor(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """Borrow a cursor of the shared connection for the duration of a request."""
+        handle = self._acquire()
+        try:
+            cursor = handle.conn.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+        finally:
+            self._release(handle)
+
+    def reopen(self) -> None:
+        """Drop the current connection; the next ``cursor()`` opens the file again."""
+        with self._lock:
+            self._retire_current()
+
+    def release_if_idle(self) -> bool:
+        """Close the connection if the run lock exists or it has been idle long enough."""
+        with self._lock:
+            handle = self._current
+            if handle is None or handle.active:
+                return False
+            idle = time.monotonic() - self._last_used
+            if not self.run_lock_path.exists() and idle < self.idle_release_seconds:
+                return False
+            self._retire_current()
+            return True
+
+    def start_watcher(self, interval: float = 1.0) -> None:
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def watch() -> None:
+            while not self._stop.wait(interval):
+                if self.release_if_idle():
+                    logger.info("Released read-only database %s", self.db_path)
+
+        self._watcher = threading.Thread(target=watch, name="db-release-watcher", daemon=True)
+        self._watcher.start()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+        with self._lock:
+            self._retire_current()
+            for handle in self._retired:
+                handle.conn.close()
+            self._retired.clear()
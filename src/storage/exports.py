@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+from duckdb import DuckDBPyConnection
+
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+EXPORT_BASENAME = "brief_items"
+DEFAULT_EXPORT_FORMATS = ("csv", "parquet")
+
+# COPY options per format; file extension is the format name except for JSON Lines.
+_COPY_OPTIONS = {
+    "csv": ("csv", "FORMAT CSV, HEADER TRUE"),
+    "parquet": ("parquet", "FORMAT PARQUET, COMPRESSION ZSTD"),
+    "jsonl": ("jsonl", "FORMAT JSON"),
+}
+
+_ITEM_COLUMNS = ("source_id", "source_name", "category", "kind", "title", "summary", "url")
+
+
+def export_formats() -> List[str]:
+    """Formats from ``APP_EXPORT_FORMATS`` (comma separated), defaulting to CSV + Parquet."""
+    raw = os.getenv("APP_EXPORT_FORMATS")
+    if not raw:
+        return list(DEFAULT_EXPORT_FORMATS)
+    formats: List[str] = []
+    for name in (part.strip().lower() for part in raw.split(",")):
+        if not name or name in formats:
+            continue
+        if name not in _COPY_OPTIONS:
+            logger.warning("Ignoring unknown export format %s", name)
+            continue
+        formats.append(name)
+    return formats
+
+
+# ``published_at`` as ``datetime.isoformat()`` of the aware UTC value: stored timestamps
+# are wall time in the session time zone (see ``columnar_select``), so they go back
+# through TIMESTAMPTZ to UTC, and fractional seconds appear only when non-zero.
+_PUBLISHED_UTC = "(CAST(published_at AS TIMESTAMPTZ) AT TIME ZONE 'UTC')"
+_PUBLISHED_ISO = f"""
+    CASE
+        WHEN microsecond({_PUBLISHED_UTC}) % 1000000 = 0
+            THEN strftime({_PUBLISHED_UTC}, '%Y-%m-%dT%H:%M:%S+00:00')
+        ELSE strftime({_PUBLISHED_UTC}, '%Y-%m-%dT%H:%M:%S.%f+00:00')
+    END
+"""
+
+
+def _items_query(fmt: str) -> str:
+    # Parquet keeps the typed timestamp; text formats get ISO-8601 strings.
+    published = "published_at" if fmt == "parquet" else f"{_PUBLISHED_ISO} AS published_at"
+    return f"""
+        SELECT {", ".join(_ITEM_COLUMNS)}, {published}
+        FROM items
+        WHERE run_id = ?
+        ORDER BY source_id, published_at DESC NULLS LAST, url
+    """
+
+
+def export_run_items(
+    conn: DuckDBPyConnection,
+    run_id: str,
+    output_dir: Path,
+    formats: Iterable[str] = DEFAULT_EXPORT_FORMATS,
+) -> Dict[str, Path]:
+    """Write the run's items with DuckDB ``COPY``, one file per format."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written: Dict[str, Path] = {}
+    for fmt in formats:
+        extension, options = _COPY_OPTIONS[fmt]
+        path = output_dir / f"{EXPORT_BASENAME}.{extension}"
+        # COPY does not accept a parameter for its target, so the path is quoted inline.
+        target = str(path).replace("'", "''")
+        conn.execute(f"COPY ({_items_query(fmt)}) TO '{target}' ({options})", [run_id])
+        written[fmt] = path
+    logger.info("Exported run %s items as %s", run_id, ", ".join(written) or "nothing")
+    return written
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from duckdb import DuckDBPyConnection
+
+# Source runs kept per source for the windowed counts and the rolling duration average.
+HEALTH_WINDOW_RUNS = 20
+
+_HEALTHY = "status IN ('success', 'not_modified')"
+
+_ROLLUP_COLUMNS = """
+    source_id, recent_statuses, recent_durations, consecutive_failures,
+    last_run_id, last_status, last_started_at, last_ended_at, last_item_count,
+    last_http_status, last_error_class, last_error_message,
+    last_success_at, last_failure_at, updated_at
+"""
+
+
+def _refresh_window_metrics(conn: DuckDBPyConnection, run_id: Optional[str]) -> None:
+    """Derive the windowed counts and duration average from the stored recent lists."""
+    where = ""
+    params: list = []
+    if run_id is not None:
+        where = "WHERE source_id IN (SELECT source_id FROM fact_source_run WHERE run_id = ?)"
+        params = [run_id]
+    conn.execute(
+        f"""
+        UPDATE source_health_rollup SET
+            runs = len(recent_statuses),
+            success_count = (
+                SELECT COUNT(*) FROM unnest(recent_statuses) AS t(status) WHERE status = 'success'
+            ),
+            not_modified_count = (
+                SELECT COUNT(*) FROM unnest(recent_statuses) AS t(status)
+                WHERE status = 'not_modified'
+            ),
+            fail_count = (
+                SELECT COUNT(*) FROM unnest(recent_statuses) AS t(status) WHERE NOT {_HEALTHY}
+            ),
+            avg_duration_seconds = list_avg(recent_durations)
+        {where}
+        """,
+        params,
+    )
+
+
+def update_source_health_rollup(
+    conn: DuckDBPyConnection, run_id: str, window: int = HEALTH_WINDOW_RUNS
+) -> None:
+    """
+    Fold the run's ``fact_source_run`` rows into ``source_health_rollup``.
+
+    Each source row is applied at most once (sources whose rollup already points at
+    ``run_id`` are skipped). Runs must be applied in start order; use
+    ``rebuild_source_health_rollup`` after deleting or back-filling runs. No commit.
+    """
+    conn.execute(
+        f"""
+        INSERT INTO source_health_rollup ({_ROLLUP_COLUMNS})
+        SELECT
+            source_id,
+            [status],
+            [CAST(DATEDIFF('second', started_at, ended_at) AS DOUBLE)],
+            CASE WHEN {_HEALTHY} THEN 0 ELSE 1 END,
+            run_id,
+            status,
+            started_at,
+            ended_at,
+            item_count,
+            http_status,
+            error_class,
+            error_message,
+            CASE WHEN {_HEALTHY} THEN ended_at END,
+            CASE WHEN NOT {_HEALTHY} THEN ended_at END,
+            ?
+        FROM fact_source_run
+        WHERE run_id = ?
+          AND source_id NOT IN (
+            SELECT source_id FROM source_health_rollup WHERE last_run_id = ?
+          )
+        ON CONFLICT (source_id) DO UPDATE SET
+            recent_statuses = list_slice(
+                list_concat(excluded.recent_statuses, source_health_rollup.recent_statuses),
+                1,
+                {int(window)}
+            ),
+            recent_durations = list_slice(
+                list_concat(excluded.recent_durations, source_health_rollup.recent_durations),
+                1,
+                {int(window)}
+            ),
+            consecutive_failures = CASE
+                WHEN excluded.consecutive_failures = 0 THEN 0
+                ELSE source_health_rollup.consecutive_failures + 1
+            END,
+            last_run_id = excluded.last_run_id,
+            last_status = excluded.last_status,
+            last_started_at = excluded.last_started_at,
+            last_ended_at = excluded.last_ended_at,
+            last_item_count = excluded.last_item_count,
+            last_http_status = excluded.last_http_status,
+            last_error_class = excluded.last_error_class,
+            last_error_message = excluded.last_error_message,
+            last_success_at = COALESCE(
+                excluded.last_success_at, source_health_rollup.last_success_at
+            ),
+            last_failure_at = COALESCE(
+                excluded.last_failure_at, source_health_rollup.last_failure_at
+            ),
+            updated_at = excluded.updated_at
+        """,
+        [datetime.now(timezone.utc), run_id, run_id],
+    )
+    _refresh_window_metrics(conn, run_id)
+
+
+def rebuild_source_health_rollup(
+    conn: DuckDBPyConnection, window: int = HEALTH_WINDOW_RUNS
+) -> None:
+    """Recompute ``source_health_rollup`` from the full ``fact_source_run`` history. No commit."""
+    conn.execute("DELETE FROM source_health_rollup")
+    conn.execute(
+        f"""
+        INSERT INTO source_health_rollup ({_ROLLUP_COLUMNS})
+        WITH ordered AS (
+            SELECT
+                *,
+                ROW_NUMBER() OVER (
+                    PARTITION BY source_id
+                    ORDER BY started_at DESC
+                ) AS rn,
+                SUM(CASE WHEN {_HEALTHY} THEN 1 ELSE 0 END) OVER (
+                    PARTITION BY source_id
+                    ORDER BY started_at DESC
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+                ) AS healthy_seen,
+                CAST(DATEDIFF('second', started_at, ended_at) AS DOUBLE) AS duration_seconds
+            FROM fact_source_run
+        )
+        SELECT
+            source_id,
+            list(status ORDER BY started_at DESC) FILTER (WHERE rn <= ?),
+            list(duration_seconds ORDER BY started_at DESC) FILTER (WHERE rn <= ?),
+            SUM(CASE WHEN NOT {_HEALTHY} AND healthy_seen = 0 THEN 1 ELSE 0 END),
+            any_value(run_id) FILTER (WHERE rn = 1),
+            any_value(status) FILTER (WHERE rn = 1),
+            any_value(started_at) FILTER (WHERE rn = 1),
+            any_value(ended_at) FILTER (WHERE rn = 1),
+            any_value(item_count) FILTER (WHERE rn = 1),
+            any_value(http_status) FILTER (WHERE rn = 1),
+            any_value(error_class) FILTER (WHERE rn = 1),
+            any_value(error_message) FILTER (WHERE rn = 1),
+            MAX(CASE WHEN {_HEALTHY} THEN ended_at END),
+            MAX(CASE WHEN NOT {_HEALTHY} THEN ended_at END),
+            ?
+        FROM ordered
+        GROUP BY source_id
+        """,
+        [window, window, datetime.now(timezone.utc)],
+    )
+    _refresh_window_metrics(conn, None)
+
+
+def ensure_source_health_rollup(conn: DuckDBPyConnection) -> None:
+    """Populate an empty rollup from existing history (databases created before it existed)."""
+    populated = conn.execute("SELECT 1 FROM source_health_rollup LIMIT 1").fetchone()
+    if populated:
+        return
+    has_history = conn.execute("SELECT 1 FROM fact_source_run LIMIT 1").fetchone()
+    if has_history:
+        rebuild_source_health_rollup(conn)
+        conn.commit()
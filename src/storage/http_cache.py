@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Iterable
+
+from duckdb import DuckDBPyConnection
+
+
+def load_http_validators(conn: DuckDBPyConnection, urls: Iterable[str]) -> dict[str, dict]:
+    url_list = sorted({url for url in urls if url})
+    if not url_list:
+        return {}
+    placeholders = ",".join("?" for _ in url_list)
+    rows = conn.execute(
+        f"""
+        SELECT url, etag, last_modified
+        FROM http_validator_cache
+        WHERE url IN ({placeholders})
+        """,
+        url_list,
+    ).fetchall()
+    return {row[0]: {"url": row[0], "etag": row[1], "last_modified": row[2]} for row in rows}
+
+
+def upsert_http_validators(
+    conn: DuckDBPyConnection, rows: Iterable[dict], commit: bool = True
+) -> None:
+    now = datetime.now(timezone.utc)
+    payload = [(row["url"], row.get("etag"), row.get("last_modified"), now) for row in rows]
+    if not payload:
+        return
+    conn.executemany(
+        """
+        INSERT INTO http_validator_cache (url, etag, last_modified, updated_at)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(url) DO UPDATE SET
+            etag = excluded.etag,
+            last_modified = excluded.last_modified,
+            updated_at = excluded.updated_at
+        """,
+        payload,
+    )
+    if commit:
+        conn.commit()
@@ -5,7 +5,9 @@ from typing import Iterable
 from duckdb import DuckDBPyConnection
 
 
-def upsert_dim_indicator_series(conn: DuckDBPyConnection, rows: Iterable[dict]) -> None:
+def upsert_dim_indicator_series(
+    conn: DuckDBPyConnection, rows: Iterable[dict], commit: bool = True
+) -> None:
     payload = [
         (
             row["series_key"],
@@ -32,11 +34,12 @@ def upsert_dim_indicator_series(conn: DuckDBPyConnection, rows: Iterable[dict])
         """,
         payload,
     )
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
 def upsert_fact_indicator_series_run(
-    conn: DuckDBPyConnection, run_id: str, rows: Iterable[dict]
+    conn: DuckDBPyConnection, run_id: str, rows: Iterable[dict], commit: bool = True
 ) -> None:
     payload = [
         (
@@ -63,7 +66,8 @@ def upsert_fact_indicator_series_run(
         """,
         payload,
     )
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
 def delete_indicator_series_for_run(conn: DuckDBPyConnection, run_id: str) -> None:
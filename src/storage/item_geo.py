@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from duckdb import DuckDBPyConnection
+
+from src.core.geo import GeoTagger
+from src.storage.bulk import columnar_payload, columnar_select
+
+_GEO_COLUMNS = (
+    ("run_id", "TEXT"),
+    ("source_id", "TEXT"),
+    ("url", "TEXT"),
+    ("geo_key", "TEXT"),
+    ("geo_level", "TEXT"),
+    ("matched_text", "TEXT"),
+    ("hit_count", "INTEGER"),
+)
+
+
+def tag_run_items(conn: DuckDBPyConnection, run_id: str, tagger: GeoTagger) -> dict:
+    """
+    Geo-tag every item of ``run_id`` (new and carried forward) and replace the run's rows
+    in ``item_geo``. No commit.
+    """
+    conn.execute("DELETE FROM item_geo WHERE run_id = ?", [run_id])
+    items = conn.execute(
+        "SELECT source_id, url, title, summary FROM items WHERE run_id = ?", [run_id]
+    ).fetchall()
+    rows = []
+    for source_id, url, title, summary in items:
+        item = {"source_id": source_id, "url": url, "title": title, "summary": summary}
+        rows.extend({"run_id": run_id, **row} for row in tagger.tag_item(item))
+    if rows:
+        conn.execute(
+            f"""
+            INSERT INTO item_geo (
+                run_id, source_id, url, geo_key, geo_level, matched_text, hit_count
+            )
+            {columnar_select(_GEO_COLUMNS)}
+            """,
+            [columnar_payload(rows, _GEO_COLUMNS)],
+        )
+    return {
+        "items_scanned": len(items),
+        "items_tagged": len({(row["source_id"], row["url"]) for row in rows}),
+        "tags": len(rows),
+    }
+
+
+def get_geo_counts(conn: DuckDBPyConnection, run_id: str) -> list[dict]:
+    """Items per geo key for a run (for region filters), most mentioned first."""
+    rows = conn.execute(
+        """
+        SELECT geo_key, geo_level, COUNT(*) AS items
+        FROM item_geo
+        WHERE run_id = ?
+        GROUP BY geo_key, geo_level
+        ORDER BY items DESC, geo_key
+        """,
+        [run_id],
+    ).fetchall()
+    return [{"geo_key": r[0], "geo_level": r[1], "items": r[2]} for r in rows]
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from duckdb import DuckDBPyConnection
+
+from src.core.watchlist import WatchlistMatcher
+from src.storage.bulk import columnar_payload, columnar_select
+
+_MATCH_COLUMNS = (
+    ("run_id", "TEXT"),
+    ("source_id", "TEXT"),
+    ("url", "TEXT"),
+    ("entity", "TEXT"),
+    ("field", "TEXT"),
+    ("matched_text", "TEXT"),
+    ("position", "INTEGER"),
+    ("hit_count", "INTEGER"),
+)
+
+
+def match_run_items(conn: DuckDBPyConnection, run_id: str, matcher: WatchlistMatcher) -> dict:
+    """
+    Scan every item of ``run_id`` (new and carried forward) against the watchlist and
+    replace the run's rows in ``fact_item_match``. No commit.
+    """
+    conn.execute("DELETE FROM fact_item_match WHERE run_id = ?", [run_id])
+    items = conn.execute(
+        "SELECT source_id, url, title, summary FROM items WHERE run_id = ?", [run_id]
+    ).fetchall()
+    rows = []
+    for source_id, url, title, summary in items:
+        item = {"source_id": source_id, "url": url, "title": title, "summary": summary}
+        rows.extend({"run_id": run_id, **row} for row in matcher.match_item(item))
+    if rows:
+        conn.execute(
+            f"""
+            INSERT INTO fact_item_match (
+                run_id, source_id, url, entity, field, matched_text, position, hit_count
+            )
+            {columnar_select(_MATCH_COLUMNS)}
+            """,
+            [columnar_payload(rows, _MATCH_COLUMNS)],
+        )
+    return {
+        "entities": matcher.entity_count,
+        "items_scanned": len(items),
+        "items_matched": len({(row["source_id"], row["url"]) for row in rows}),
+        "matches": len(rows),
+    }
+
+
+def get_item_matches(conn: DuckDBPyConnection, run_id: str) -> list[dict]:
+    """Watchlist hits for a run, most-hit entities first."""
+    rows = conn.execute(
+        """
+        SELECT m.entity, m.source_id, i.source_name, i.title, m.url, m.field,
+            m.matched_text, m.hit_count
+        FROM fact_item_match AS m
+        LEFT JOIN items AS i
+            ON i.source_id = m.source_id AND i.url = m.url
+        WHERE m.run_id = ?
+        ORDER BY m.entity, m.hit_count DESC, m.url
+        """,
+        [run_id],
+    ).fetchall()
+    return [
+        {
+            "entity": r[0],
+            "source_id": r[1],
+            "source_name": r[2],
+            "title": r[3],
+            "url": r[4],
+            "field": r[5],
+            "matched_text": r[6],
+            "hit_count": r[7],
+        }
+        for r in rows
+    ]
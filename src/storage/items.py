@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Mapping, Optional, Sequence, Set
+
+from duckdb import DuckDBPyConnection
+
+from src.storage.bulk import columnar_payload, columnar_select
+from src.storage.search import index_items
+
+ITEM_COLUMNS = (
+    ("source_id", "TEXT"),
+    ("source_name", "TEXT"),
+    ("category", "TEXT"),
+    ("kind", "TEXT"),
+    ("title", "TEXT"),
+    ("summary", "TEXT"),
+    ("url", "TEXT"),
+    ("published_at", "TIMESTAMP"),
+    ("fetched_at", "TIMESTAMP"),
+)
+STAGE_COLUMNS = (*ITEM_COLUMNS, ("content_hash", "TEXT"))
+
+# Columns covered by ``content_hash``; ``fetched_at`` changes on every fetch and is left out.
+CONTENT_FIELDS = ("source_name", "category", "kind", "title", "summary", "published_at")
+
+
+def _content_value(value: object) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.isoformat()
+    return str(value)
+
+
+def content_hash(item: Mapping[str, object]) -> str:
+    """SHA-256 of an item's ``CONTENT_FIELDS``, compared to skip rewriting unchanged rows."""
+    payload = "\x1f".join(_content_value(item.get(field)) for field in CONTENT_FIELDS)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _stage_items(conn: DuckDBPyConnection, items: Sequence[dict]) -> None:
+    """Load ``items`` into the connection-local ``_items_stage`` temp table in one statement."""
+    column_defs = ", ".join(f"{name} {sql_type}" for name, sql_type in STAGE_COLUMNS)
+    conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS _items_stage ({column_defs})")
+    conn.execute("DELETE FROM _items_stage")
+    rows = [{**item, "content_hash": content_hash(item)} for item in items]
+    conn.execute(
+        f"INSERT INTO _items_stage {columnar_select(STAGE_COLUMNS)}",
+        [columnar_payload(rows, STAGE_COLUMNS)],
+    )
+
+
+def upsert_items(conn: DuckDBPyConnection, run_id: str, items: Sequence[dict]) -> dict:
+    """
+    Upsert the run's items into ``items`` (latest row per source_id + url) as one batch.
+
+    Rows are compared by ``content_hash``: new and changed items are written in full and
+    re-indexed for search, while unchanged ones only have their ``run_id`` moved to this
+    run (their ``fetched_at`` stays at the fetch that last changed them). ``items`` must
+    already be unique on (source_id, url). Returns inserted/updated/unchanged counts.
+    """
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+    if not items:
+        return stats
+    _stage_items(conn, items)
+    changed = conn.execute(
+        """
+        SELECT s.source_id, s.url, i.url IS NULL AS is_new
+        FROM _items_stage AS s
+        LEFT JOIN items AS i
+            ON i.source_id = s.source_id AND i.url = s.url
+        WHERE i.content_hash IS DISTINCT FROM s.content_hash
+        """
+    ).fetchall()
+    stats["inserted"] = sum(1 for row in changed if row[2])
+    stats["updated"] = len(changed) - stats["inserted"]
+    stats["unchanged"] = len(items) - len(changed)
+    if stats["unchanged"]:
+        conn.execute(
+            """
+            UPDATE items SET run_id = ?
+            FROM _items_stage AS s
+            WHERE items.source_id = s.source_id
+                AND items.url = s.url
+                AND items.content_hash = s.content_hash
+                AND items.run_id != ?
+            """,
+            [run_id, run_id],
+        )
+    if changed:
+        conn.execute(
+            """
+            INSERT INTO items (
+                run_id, source_id, source_name, category, kind,
+                title, summary, url, published_at, fetched_at, content_hash
+            )
+            SELECT
+                ?, source_id, source_name, category, kind,
+                title, summary, url, published_at, fetched_at, content_hash
+            FROM _items_stage
+            ON CONFLICT (source_id, url) DO UPDATE SET
+                run_id = EXCLUDED.run_id,
+                source_name = EXCLUDED.source_name,
+                category = EXCLUDED.category,
+                kind = EXCLUDED.kind,
+                title = EXCLUDED.title,
+                summary = EXCLUDED.summary,
+                published_at = EXCLUDED.published_at,
+                fetched_at = EXCLUDED.fetched_at,
+                content_hash = EXCLUDED.content_hash
+            WHERE items.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+            """,
+            [run_id],
+        )
+        keys = {(source_id, url) for source_id, url, _ in changed}
+        index_items(conn, [item for item in items if (item["source_id"], item["url"]) in keys])
+    conn.execute("DELETE FROM _items_stage")
+    return stats
+
+
+def source_ids_with_items(conn: DuckDBPyConnection, source_ids: Iterable[str]) -> Set[str]:
+    ids = list(source_ids)
+    if not ids:
+        return set()
+    placeholders = ",".join("?" for _ in ids)
+    rows = conn.execute(
+        f"SELECT DISTINCT source_id FROM items WHERE source_id IN ({placeholders})", ids
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def load_known_urls(conn: DuckDBPyConnection, source_ids: Iterable[str]) -> Dict[str, Set[str]]:
+    ids = list(source_ids)
+    known: Dict[str, Set[str]] = {source_id: set() for source_id in ids}
+    if not ids:
+        return known
+    placeholders = ",".join("?" for _ in ids)
+    rows = conn.execute(
+        f"SELECT source_id, url FROM items WHERE source_id IN ({placeholders})", ids
+    ).fetchall()
+    for source_id, url in rows:
+        known[source_id].add(url)
+    return known
+
+
+def carry_forward_items(
+    conn: DuckDBPyConnection,
+    run_id: str,
+    source_id: str,
+    urls: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Re-stamp the source's previous snapshot with ``run_id``.
+
+    Used when a source's items were not re-ingested. After an HTTP 304 the rows written
+    by the source's last successful (or carried-forward) run become part of this run.
+    After an incremental early stop only ``urls`` (the known items the feed still
+    listed) are carried, so entries that dropped out of the feed are left behind.
+    """
+    if urls is not None:
+        if not urls:
+            return 0
+        row = conn.execute(
+            """
+            UPDATE items SET run_id = ?
+            WHERE source_id = ? AND run_id != ? AND url IN (SELECT UNNEST(?))
+            """,
+            [run_id, source_id, run_id, list(urls)],
+        ).fetchone()
+        return int(row[0]) if row else 0
+    row = conn.execute(
+        """
+        UPDATE items SET run_id = ?
+        WHERE source_id = ?
+          AND run_id = (
+            SELECT run_id
+            FROM fact_source_run
+            WHERE source_id = ?
+              AND run_id != ?
+              AND status IN ('success', 'not_modified')
+            ORDER BY started_at DESC
+            LIMIT 1
+          )
+        """,
+        [run_id, source_id, source_id, run_id],
+    ).fetchone()
+    return int(row[0]) if row else 0
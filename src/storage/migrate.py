@@ -2,6 +2,8 @@ from pathlib import Path
 from typing import Optional
 
 from .db import connect, get_db_path
+from .health_rollup import ensure_source_health_rollup
+from .search import ensure_search_index
 
 SCHEMA_FILE = Path(__file__).with_name("schema.sql")
 
@@ -50,8 +52,41 @@ def _dedupe_items_by_source_url(conn) -> None:
     conn.commit()
 
 
+def _items_primary_key(conn) -> list:
+    row = conn.execute(
+        """
+        SELECT constraint_column_names
+        FROM duckdb_constraints()
+        WHERE table_name = 'items' AND constraint_type = 'PRIMARY KEY'
+        """
+    ).fetchone()
+    return list(row[0]) if row else []
+
+
+def _rekey_items(conn, schema_sql: str) -> None:
+    """
+    Rebuild ``items`` keyed on (source_id, url) if it still has the old
+    (run_id, source_id, url) primary key. Moving unchanged items to a new run only
+    rewrites ``run_id``, and DuckDB turns an update of an indexed column into a delete
+    plus insert of the whole row.
+    """
+    if not _table_exists(conn, "items") or "run_id" not in _items_primary_key(conn):
+        return
+    conn.begin()
+    try:
+        conn.execute("DROP INDEX IF EXISTS idx_items_source_url")
+        conn.execute("ALTER TABLE items RENAME TO _items_rekey")
+        conn.execute(schema_sql)
+        conn.execute("INSERT INTO items BY NAME SELECT * FROM _items_rekey")
+        conn.execute("DROP TABLE _items_rekey")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
 def _ensure_unique_items_index(conn) -> None:
-    if not _table_exists(conn, "items"):
+    if not _table_exists(conn, "items") or _items_primary_key(conn) == ["source_id", "url"]:
         return
     try:
         _dedupe_items_by_source_url(conn)
@@ -82,7 +117,10 @@ def apply_schema(conn, schema_path: Path) -> None:
     conn.execute(sql)
     conn.commit()
     _dedupe_items_by_source_url(conn)
+    _rekey_items(conn, sql)
     _ensure_unique_items_index(conn)
+    ensure_source_health_rollup(conn)
+    ensure_search_index(conn)
 
 
 def init_db(db_path: Optional[Path] = None, schema_path: Optional[Path] = None) -> Path:
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from duckdb import DuckDBPyConnection
+
+from src.core.minhash import band_keys, item_features, minhash, similarity
+from src.storage.bulk import columnar_payload, columnar_select
+
+# Estimated Jaccard similarity of the term sets at which two items are the same story.
+DEFAULT_THRESHOLD = 0.5
+
+# Keys per lookup query; keeps each IN list within DuckDB's index scan limits.
+_LOOKUP_CHUNK = 1000
+
+_SIGNATURE_COLUMNS = (
+    ("item_id", "BIGINT"),
+    ("source_id", "TEXT"),
+    ("url", "TEXT"),
+    ("cluster_id", "BIGINT"),
+    ("minhash", "UINTEGER[]"),
+    ("run_id", "TEXT"),
+    ("content_hash", "TEXT"),
+)
+_BUCKET_COLUMNS = (("bucket", "BIGINT"), ("item_id", "BIGINT"))
+
+
+def _lookup(conn: DuckDBPyConnection, sql: str, keys: Iterable[int]) -> List[tuple]:
+    # Integer literals rather than bound parameters: DuckDB only turns a constant IN list
+    # into an index scan, and binding every value separately is slow.
+    keys = sorted(keys)
+    rows: List[tuple] = []
+    for start in range(0, len(keys), _LOOKUP_CHUNK):
+        chunk = ", ".join(str(int(key)) for key in keys[start : start + _LOOKUP_CHUNK])
+        rows.extend(conn.execute(sql.format(keys=chunk)).fetchall())
+    return rows
+
+
+def _drop_buckets(conn: DuckDBPyConnection, item_ids: Sequence[int]) -> None:
+    for start in range(0, len(item_ids), _LOOKUP_CHUNK):
+        chunk = ", ".join(str(int(key)) for key in item_ids[start : start + _LOOKUP_CHUNK])
+        conn.execute(f"DELETE FROM item_lsh_bucket WHERE item_id IN ({chunk})")
+
+
+def _load_candidates(
+    conn: DuckDBPyConnection, buckets: Iterable[int]
+) -> Tuple[Dict[int, List[int]], Dict[int, Tuple[int, Sequence[int]]]]:
+    """Stored items in ``buckets``: bucket -> item ids, and item id -> (cluster, minhash)."""
+    members: Dict[int, List[int]] = {}
+    for bucket, item_id in _lookup(
+        conn, "SELECT bucket, item_id FROM item_lsh_bucket WHERE bucket IN ({keys})", buckets
+    ):
+        members.setdefault(bucket, []).append(item_id)
+    item_ids = {item_id for ids in members.values() for item_id in ids}
+    signatures = {
+        item_id: (cluster_id, signature)
+        for item_id, cluster_id, signature in _lookup(
+            conn,
+            "SELECT item_id, cluster_id, minhash FROM item_signature WHERE item_id IN ({keys})",
+            item_ids,
+        )
+    }
+    return members, signatures
+
+
+def cluster_run_items(
+    conn: DuckDBPyConnection, run_id: str, threshold: float = DEFAULT_THRESHOLD
+) -> dict:
+    """
+    Put every item of ``run_id`` that has no signature yet, or whose content changed since
+    it was signed, into a near-duplicate cluster.
+
+    Each such item gets a MinHash signature of its title and summary terms and one LSH
+    bucket per band. Its candidates are the items sharing a bucket with it (looked up
+    through the bucket index, earlier items of the same run included), so the work per
+    item follows bucket occupancy rather than history size. The item joins the cluster
+    of its most similar candidate at or above ``threshold`` and otherwise starts its own.
+    Items are taken oldest first, so a cluster is named after its earliest item. An
+    edited item keeps its id but drops its old buckets and is clustered afresh; other
+    clusters are never merged or split. No commit.
+    """
+    items = conn.execute(
+        """
+        SELECT i.source_id, i.url, i.title, i.summary, i.content_hash, s.item_id
+        FROM items AS i
+        LEFT JOIN item_signature AS s
+            ON s.source_id = i.source_id AND s.url = i.url
+        WHERE i.run_id = ?
+            AND (s.item_id IS NULL OR s.content_hash IS DISTINCT FROM i.content_hash)
+        ORDER BY i.published_at NULLS LAST, i.fetched_at, i.source_id, i.url
+        """,
+        [run_id],
+    ).fetchall()
+    stats = {"items": len(items), "candidates": 0, "duplicates": 0, "clusters": 0}
+    if not items:
+        return stats
+
+    resigned = [row[5] for row in items if row[5] is not None]
+    # Stale buckets would make an edited item its own candidate.
+    _drop_buckets(conn, resigned)
+    new_ids = iter(
+        sorted(
+            row[0]
+            for row in conn.execute(
+                "SELECT nextval('seq_item_signature') FROM range(?)",
+                [len(items) - len(resigned)],
+            ).fetchall()
+        )
+    )
+    item_ids = [row[5] if row[5] is not None else next(new_ids) for row in items]
+    signatures = [minhash(item_features(row[2], row[3])) for row in items]
+    keys = [band_keys(signature) if signature else [] for signature in signatures]
+    members, known = _load_candidates(conn, {key for item_keys in keys for key in item_keys})
+
+    rows: List[dict] = []
+    bucket_rows: List[dict] = []
+    for item_id, (source_id, url, _, _, hashed, _), signature, item_keys in zip(
+        item_ids, items, signatures, keys
+    ):
+        cluster_id = item_id
+        if signature is not None:
+            best = None
+            candidates = sorted({other for key in item_keys for other in members.get(key, ())})
+            stats["candidates"] += len(candidates)
+            for other in candidates:
+                other_cluster, other_signature = known[other]
+                score = similarity(signature, other_signature)
+                # Ties go to the earliest candidate (lowest item id).
+                if score >= threshold and (best is None or score > best):
+                    best, cluster_id = score, other_cluster
+            for key in item_keys:
+                members.setdefault(key, []).append(item_id)
+                bucket_rows.append({"bucket": key, "item_id": item_id})
+            known[item_id] = (cluster_id, signature)
+        if cluster_id == item_id:
+            stats["clusters"] += 1
+        else:
+            stats["duplicates"] += 1
+        rows.append(
+            {
+                "item_id": item_id,
+                "source_id": source_id,
+                "url": url,
+                "cluster_id": cluster_id,
+                "minhash": signature,
+                "run_id": run_id,
+                "content_hash": hashed,
+            }
+        )
+
+    known_ids = set(resigned)
+    inserts = [row for row in rows if row["item_id"] not in known_ids]
+    updates = [row for row in rows if row["item_id"] in known_ids]
+    if inserts:
+        conn.execute(
+            f"""
+            INSERT INTO item_signature ({", ".join(name for name, _ in _SIGNATURE_COLUMNS)})
+            {columnar_select(_SIGNATURE_COLUMNS)}
+            """,
+            [columnar_payload(inserts, _SIGNATURE_COLUMNS)],
+        )
+    if updates:
+        # Only non-key columns change, so this stays an in-place update.
+        conn.execute(
+            f"""
+            UPDATE item_signature SET
+                cluster_id = u.cluster_id,
+                minhash = u.minhash,
+                run_id = u.run_id,
+                content_hash = u.content_hash
+            FROM ({columnar_select(_SIGNATURE_COLUMNS)}) AS u
+            WHERE item_signature.item_id = u.item_id
+            """,
+            [columnar_payload(updates, _SIGNATURE_COLUMNS)],
+        )
+    if bucket_rows:
+        conn.execute(
+            f"INSERT INTO item_lsh_bucket (bucket, item_id) {columnar_select(_BUCKET_COLUMNS)}",
+            [columnar_payload(bucket_rows, _BUCKET_COLUMNS)],
+        )
+    return stats
+
+
+def prune_item_signatures(conn: DuckDBPyConnection) -> None:
+    """Drop signatures and buckets of items that no longer exist. No commit."""
+    conn.execute(
+        """
+        DELETE FROM item_signature
+        WHERE (source_id, url) NOT IN (SELECT source_id, url FROM items)
+        """
+    )
+    conn.execute(
+        "DELETE FROM item_lsh_bucket WHERE item_id NOT IN (SELECT item_id FROM item_signature)"
+    )
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import json
+from datetime import date
+from itertools import groupby
+from pathlib import Path
+from typing import Iterable, Optional, Sequence
+
+from duckdb import DuckDBPyConnection
+
+from src.core.downsample import lttb
+from src.storage.bulk import columnar_payload, columnar_select
+
+try:  # orjson is optional (``pip install orjson``); the stdlib encoder is the fallback
+    import orjson
+
+    def _dumps(row: dict) -> bytes:
+        return orjson.dumps(row)
+
+except ImportError:  # pragma: no cover - depends on environment
+
+    def _dumps(row: dict) -> bytes:
+        return json.dumps(row, ensure_ascii=False, default=str).encode("utf-8")
+
+
+OBSERVATION_COLUMNS = (
+    ("stats_data_id", "TEXT"),
+    ("dimension_key", "TEXT"),
+    ("time_code", "TEXT"),
+    ("period", "DATE"),
+    ("value", "DOUBLE"),
+    ("annotation", "TEXT"),
+    ("unit", "TEXT"),
+    ("tab_code", "TEXT"),
+    ("cat01_code", "TEXT"),
+    ("area_code", "TEXT"),
+    ("series_key", "TEXT"),
+    ("source_id", "TEXT"),
+)
+_KEY = ("stats_data_id", "dimension_key", "time_code")
+_VALUE_COLUMNS = [name for name, _ in OBSERVATION_COLUMNS if name not in _KEY]
+_COLUMN_LIST = ", ".join(name for name, _ in OBSERVATION_COLUMNS)
+
+# Downsampling for ``get_series``: period buckets reduced with one of these, or LTTB.
+BUCKET_AGGREGATES = {
+    "last": "arg_max(value, period)",
+    "avg": "avg(value)",
+    "min": "min(value)",
+    "max": "max(value)",
+}
+SERIES_METHODS = ("none", "lttb", *BUCKET_AGGREGATES)
+BUCKETS = ("day", "week", "month", "quarter", "year")
+
+
+def _changed(stored: str, incoming: str) -> str:
+    return " OR ".join(
+        f"{stored}.{name} IS DISTINCT FROM {incoming}.{name}" for name in _VALUE_COLUMNS
+    )
+
+
+def _create_stage(conn: DuckDBPyConnection) -> None:
+    column_defs = ", ".join(f"{name} {sql_type}" for name, sql_type in OBSERVATION_COLUMNS)
+    conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS _observations_stage ({column_defs})")
+    conn.execute("DELETE FROM _observations_stage")
+
+
+def _merge_stage(conn: DuckDBPyConnection, run_id: str) -> dict:
+    """Upsert the staged rows into ``fact_observation``; see ``upsert_observations``."""
+    stats = {"inserted": 0, "updated": 0, "unchanged": 0}
+    # Rows are staged in input order, so the highest rowid of a key is its last value.
+    conn.execute(
+        f"""
+        DELETE FROM _observations_stage
+        WHERE rowid NOT IN (
+            SELECT max(rowid) FROM _observations_stage GROUP BY {", ".join(_KEY)}
+        )
+        """
+    )
+    # Tables without an explicit series_key belong to the series resolved to their id.
+    conn.execute(
+        """
+        UPDATE _observations_stage SET series_key = d.series_key
+        FROM (
+            SELECT resolved_id, MIN(series_key) AS series_key
+            FROM dim_indicator_series
+            GROUP BY resolved_id
+        ) AS d
+        WHERE _observations_stage.series_key IS NULL
+            AND d.resolved_id = _observations_stage.stats_data_id
+        """
+    )
+    changed = _changed("o", "s")
+    staged, inserted, updated = conn.execute(
+        f"""
+        SELECT
+            COUNT(*),
+            COUNT(*) FILTER (WHERE o.stats_data_id IS NULL),
+            COUNT(*) FILTER (WHERE o.stats_data_id IS NOT NULL AND ({changed}))
+        FROM _observations_stage AS s
+        LEFT JOIN fact_observation AS o
+            USING (stats_data_id, dimension_key, time_code)
+        """
+    ).fetchone()
+    stats["inserted"], stats["updated"] = inserted, updated
+    stats["unchanged"] = staged - inserted - updated
+    if stats["unchanged"]:
+        conn.execute(
+            f"""
+            UPDATE fact_observation AS o SET run_id = ?
+            FROM _observations_stage AS s
+            WHERE o.stats_data_id = s.stats_data_id
+                AND o.dimension_key = s.dimension_key
+                AND o.time_code = s.time_code
+                AND NOT ({changed})
+                AND o.run_id != ?
+            """,
+            [run_id, run_id],
+        )
+    if inserted or updated:
+        assignments = ",\n                ".join(
+            f"{name} = EXCLUDED.{name}" for name in (*_VALUE_COLUMNS, "run_id")
+        )
+        conn.execute(
+            f"""
+            INSERT INTO fact_observation ({_COLUMN_LIST}, run_id)
+            SELECT {_COLUMN_LIST}, ? FROM _observations_stage
+            ORDER BY stats_data_id, dimension_key, period, time_code
+            ON CONFLICT (stats_data_id, dimension_key, time_code) DO UPDATE SET
+                {assignments}
+            WHERE {_changed("fact_observation", "EXCLUDED")}
+            """,
+            [run_id],
+        )
+    conn.execute("DELETE FROM _observations_stage")
+    return stats
+
+
+def upsert_observations(
+    conn: DuckDBPyConnection, run_id: str, observations: Sequence[dict]
+) -> dict:
+    """
+    Upsert typed e-Stat cells (``iter_estat_observations``) into ``fact_observation``.
+
+    One row per table, dimension key and time code; a cell seen twice in the batch keeps
+    its last value. Like ``upsert_items``, unchanged cells only have their ``run_id``
+    moved to this run and changed ones are rewritten. New rows are written in series and
+    period order so range scans over one series touch few row groups. Returns
+    inserted/updated/unchanged counts.
+    """
+    if not observations:
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
+    _create_stage(conn)
+    conn.execute(
+        f"INSERT INTO _observations_stage {columnar_select(OBSERVATION_COLUMNS)}",
+        [columnar_payload(observations, OBSERVATION_COLUMNS)],
+    )
+    return _merge_stage(conn, run_id)
+
+
+def spool_observations(observations: Iterable[dict], path: Path) -> int:
+    """
+    Write observations to ``path`` as newline-delimited JSON, one row at a time, for
+    ``upsert_observation_files``. Returns the number written.
+    """
+    names = [name for name, _ in OBSERVATION_COLUMNS]
+    count = 0
+    with open(path, "wb") as handle:
+        for observation in observations:
+            handle.write(_dumps({name: observation.get(name) for name in names}))
+            handle.write(b"\n")
+            count += 1
+    return count
+
+
+def upsert_observation_files(conn: DuckDBPyConnection, run_id: str, paths: Sequence[Path]) -> dict:
+    """
+    ``upsert_observations`` for files written by ``spool_observations``. DuckDB reads the
+    files directly, so a large table never has to be held in Python at once. A cell
+    repeated across files keeps the value from the later file.
+    """
+    if not paths:
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
+    _create_stage(conn)
+    columns = ", ".join(f"'{name}': '{sql_type}'" for name, sql_type in OBSERVATION_COLUMNS)
+    for path in paths:
+        conn.execute(
+            f"""
+            INSERT INTO _observations_stage
+            SELECT {_COLUMN_LIST}
+            FROM read_json(?, format = 'newline_delimited', columns = {{{columns}}})
+            """,
+            [str(path)],
+        )
+    return _merge_stage(conn, run_id)
+
+
+def get_observations(
+    conn: DuckDBPyConnection,
+    stats_data_id: Optional[str] = None,
+    series_key: Optional[str] = None,
+    dimension_key: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> list[dict]:
+    """
+    Observations of one table (by ``stats_data_id`` or ``series_key``) in period order,
+    optionally narrowed to one ``dimension_key`` and a ``start``..``end`` period range
+    (both inclusive). Cells without a known period sort last and are dropped by a range.
+    """
+    if stats_data_id is None and series_key is None:
+        raise ValueError("stats_data_id or series_key is required")
+    clauses = []
+    params: list = []
+    for column, value in (
+        ("stats_data_id", stats_data_id),
+        ("series_key", series_key),
+        ("dimension_key", dimension_key),
+    ):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if start is not None:
+        clauses.append("period >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append("period <= ?")
+        params.append(end)
+    cursor = conn.execute(
+        f"""
+        SELECT {_COLUMN_LIST}
+        FROM fact_observation
+        WHERE {" AND ".join(clauses)}
+        ORDER BY stats_data_id, dimension_key, period NULLS LAST, time_code
+        """,
+        params,
+    )
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def _series_tables(conn: DuckDBPyConnection, series_key: str) -> list[str]:
+    rows = conn.execute(
+        "SELECT resolved_id FROM dim_indicator_series WHERE series_key = ?", [series_key]
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def get_series(
+    conn: DuckDBPyConnection,
+    series_keys: Sequence[str],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    dimension_key: Optional[str] = None,
+    method: str = "lttb",
+    bucket: str = "month",
+    points: int = 500,
+) -> list[dict]:
+    """
+    Values of indicator series over time, downsampled in the database layer.
+
+    A series is every observation tagged with the ``series_key`` or belonging to the
+    table it resolves to in ``dim_indicator_series``; each of its dimension keys (or only
+    ``dimension_key``) is returned as one line. ``method`` is ``none`` (every point),
+    ``lttb`` (at most ``points`` points chosen by Largest-Triangle-Three-Buckets), or
+    ``last``/``avg``/``min``/``max`` of each ``bucket`` period. ``start`` and ``end``
+    are inclusive; cells without a period or numeric value are left out. Lines come
+    back in ``series_keys`` order, then by dimension key, with ``raw_count`` holding
+    the number of observations they were built from.
+    """
+    if method not in SERIES_METHODS:
+        raise ValueError(f"method must be one of {', '.join(SERIES_METHODS)}")
+    if method in BUCKET_AGGREGATES and bucket not in BUCKETS:
+        raise ValueError(f"bucket must be one of {', '.join(BUCKETS)}")
+    if method == "lttb" and points < 3:
+        raise ValueError("points must be at least 3")
+
+    lines: list[dict] = []
+    for series_key in series_keys:
+        tables = _series_tables(conn, series_key)
+        clauses = ["period IS NOT NULL", "value IS NOT NULL"]
+        owner = ["series_key = ?"]
+        params: list = [series_key]
+        if tables:
+            owner.append(f"stats_data_id IN ({', '.join('?' for _ in tables)})")
+            params.extend(tables)
+        clauses.append(f"({' OR '.join(owner)})")
+        for condition, value in (
+            ("dimension_key = ?", dimension_key),
+            ("period >= ?", start),
+            ("period <= ?", end),
+        ):
+            if value is not None:
+                clauses.append(condition)
+                params.append(value)
+        where = " AND ".join(clauses)
+        if method in BUCKET_AGGREGATES:
+            rows = conn.execute(
+                f"""
+                SELECT
+                    stats_data_id, dimension_key,
+                    CAST(date_trunc(?, period) AS DATE) AS bucket,
+                    {BUCKET_AGGREGATES[method]} AS value,
+                    any_value(unit), COUNT(*)
+                FROM fact_observation
+                WHERE {where}
+                GROUP BY stats_data_id, dimension_key, bucket
+                ORDER BY stats_data_id, dimension_key, bucket
+                """,
+                [bucket, *params],
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                f"""
+                SELECT stats_data_id, dimension_key, period, value, unit, 1
+                FROM fact_observation
+                WHERE {where}
+                ORDER BY stats_data_id, dimension_key, period, time_code
+                """,
+                params,
+            ).fetchall()
+        for (stats_data_id, line_key), group in groupby(rows, key=lambda row: row[:2]):
+            line = list(group)
+            if method == "lttb":
+                kept = lttb([row[2].toordinal() for row in line], [row[3] for row in line], points)
+                samples = [line[index] for index in kept]
+            else:
+                samples = line
+            lines.append(
+                {
+                    "series_key": series_key,
+                    "stats_data_id": stats_data_id,
+                    "dimension_key": line_key,
+                    "unit": line[0][4],
+                    "method": method,
+                    "bucket": bucket if method in BUCKET_AGGREGATES else None,
+                    "raw_count": sum(row[5] for row in line),
+                    "points": [(row[2], row[3]) for row in samples],
+                }
+            )
+    return lines
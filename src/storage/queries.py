@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import Optional
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Sequence
 
 from duckdb import DuckDBPyConnection
 
@@ -65,23 +68,78 @@ def get_latest_run(conn: DuckDBPyConnection) -> Optional[dict]:
     }
 
 
-def get_items_for_run(conn: DuckDBPyConnection, run_id: str, limit: int = 200) -> list[dict]:
-    rows = conn.execute(
+# Semi-join on the indexed ``item_geo.geo_key``; tags are per run, like the items.
+_GEO_FILTER = """
+    EXISTS (
+        SELECT 1 FROM item_geo AS g
+        WHERE g.geo_key = ?
+            AND g.run_id = {table}.run_id
+            AND g.source_id = {table}.source_id
+            AND g.url = {table}.url
+    )
+"""
+
+_ITEM_ORDERINGS = {
+    "published": "i.published_at DESC NULLS LAST, i.fetched_at DESC",
+    "score": "s.score DESC NULLS LAST, i.published_at DESC NULLS LAST, i.fetched_at DESC",
+}
+
+
+def get_items_for_run(
+    conn: DuckDBPyConnection,
+    run_id: str,
+    limit: int = 200,
+    order_by: str = "published",
+    geo: Optional[str] = None,
+    collapse_duplicates: bool = False,
+) -> list[dict]:
+    """
+    Items of a run, newest first or (``order_by="score"``) highest ``fact_item_score``
+    first; unscored items sort after scored ones. ``geo`` filters to items tagged with
+    that place, prefecture or rollup. ``cluster_size`` counts the run's (filtered) items
+    in the item's near-duplicate cluster; ``collapse_duplicates`` keeps only the first
+    item of each cluster in the chosen order.
+    """
+    if order_by not in _ITEM_ORDERINGS:
+        raise ValueError(f"unknown order_by: {order_by}")
+    geo_filter = f"AND {_GEO_FILTER.format(table='i')}" if geo else ""
+    collapse = (
+        f"""
+        QUALIFY c.cluster_id IS NULL
+            OR row_number() OVER (
+                PARTITION BY c.cluster_id ORDER BY {_ITEM_ORDERINGS[order_by]}
+            ) = 1
         """
+        if collapse_duplicates
+        else ""
+    )
+    rows = conn.execute(
+        f"""
         SELECT
-            source_id,
-            source_name,
-            title,
-            summary,
-            url,
-            published_at,
-            fetched_at
-        FROM items
-        WHERE run_id = ?
-        ORDER BY published_at DESC NULLS LAST, fetched_at DESC
+            i.source_id,
+            i.source_name,
+            i.title,
+            i.summary,
+            i.url,
+            i.published_at,
+            i.fetched_at,
+            s.score,
+            c.cluster_id,
+            CASE
+                WHEN c.cluster_id IS NULL THEN 1
+                ELSE COUNT(*) OVER (PARTITION BY c.cluster_id)
+            END AS cluster_size
+        FROM items AS i
+        LEFT JOIN fact_item_score AS s
+            ON s.run_id = i.run_id AND s.source_id = i.source_id AND s.url = i.url
+        LEFT JOIN item_signature AS c
+            ON c.source_id = i.source_id AND c.url = i.url
+        WHERE i.run_id = ? {geo_filter}
+        {collapse}
+        ORDER BY {_ITEM_ORDERINGS[order_by]}
         LIMIT ?
         """,
-        [run_id, limit],
+        [run_id, *([geo] if geo else []), limit],
     ).fetchall()
 
     return [
@@ -93,6 +151,9 @@ def get_items_for_run(conn: DuckDBPyConnection, run_id: str, limit: int = 200) -
             "url": r[4],
             "published_at": r[5],
             "fetched_at": r[6],
+            "score": r[7],
+            "cluster_id": r[8],
+            "cluster_size": r[9],
         }
         for r in rows
     ]
@@ -123,8 +184,8 @@ def get_source_health(
     """
     Per-source health metrics across the last N runs (by fact_run.started_at DESC).
 
-    - success_rate (%)
-    - consecutive_failures (from most recent backwards until first success)
+    - success_rate (%) — "not_modified" (HTTP 304) counts as healthy
+    - consecutive_failures (from most recent backwards until first success/not_modified)
     - avg_duration_seconds
     - last status/error metadata
     - last_success_at / last_failure_at
@@ -169,7 +230,7 @@ def get_source_health(
                     ORDER BY started_at DESC
                 ) AS rn,
                 SUM(
-                    CASE WHEN status = 'success' THEN 1 ELSE 0 END
+                    CASE WHEN status IN ('success', 'not_modified') THEN 1 ELSE 0 END
                 ) OVER (
                     PARTITION BY source_id
                     ORDER BY started_at DESC
@@ -187,10 +248,17 @@ def get_source_health(
                 source_id,
                 COUNT(*) AS runs,
                 SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END) AS success_count,
-                SUM(CASE WHEN status != 'success' THEN 1 ELSE 0 END) AS fail_count,
+                SUM(CASE WHEN status = 'not_modified' THEN 1 ELSE 0 END) AS not_modified_count,
+                SUM(
+                    CASE WHEN status NOT IN ('success', 'not_modified') THEN 1 ELSE 0 END
+                ) AS fail_count,
                 AVG(duration_seconds) AS avg_duration_seconds,
-                MAX(CASE WHEN status = 'success' THEN ended_at END) AS last_success_at,
-                MAX(CASE WHEN status != 'success' THEN ended_at END) AS last_failure_at
+                MAX(
+                    CASE WHEN status IN ('success', 'not_modified') THEN ended_at END
+                ) AS last_success_at,
+                MAX(
+                    CASE WHEN status NOT IN ('success', 'not_modified') THEN ended_at END
+                ) AS last_failure_at
             FROM ordered
             GROUP BY source_id
         ),
@@ -199,7 +267,8 @@ def get_source_health(
                 source_id,
                 SUM(
                     CASE
-                        WHEN status != 'success' AND success_seen = 0 THEN 1
+                        WHEN status NOT IN ('success', 'not_modified') AND success_seen = 0
+                            THEN 1
                         ELSE 0
                     END
                 ) AS consecutive_failures
@@ -225,7 +294,8 @@ def get_source_health(
             a.success_count,
             a.fail_count,
             CASE
-                WHEN a.runs > 0 THEN (a.success_count * 100.0) / a.runs
+                WHEN a.runs > 0
+                    THEN ((a.success_count + a.not_modified_count) * 100.0) / a.runs
                 ELSE NULL
             END AS success_rate,
             c.consecutive_failures,
@@ -237,7 +307,8 @@ def get_source_health(
             l.last_error_class,
             l.last_error_message,
             a.last_success_at,
-            a.last_failure_at
+            a.last_failure_at,
+            a.not_modified_count
         FROM agg AS a
         JOIN last AS l
             ON a.source_id = l.source_id
@@ -271,6 +342,207 @@ def get_source_health(
             "last_error_message": r[13],
             "last_success_at": r[14],
             "last_failure_at": r[15],
+            "not_modified_count": r[16],
+        }
+        for r in rows
+    ]
+
+
+def get_source_health_rollup(conn: DuckDBPyConnection, latest_run_id: str) -> list[dict]:
+    """
+    Per-source health from the incrementally maintained ``source_health_rollup``.
+
+    Same shape as ``get_source_health``; counts cover each source's last
+    ``HEALTH_WINDOW_RUNS`` source runs, while consecutive_failures and last_success_at /
+    last_failure_at span the full history. ``get_source_health`` stays the reference query.
+    """
+    rows = conn.execute(
+        """
+        SELECT
+            COALESCE(s.source_name, h.source_id) AS source_name,
+            h.source_id,
+            h.runs,
+            h.success_count,
+            h.fail_count,
+            CASE
+                WHEN h.runs > 0
+                    THEN ((h.success_count + h.not_modified_count) * 100.0) / h.runs
+                ELSE NULL
+            END AS success_rate,
+            h.consecutive_failures,
+            h.avg_duration_seconds,
+            h.last_status,
+            h.last_ended_at,
+            h.last_item_count,
+            h.last_http_status,
+            h.last_error_class,
+            h.last_error_message,
+            h.last_success_at,
+            h.last_failure_at,
+            h.not_modified_count
+        FROM source_health_rollup AS h
+        LEFT JOIN sources AS s
+            ON s.run_id = ? AND s.source_id = h.source_id
+        ORDER BY
+            h.consecutive_failures DESC,
+            h.fail_count DESC,
+            h.source_id
+        """,
+        [latest_run_id],
+    ).fetchall()
+
+    return [
+        {
+            "source_name": r[0],
+            "source_id": r[1],
+            "runs": r[2],
+            "success_count": r[3],
+            "fail_count": r[4],
+            "success_rate": r[5],
+            "consecutive_failures": r[6],
+            "avg_duration_seconds": r[7],
+            "last_status": r[8],
+            "last_ended_at": r[9],
+            "last_item_count": r[10],
+            "last_http_status": r[11],
+            "last_error_class": r[12],
+            "last_error_message": r[13],
+            "last_success_at": r[14],
+            "last_failure_at": r[15],
+            "not_modified_count": r[16],
         }
         for r in rows
     ]
+
+
+# Keyset for item browsing: newest first, items without published_at last. Every column
+# sorts descending so the seek predicate is a single row comparison.
+_ITEM_SORT_KEY = (
+    "COALESCE(published_at, TIMESTAMP '-infinity')",
+    "COALESCE(fetched_at, TIMESTAMP '-infinity')",
+    "source_id",
+    "url",
+)
+
+
+def encode_item_cursor(item: dict) -> str:
+    """Opaque cursor for the position just after ``item``."""
+    payload = [
+        item["published_at"].isoformat() if item.get("published_at") else None,
+        item["fetched_at"].isoformat() if item.get("fetched_at") else None,
+        item["source_id"],
+        item["url"],
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_item_cursor(cursor: str) -> tuple:
+    """Inverse of ``encode_item_cursor``; raises ``ValueError`` for malformed cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        published_at, fetched_at, source_id, url = json.loads(raw)
+        return (
+            datetime.fromisoformat(published_at) if published_at else None,
+            datetime.fromisoformat(fetched_at) if fetched_at else None,
+            str(source_id),
+            str(url),
+        )
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def get_items_page(
+    conn: DuckDBPyConnection,
+    run_id: Optional[str] = None,
+    source_ids: Optional[Sequence[str]] = None,
+    category: Optional[str] = None,
+    kind: Optional[str] = None,
+    published_from: Optional[datetime] = None,
+    published_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    geo: Optional[str] = None,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    One page of items using keyset (seek) pagination.
+
+    Pages follow ``ORDER BY published_at DESC NULLS LAST, fetched_at DESC, source_id, url``
+    (descending on every key). ``cursor`` is the ``next_cursor`` of the previous page, so a
+    deep page costs the same as the first one. ``published_from`` is inclusive and
+    ``published_to`` exclusive. ``geo`` keeps items tagged with that place, prefecture or
+    rollup in ``item_geo``. Returns ``(items, next_cursor)``; ``next_cursor`` is None on
+    the last page.
+    """
+    conditions: list[str] = []
+    params: list = []
+    if run_id:
+        conditions.append("run_id = ?")
+        params.append(run_id)
+    if source_ids:
+        conditions.append(f"source_id IN ({','.join('?' for _ in source_ids)})")
+        params.extend(source_ids)
+    if category:
+        conditions.append("category = ?")
+        params.append(category)
+    if kind:
+        conditions.append("kind = ?")
+        params.append(kind)
+    if published_from is not None:
+        conditions.append("published_at >= ?")
+        params.append(published_from)
+    if published_to is not None:
+        conditions.append("published_at < ?")
+        params.append(published_to)
+    if geo:
+        conditions.append(_GEO_FILTER.format(table="items"))
+        params.append(geo)
+    if cursor:
+        published_at, fetched_at, source_id, url = decode_item_cursor(cursor)
+        conditions.append(
+            f"({', '.join(_ITEM_SORT_KEY)}) < ("
+            "COALESCE(CAST(? AS TIMESTAMP), TIMESTAMP '-infinity'), "
+            "COALESCE(CAST(? AS TIMESTAMP), TIMESTAMP '-infinity'), ?, ?)"
+        )
+        params.extend([published_at, fetched_at, source_id, url])
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    order_by = ", ".join(f"{key} DESC" for key in _ITEM_SORT_KEY)
+    rows = conn.execute(
+        f"""
+        SELECT
+            run_id,
+            source_id,
+            source_name,
+            category,
+            kind,
+            title,
+            summary,
+            url,
+            published_at,
+            fetched_at
+        FROM items
+        {where}
+        ORDER BY {order_by}
+        LIMIT ?
+        """,
+        [*params, limit + 1],
+    ).fetchall()
+
+    items = [
+        {
+            "run_id": r[0],
+            "source_id": r[1],
+            "source_name": r[2],
+            "category": r[3],
+            "kind": r[4],
+            "title": r[5],
+            "summary": r[6],
+            "url": r[7],
+            "published_at": r[8],
+            "fetched_at": r[9],
+        }
+        for r in rows[:limit]
+    ]
+    next_cursor = encode_item_cursor(items[-1]) if len(rows) > limit else None
+    return items, next_cursor
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from duckdb import DuckDBPyConnection
+
+from src.storage.bulk import columnar_payload, columnar_select
+
+_STAGE_COLUMNS = (
+    ("run_id", "TEXT"),
+    ("stage", "TEXT"),
+    ("source_id", "TEXT"),
+    ("started_at", "TIMESTAMP"),
+    ("wall_ms", "DOUBLE"),
+    ("cpu_ms", "DOUBLE"),
+    ("bytes", "BIGINT"),
+    ("items", "BIGINT"),
+)
+
+
+def record_run_stages(conn: DuckDBPyConnection, run_id: str, spans: Sequence[dict]) -> int:
+    """Replace the run's ``fact_run_stage`` rows with ``spans`` (``StageTimer.spans()``)."""
+    conn.execute("DELETE FROM fact_run_stage WHERE run_id = ?", [run_id])
+    if not spans:
+        return 0
+    rows = [{**span, "run_id": run_id} for span in spans]
+    conn.execute(
+        f"""
+        INSERT INTO fact_run_stage (
+            run_id, stage, source_id, started_at, wall_ms, cpu_ms, bytes, items
+        )
+        {columnar_select(_STAGE_COLUMNS)}
+        """,
+        [columnar_payload(rows, _STAGE_COLUMNS)],
+    )
+    return len(rows)
+
+
+def get_run_stages(conn: DuckDBPyConnection, run_id: str) -> list[dict]:
+    """The run's spans in start order."""
+    rows = conn.execute(
+        """
+        SELECT stage, source_id, started_at, wall_ms, cpu_ms, bytes, items
+        FROM fact_run_stage
+        WHERE run_id = ?
+        ORDER BY started_at, stage, source_id
+        """,
+        [run_id],
+    ).fetchall()
+    return [
+        {
+            "stage": r[0],
+            "source_id": r[1],
+            "started_at": r[2],
+            "wall_ms": r[3],
+            "cpu_ms": r[4],
+            "bytes": r[5],
+            "items": r[6],
+        }
+        for r in rows
+    ]
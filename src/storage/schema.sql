@@ -50,7 +50,9 @@ CREATE TABLE IF NOT EXISTS items (
     url TEXT,
     published_at TIMESTAMP,
     fetched_at TIMESTAMP,
-    PRIMARY KEY (run_id, source_id, url)
+    content_hash TEXT,
+    -- One row per item; run_id is the latest run that fetched or carried it forward.
+    PRIMARY KEY (source_id, url)
 );
 
 CREATE TABLE IF NOT EXISTS alerts (
@@ -90,3 +92,191 @@ CREATE TABLE IF NOT EXISTS fact_indicator_series_run (
     recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     PRIMARY KEY (run_id, series_key)
 );
+
+-- Conditional GET validators (ETag / Last-Modified) per fetched URL
+CREATE TABLE IF NOT EXISTS http_validator_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    updated_at TIMESTAMP
+);
+
+-- Per-source health rollup, updated at the end of each run (rebuildable from fact_source_run)
+CREATE TABLE IF NOT EXISTS source_health_rollup (
+    source_id TEXT PRIMARY KEY,
+    runs INTEGER,
+    success_count INTEGER,
+    not_modified_count INTEGER,
+    fail_count INTEGER,
+    consecutive_failures INTEGER,
+    avg_duration_seconds DOUBLE,
+    recent_statuses TEXT[],
+    recent_durations DOUBLE[],
+    last_run_id TEXT,
+    last_status TEXT,
+    last_started_at TIMESTAMP,
+    last_ended_at TIMESTAMP,
+    last_item_count INTEGER,
+    last_http_status INTEGER,
+    last_error_class TEXT,
+    last_error_message TEXT,
+    last_success_at TIMESTAMP,
+    last_failure_at TIMESTAMP,
+    updated_at TIMESTAMP
+);
+
+-- Full-text search: inverted index over item titles and summaries (see src/storage/search.py)
+CREATE SEQUENCE IF NOT EXISTS seq_search_term;
+CREATE SEQUENCE IF NOT EXISTS seq_search_doc;
+
+CREATE TABLE IF NOT EXISTS search_term (
+    term TEXT PRIMARY KEY,
+    term_id INTEGER DEFAULT nextval('seq_search_term')
+);
+
+-- One row per indexed item; also stores the fields shown in search results.
+CREATE TABLE IF NOT EXISTS search_doc (
+    doc_id INTEGER DEFAULT nextval('seq_search_doc'),
+    source_id TEXT,
+    url TEXT,
+    source_name TEXT,
+    category TEXT,
+    title TEXT,
+    summary TEXT,
+    published_at TIMESTAMP,
+    doc_length INTEGER,
+    PRIMARY KEY (source_id, url)
+);
+
+CREATE TABLE IF NOT EXISTS search_posting (
+    term_id INTEGER,
+    doc_id INTEGER,
+    tf INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_search_posting_term ON search_posting (term_id);
+
+-- Watchlist hits per run item (see src/storage/item_match.py)
+CREATE TABLE IF NOT EXISTS fact_item_match (
+    run_id TEXT,
+    source_id TEXT,
+    url TEXT,
+    entity TEXT,
+    field TEXT,
+    matched_text TEXT,
+    position INTEGER,
+    hit_count INTEGER,
+    PRIMARY KEY (run_id, source_id, url, entity)
+);
+
+-- Item scores per run from config/scoring.yml (see src/storage/scoring.py). Rows are
+-- replaced a run at a time, so no key: index upkeep cost more than the scoring itself.
+CREATE TABLE IF NOT EXISTS fact_item_score (
+    run_id TEXT,
+    source_id TEXT,
+    url TEXT,
+    score DOUBLE
+);
+
+-- SHA-256 of the item's content columns (see src/storage/items.py); older databases
+-- created items without it, and their rows are rewritten once on their next upsert.
+ALTER TABLE items ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- Alert details (older databases created alerts with only run_id/alert_type/message)
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS rule_name TEXT;
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS severity TEXT;
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS source_id TEXT;
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS url TEXT;
+ALTER TABLE alerts ADD COLUMN IF NOT EXISTS created_at TIMESTAMP;
+
+-- Alert deliveries waiting for the dispatcher: one row per alert and channel
+-- (see src/storage/alerts.py and src/app/alerts/dispatcher.py)
+CREATE SEQUENCE IF NOT EXISTS seq_alert_outbox;
+
+CREATE TABLE IF NOT EXISTS alert_outbox (
+    outbox_id BIGINT DEFAULT nextval('seq_alert_outbox') PRIMARY KEY,
+    run_id TEXT,
+    channel TEXT,
+    target TEXT,
+    batch_size INTEGER,
+    payload TEXT,
+    status TEXT,
+    attempts INTEGER,
+    next_attempt_at TIMESTAMP,
+    last_error TEXT,
+    created_at TIMESTAMP,
+    sent_at TIMESTAMP
+);
+
+-- Geo tags per run item: mentioned places plus the prefectures and geo.yml rollups they
+-- expand to (see src/storage/item_geo.py). Region filters look rows up by geo_key.
+CREATE TABLE IF NOT EXISTS item_geo (
+    run_id TEXT,
+    source_id TEXT,
+    url TEXT,
+    geo_key TEXT,
+    geo_level TEXT,
+    matched_text TEXT,
+    hit_count INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_item_geo_key ON item_geo (geo_key);
+
+-- Near-duplicate clusters (see src/storage/near_dup.py): one MinHash signature per item
+-- and one LSH bucket row per signature band. cluster_id is the item_id of the cluster's
+-- first item; candidates are looked up by bucket.
+CREATE SEQUENCE IF NOT EXISTS seq_item_signature;
+
+CREATE TABLE IF NOT EXISTS item_signature (
+    item_id BIGINT PRIMARY KEY,
+    source_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    cluster_id BIGINT NOT NULL,
+    minhash UINTEGER[],
+    run_id TEXT,
+    content_hash TEXT,
+    UNIQUE (source_id, url)
+);
+
+-- Signed content; an item whose items.content_hash moved on is signed again.
+ALTER TABLE item_signature ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+CREATE TABLE IF NOT EXISTS item_lsh_bucket (
+    bucket BIGINT,
+    item_id BIGINT
+);
+
+CREATE INDEX IF NOT EXISTS idx_item_lsh_bucket ON item_lsh_bucket (bucket);
+
+-- Stage timings per run (see src/core/timing.py); source_id is set on per-source fetch
+-- spans, bytes/items where the stage counts them.
+CREATE TABLE IF NOT EXISTS fact_run_stage (
+    run_id TEXT,
+    stage TEXT,
+    source_id TEXT,
+    started_at TIMESTAMP,
+    wall_ms DOUBLE,
+    cpu_ms DOUBLE,
+    bytes BIGINT,
+    items BIGINT
+);
+
+-- Typed e-Stat cells (see src/storage/observations.py): latest value per table, dimension
+-- codes and time code. series_key links the table to dim_indicator_series; run_id is the
+-- last run that fetched the cell.
+CREATE TABLE IF NOT EXISTS fact_observation (
+    stats_data_id TEXT NOT NULL,
+    dimension_key TEXT NOT NULL,
+    time_code TEXT NOT NULL,
+    period DATE,
+    value DOUBLE,
+    annotation TEXT,
+    unit TEXT,
+    tab_code TEXT,
+    cat01_code TEXT,
+    area_code TEXT,
+    series_key TEXT,
+    source_id TEXT,
+    run_id TEXT,
+    PRIMARY KEY (stats_data_id, dimension_key, time_code)
+);
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+
+from duckdb import DuckDBPyConnection
+
+from src.core.config_schema import ScoringConfig, ScoringRule
+
+_TEXT = "lower(COALESCE(i.title, '') || ' ' || COALESCE(i.summary, ''))"
+
+
+def _in_list(column: str, values: List[str]) -> Tuple[str, List[Any]]:
+    if not values:
+        return "0.0", []
+    placeholders = ", ".join("?" for _ in values)
+    return f"CASE WHEN {column} IN ({placeholders}) THEN 1.0 ELSE 0.0 END", list(values)
+
+
+def _feature_sql(rule: ScoringRule, as_of: datetime) -> Tuple[str, List[Any]]:
+    if rule.feature == "recency":
+        # Aged against the scoring run, not fetched_at: unchanged items keep their first
+        # fetched_at across runs and would otherwise never decay. ``as_of`` is converted
+        # the way ``columnar_select`` writes item timestamps (through TIMESTAMPTZ, in the
+        # session time zone), so both sides of the subtraction share one time base.
+        as_of_sql = "CAST(CAST(? AS TIMESTAMPTZ) AS TIMESTAMP)"
+        age_hours = f"greatest(epoch({as_of_sql}) - epoch(i.published_at), 0) / 3600.0"
+        return (
+            f"CASE WHEN i.published_at IS NULL THEN 0.0 ELSE pow(0.5, {age_hours} / ?) END",
+            [as_of, rule.half_life_hours],
+        )
+    if rule.feature == "watchlist":
+        return "COALESCE(m.entities, 0)", []
+    if rule.feature == "category":
+        return _in_list("i.category", rule.values)
+    if rule.feature == "source":
+        return _in_list("i.source_id", rule.values)
+    if rule.feature == "keyword":
+        terms = [value.lower() for value in rule.values if value]
+        if not terms:
+            return "0.0", []
+        hits = " + ".join(f"CASE WHEN contains({_TEXT}, ?) THEN 1 ELSE 0 END" for _ in terms)
+        return f"({hits}) / {float(len(terms))}", terms
+    return "1.0", []
+
+
+def score_expression(config: ScoringConfig, as_of: datetime) -> Tuple[str, List[Any]]:
+    """
+    The item score as one SQL expression over ``items AS i`` (and the per-item watchlist
+    counts ``m``): ``default_score + sum(weight * feature)``, with recency measured at
+    ``as_of``. Returns SQL and its params.
+    """
+    parts = ["CAST(? AS DOUBLE)"]
+    params: List[Any] = [config.default_score]
+    for rule in config.rules:
+        feature, feature_params = _feature_sql(rule, as_of)
+        parts.append(f"CAST(? AS DOUBLE) * ({feature})")
+        params.extend([rule.weight, *feature_params])
+    return " + ".join(parts), params
+
+
+def score_run_items(
+    conn: DuckDBPyConnection,
+    run_id: str,
+    config: ScoringConfig,
+    as_of: Optional[datetime] = None,
+) -> dict:
+    """
+    Score every item of ``run_id`` in one set-based statement and replace the run's rows
+    in ``fact_item_score``. Recency is the item's age at ``as_of`` (the run's start;
+    defaults to now). Watchlist features read ``fact_item_match``, so run this after
+    matching. No commit.
+    """
+    expression, params = score_expression(config, as_of or datetime.now(timezone.utc))
+    conn.execute("DELETE FROM fact_item_score WHERE run_id = ?", [run_id])
+    scored = conn.execute(
+        f"""
+        INSERT INTO fact_item_score (run_id, source_id, url, score)
+        SELECT i.run_id, i.source_id, i.url, {expression}
+        FROM items AS i
+        LEFT JOIN (
+            SELECT source_id, url, COUNT(*) AS entities
+            FROM fact_item_match
+            WHERE run_id = ?
+            GROUP BY source_id, url
+        ) AS m
+            ON m.source_id = i.source_id AND m.url = i.url
+        WHERE i.run_id = ?
+        """,
+        [*params, run_id, run_id],
+    ).fetchone()[0]
+    return {"items": scored, "rules": len(config.rules)}
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+from duckdb import DuckDBPyConnection
+
+from src.core.text_search import document_terms
+from src.storage.bulk import columnar_payload, columnar_select
+
+# BM25 parameters.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_DOC_KEY_COLUMNS = (("source_id", "TEXT"), ("url", "TEXT"))
+_DOC_COLUMNS = (
+    *_DOC_KEY_COLUMNS,
+    ("source_name", "TEXT"),
+    ("category", "TEXT"),
+    ("title", "TEXT"),
+    ("summary", "TEXT"),
+    ("published_at", "TIMESTAMP"),
+    ("doc_length", "INTEGER"),
+)
+_POSTING_COLUMNS = (("term", "TEXT"), *_DOC_KEY_COLUMNS, ("tf", "INTEGER"))
+
+
+def index_items(conn: DuckDBPyConnection, items: Sequence[dict]) -> int:
+    """
+    (Re)index the title and summary of ``items`` (unique on source_id + url).
+
+    Documents keep their ``doc_id`` and have their postings replaced, so calling this for
+    every upserted item keeps the index current. Terms and documents are referenced by
+    integer ids to keep the posting table narrow. No commit. Returns postings written.
+    """
+    if not items:
+        return 0
+    docs = []
+    postings = []
+    for item in items:
+        terms = document_terms(item.get("title"), item.get("summary"))
+        docs.append({**item, "doc_length": sum(terms.values())})
+        postings.extend(
+            {"term": term, "source_id": item["source_id"], "url": item["url"], "tf": tf}
+            for term, tf in terms.items()
+        )
+
+    conn.execute(
+        f"""
+        INSERT INTO search_doc (
+            source_id, url, source_name, category, title, summary, published_at, doc_length
+        )
+        {columnar_select(_DOC_COLUMNS)}
+        ON CONFLICT (source_id, url) DO UPDATE SET
+            source_name = EXCLUDED.source_name,
+            category = EXCLUDED.category,
+            title = EXCLUDED.title,
+            summary = EXCLUDED.summary,
+            published_at = EXCLUDED.published_at,
+            doc_length = EXCLUDED.doc_length
+        """,
+        [columnar_payload(docs, _DOC_COLUMNS)],
+    )
+    conn.execute(
+        f"""
+        CREATE OR REPLACE TEMP TABLE _search_batch AS
+        SELECT d.doc_id, p.term, p.tf
+        FROM ({columnar_select(_POSTING_COLUMNS)}) AS p
+        JOIN search_doc AS d
+            ON d.source_id = p.source_id AND d.url = p.url
+        """,
+        [columnar_payload(postings, _POSTING_COLUMNS)],
+    )
+    conn.execute(
+        f"""
+        DELETE FROM search_posting
+        WHERE doc_id IN (
+            SELECT d.doc_id
+            FROM ({columnar_select(_DOC_KEY_COLUMNS)}) AS k
+            JOIN search_doc AS d
+                ON d.source_id = k.source_id AND d.url = k.url
+        )
+        """,
+        [columnar_payload(docs, _DOC_KEY_COLUMNS)],
+    )
+    conn.execute(
+        """
+        INSERT INTO search_term (term)
+        SELECT DISTINCT term FROM _search_batch
+        ON CONFLICT (term) DO NOTHING
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO search_posting (term_id, doc_id, tf)
+        SELECT t.term_id, b.doc_id, b.tf
+        FROM _search_batch AS b
+        JOIN search_term AS t
+            ON t.term = b.term
+        """
+    )
+    conn.execute("DROP TABLE _search_batch")
+    return len(postings)
+
+
+def prune_search_index(conn: DuckDBPyConnection) -> None:
+    """Drop index entries whose item no longer exists. No commit."""
+    conn.execute(
+        """
+        CREATE OR REPLACE TEMP TABLE _search_orphans AS
+        SELECT doc_id
+        FROM search_doc
+        WHERE (source_id, url) NOT IN (SELECT source_id, url FROM items)
+        """
+    )
+    conn.execute("DELETE FROM search_posting WHERE doc_id IN (SELECT doc_id FROM _search_orphans)")
+    conn.execute("DELETE FROM search_doc WHERE doc_id IN (SELECT doc_id FROM _search_orphans)")
+    conn.execute("DROP TABLE _search_orphans")
+
+
+def rebuild_search_index(conn: DuckDBPyConnection, batch_size: int = 5000) -> None:
+    """Re-index every stored item. No commit."""
+    conn.execute("DELETE FROM search_posting")
+    conn.execute("DELETE FROM search_doc")
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT source_id, url, source_name, category, title, summary, published_at FROM items"
+    )
+    columns = [column[0] for column in cursor.description]
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        index_items(conn, [dict(zip(columns, row)) for row in rows])
+    cursor.close()
+
+
+def ensure_search_index(conn: DuckDBPyConnection) -> None:
+    """Build the index for databases that have items but predate it."""
+    if conn.execute("SELECT 1 FROM search_doc LIMIT 1").fetchone():
+        return
+    if conn.execute("SELECT 1 FROM items LIMIT 1").fetchone():
+        rebuild_search_index(conn)
+        conn.commit()
+
+
+def search_items(
+    conn: DuckDBPyConnection,
+    terms: Sequence[str],
+    limit: int = 50,
+    source_id: Optional[str] = None,
+) -> list[dict]:
+    """
+    Items containing every term in ``terms``, best BM25 score first.
+
+    ``terms`` are index terms (see ``src.core.text_search.query_terms``). Title terms weigh
+    double (``TITLE_WEIGHT``); ties go to the most recently published item.
+    """
+    terms = list(dict.fromkeys(terms))
+    if not terms:
+        return []
+    placeholders = ",".join("?" for _ in terms)
+    source_filter = "AND d.source_id = ?" if source_id else ""
+    params: list = [*terms]
+    if source_id:
+        params.append(source_id)
+    params.extend([len(terms), limit])
+    rows = conn.execute(
+        f"""
+        WITH query_terms AS (
+            SELECT term_id FROM search_term WHERE term IN ({placeholders})
+        ),
+        stats AS (
+            SELECT COUNT(*) AS doc_count, AVG(doc_length) AS avg_length
+            FROM search_doc
+        ),
+        matches AS (
+            SELECT term_id, doc_id, tf
+            FROM search_posting
+            WHERE term_id IN (SELECT term_id FROM query_terms)
+        ),
+        df AS (
+            SELECT term_id, COUNT(*) AS df
+            FROM matches
+            GROUP BY term_id
+        ),
+        scored AS (
+            SELECT
+                m.doc_id,
+                SUM(
+                    ln(1 + (stats.doc_count - df.df + 0.5) / (df.df + 0.5))
+                    * (m.tf * ({BM25_K1} + 1))
+                    / (
+                        m.tf
+                        + {BM25_K1} * (1 - {BM25_B} + {BM25_B} * d.doc_length / stats.avg_length)
+                    )
+                ) AS score
+            FROM matches AS m
+            JOIN df ON df.term_id = m.term_id
+            JOIN search_doc AS d ON d.doc_id = m.doc_id
+            CROSS JOIN stats
+            WHERE TRUE {source_filter}
+            GROUP BY m.doc_id
+            HAVING COUNT(*) = ?
+        )
+        SELECT
+            d.source_id,
+            d.source_name,
+            d.category,
+            d.title,
+            d.summary,
+            d.url,
+            d.published_at,
+            s.score
+        FROM scored AS s
+        JOIN search_doc AS d ON d.doc_id = s.doc_id
+        ORDER BY s.score DESC, d.published_at DESC NULLS LAST, d.url
+        LIMIT ?
+        """,
+        params,
+    ).fetchall()
+    return [
+        {
+            "source_id": r[0],
+            "source_name": r[1],
+            "category": r[2],
+            "title": r[3],
+            "summary": r[4],
+            "url": r[5],
+            "published_at": r[6],
+            "score": r[7],
+        }
+        for r in rows
+    ]
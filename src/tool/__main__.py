@@ -4,8 +4,9 @@ import argparse
 import sys
 from pathlib import Path
 
+from src.app.alerts.dispatcher import AlertDispatcher
 from src.app.pipeline import run_pipeline
-from src.core.config_loader import print_validation_report
+from src.core.config_loader import load_alerts_config, print_validation_report
 from src.core.logging import get_logger
 from src.core.series_resolver import resolve_series_config
 from src.pipeline.run_lock import RunLock, RunLockedError
@@ -44,13 +45,52 @@ def cmd_run(args: argparse.Namespace) -> int:
             overwrite_run=args.overwrite_run,
         )
         logger.info("Run %s finished in mode=%s", run_id, args.mode)
-        return 0
     except Exception as exc:  # pragma: no cover
         logger.error("Run failed: %s", exc)
         return 1
     finally:
         lock.release()
 
+    if not args.no_dispatch:
+        # After the run has committed and released its lock: a slow endpoint holds up
+        # neither the dashboard nor the next run, and anything undelivered stays queued
+        # for dispatch-alerts.
+        try:
+            _dispatch_alerts(Path(args.config_dir))
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.warning("Alert dispatch failed: %s", exc)
+    return 0
+
+
+def _dispatch_alerts(config_dir: Path) -> dict:
+    config = load_alerts_config(config_dir)
+    if config is None or not config.enabled:
+        return {}
+    # The database is only opened around the outbox reads and writes, not the sends.
+    return AlertDispatcher.from_config(None, config, connect=connect).dispatch()
+
+
+def cmd_dispatch_alerts(args: argparse.Namespace) -> int:
+    lock = RunLock()
+    try:
+        # Only checks that no run is in progress; delivery itself does not hold the lock.
+        lock.acquire()
+    except RunLockedError:
+        logger.error("A run is in progress; its alerts are dispatched when it finishes.")
+        return 1
+    lock.release()
+    try:
+        init_db()
+        stats = _dispatch_alerts(Path(args.config_dir))
+        print(
+            f"Due: {stats.get('due', 0)}, sent: {stats.get('sent', 0)}, "
+            f"failed: {stats.get('failed', 0)}"
+        )
+        return 0
+    except Exception as exc:  # pragma: no cover - defensive
+        logger.error("Alert dispatch failed: %s", exc)
+        return 1
+
 
 def cmd_resolve_series(args: argparse.Namespace) -> int:
     config_dir = Path(args.config_dir).resolve()
@@ -97,8 +137,19 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Overwrite existing data for the provided run id if it exists",
     )
+    run_parser.add_argument(
+        "--no-dispatch",
+        action="store_true",
+        help="Only queue the run's alerts; leave delivery to dispatch-alerts",
+    )
     run_parser.set_defaults(func=cmd_run)
 
+    dispatch_parser = subparsers.add_parser(
+        "dispatch-alerts", help="Deliver queued alerts (retries failed deliveries when due)"
+    )
+    dispatch_parser.add_argument("--config-dir", default="config", help="Path to config directory")
+    dispatch_parser.set_defaults(func=cmd_dispatch_alerts)
+
     resolve_parser = subparsers.add_parser("resolve-series", help="Resolve series configuration")
     resolve_parser.add_argument("--config-dir", default="config", help="Path to config directory")
     resolve_parser.set_defaults(func=cmd_resolve_series)
@@ -0,0 +1,286 @@
+import importlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import duckdb
+import yaml
+
+from src.app.alerts.channels import EmailChannel, FileChannel
+from src.app.alerts.dispatcher import AlertDispatcher
+from src.core.config_schema import AlertChannel, AlertRule
+from src.storage.alerts import evaluate_alerts, outbox_counts, record_alerts
+from src.storage.items import upsert_items
+from src.storage.migrate import init_db
+
+
+def _item(url: str, title: str) -> dict:
+    return {
+        "source_id": "s1",
+        "source_name": "Source",
+        "category": "jp",
+        "kind": "rss",
+        "title": title,
+        "summary": "",
+        "url": url,
+        "published_at": datetime(2024, 1, 2),
+        "fetched_at": datetime(2024, 1, 2),
+    }
+
+
+def _queue(conn, run_id: str, count: int, channels) -> None:
+    alerts = [
+        {
+            "run_id": run_id,
+            "alert_type": "score",
+            "rule_name": "top",
+            "severity": "info",
+            "source_id": "s1",
+            "url": f"https://example.com/{i}",
+            "message": f"alert {i}",
+            "created_at": datetime(2024, 1, 1),
+        }
+        for i in range(count)
+    ]
+    record_alerts(conn, run_id, alerts, channels)
+
+
+def test_rules_raise_each_item_alert_once(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    rules = [
+        AlertRule(name="boj", type="watchlist", values=["BOJ"], severity="high"),
+        AlertRule(name="top", type="score", threshold=2.0),
+        AlertRule(name="down", type="source_failure", threshold=2),
+    ]
+    for run_id in ("r1", "r2"):
+        upsert_items(conn, run_id, [_item("https://a", "BOJ holds"), _item("https://b", "Other")])
+        conn.execute(
+            """
+            INSERT INTO fact_item_match (run_id, source_id, url, entity, hit_count)
+            VALUES (?, 's1', 'https://a', 'BOJ', 1), (?, 's1', 'https://b', 'Yen', 1)
+            """,
+            [run_id, run_id],
+        )
+        conn.execute(
+            """
+            INSERT INTO fact_item_score (run_id, source_id, url, score)
+            VALUES (?, 's1', 'https://a', 1.0), (?, 's1', 'https://b', 3.0)
+            """,
+            [run_id, run_id],
+        )
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO source_health_rollup
+                (source_id, last_run_id, consecutive_failures, last_error_message)
+            VALUES ('s2', ?, ?, 'HTTP 500')
+            """,
+            [run_id, 2 if run_id == "r1" else 3],
+        )
+        alerts = evaluate_alerts(conn, run_id, rules)
+        record_alerts(conn, run_id, alerts, [AlertChannel(channel="file", target="x")])
+        if run_id == "r1":
+            assert [(a["rule_name"], a["url"], a["message"]) for a in alerts] == [
+                ("boj", "https://a", "BOJ: BOJ holds"),
+                ("top", "https://b", "score 3.00: Other"),
+                ("down", None, "s2 failed 2 runs in a row: HTTP 500"),
+            ]
+            assert alerts[0]["severity"] == "high"
+        else:
+            assert alerts == []
+    assert outbox_counts(conn) == {"pending": 3}
+    conn.close()
+
+
+def test_dispatcher_batches_per_channel_and_retries(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    out_file = tmp_path / "alerts.jsonl"
+
+    class Flaky:
+        def __init__(self):
+            self.calls = 0
+
+        def send(self, alerts):
+            self.calls += 1
+            if self.calls == 1:
+                raise ConnectionError("endpoint down")
+
+    flaky = Flaky()
+    _queue(
+        conn,
+        "r1",
+        5,
+        [
+            AlertChannel(channel="file", target=str(out_file), batch_size=2),
+            AlertChannel(channel="webhook", target="https://hooks.example", batch_size=10),
+        ],
+    )
+    dispatcher = AlertDispatcher(
+        conn, max_attempts=3, backoff_seconds=60, channels={"webhook": flaky}
+    )
+    now = datetime(2024, 1, 1, 12)
+    assert dispatcher.dispatch(now=now) == {"due": 10, "batches": 4, "sent": 5, "failed": 5}
+    assert len(out_file.read_text(encoding="utf-8").splitlines()) == 5
+
+    # Backed off: nothing is due until the delay has passed.
+    assert dispatcher.dispatch(now=now + timedelta(seconds=30))["due"] == 0
+    assert dispatcher.dispatch(now=now + timedelta(seconds=61))["sent"] == 5
+    assert outbox_counts(conn) == {"sent": 10}
+    conn.close()
+
+
+def test_dispatcher_gives_up_and_slow_channel_does_not_block(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    release = threading.Event()
+
+    class Hanging:
+        def send(self, alerts):
+            release.wait(5)
+
+    class Broken:
+        def send(self, alerts):
+            raise RuntimeError("nope")
+
+    _queue(
+        conn,
+        "r1",
+        1,
+        [
+            AlertChannel(channel="slow", target="t"),
+            AlertChannel(channel="broken", target="t"),
+            AlertChannel(channel="file", target=str(tmp_path / "ok.jsonl")),
+        ],
+    )
+    dispatcher = AlertDispatcher(
+        conn,
+        max_attempts=2,
+        backoff_seconds=0,
+        send_timeout=0.2,
+        channels={"slow": Hanging(), "broken": Broken()},
+    )
+    started = time.perf_counter()
+    stats = dispatcher.dispatch(now=datetime(2024, 1, 1))
+    assert time.perf_counter() - started < 2
+    assert stats["sent"] == 1 and stats["failed"] == 2
+    errors = dict(conn.execute("SELECT channel, last_error FROM alert_outbox").fetchall())
+    assert errors["broken"] == "RuntimeError: nope"
+    assert errors["slow"].startswith("timed out")
+
+    # The slow endpoint recovers; the broken one runs out of attempts.
+    release.set()
+    dispatcher.dispatch(now=datetime(2024, 1, 2))
+    assert outbox_counts(conn) == {"sent": 2, "dead": 1}
+    conn.close()
+
+
+def test_email_channel_spools_without_smtp_host(tmp_path: Path, monkeypatch):
+    monkeypatch.delenv("APP_SMTP_HOST", raising=False)
+    monkeypatch.setenv("APP_ALERT_SPOOL_DIR", str(tmp_path / "spool"))
+    EmailChannel("ops@example.com").send(
+        [{"run_id": "r1", "severity": "high", "rule_name": "boj", "message": "BOJ: hi", "url": "u"}]
+    )
+    (message,) = (tmp_path / "spool").glob("*.eml")
+    text = message.read_text(encoding="utf-8")
+    assert "To: ops@example.com" in text
+    assert "[high] boj: BOJ: hi" in text
+
+    FileChannel(str(tmp_path / "a.jsonl")).send([{"message": "x"}])
+    assert json.loads((tmp_path / "a.jsonl").read_text(encoding="utf-8")) == {"message": "x"}
+
+
+def test_pipeline_queues_alerts_and_writes_alerts_json(tmp_path: Path, monkeypatch):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    sources = {
+        "sources": [
+            {
+                "id": "rss1",
+                "name": "RSS Source",
+                "category": "jp",
+                "kind": "rss",
+                "url": "https://example.com/rss",
+                "enabled": True,
+            }
+        ]
+    }
+    alerts = {
+        "channels": [{"channel": "file", "target": str(tmp_path / "alerts.jsonl")}],
+        "rules": [{"name": "all", "type": "score", "threshold": 0}],
+    }
+    (config_dir / "sources.yml").write_text(yaml.safe_dump(sources), encoding="utf-8")
+    (config_dir / "alerts.yml").write_text(yaml.safe_dump(alerts), encoding="utf-8")
+    (config_dir / "scoring.yml").write_text(yaml.safe_dump({"default_score": 1}), encoding="utf-8")
+    rss_text = Path("tests/fixtures/rss_sample.xml").read_text(encoding="utf-8")
+
+    db_path = tmp_path / "app.duckdb"
+    monkeypatch.setenv("APP_DB_PATH", str(db_path))
+    monkeypatch.setenv("APP_OUTPUT_ROOT", str(tmp_path / "output/runs"))
+    monkeypatch.setenv("RUN_ID", "run-1")
+
+    import src.app.pipeline as pipeline
+
+    importlib.reload(pipeline)
+    _, output_dir = pipeline.run_pipeline(
+        config_dir=config_dir, fetcher=lambda url, allowed: rss_text
+    )
+
+    written = json.loads((output_dir / "alerts.json").read_text(encoding="utf-8"))
+    assert sorted(alert["url"] for alert in written) == [
+        "https://example.com/one",
+        "https://example.com/two",
+    ]
+    # Queued, not delivered: run_pipeline never talks to a channel.
+    assert not (tmp_path / "alerts.jsonl").exists()
+    conn = duckdb.connect(str(db_path))
+    assert outbox_counts(conn) == {"pending": 2}
+    conn.close()
+
+
+def test_run_dispatches_after_releasing_lock_and_database(tmp_path: Path, monkeypatch):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    _queue(conn, "r1", 1, [AlertChannel(channel="webhook", target="https://hooks.example")])
+    conn.close()
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    alerts = {"enabled": True, "rules": [{"name": "top", "type": "score", "threshold": 1}]}
+    (config_dir / "alerts.yml").write_text(yaml.safe_dump(alerts), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("APP_DB_PATH", str(tmp_path / "app.duckdb"))
+
+    import src.app.alerts.dispatcher as dispatcher
+    import src.tool.__main__ as tool
+
+    opened = []
+    seen = {}
+
+    def connect():
+        opened.append(duckdb.connect(str(tmp_path / "app.duckdb")))
+        return opened[-1]
+
+    class Webhook:
+        def send(self, batch):
+            seen["locked"] = Path("output/run.lock").exists()
+            seen["open"] = []
+            for other in opened:
+                try:
+                    other.execute("SELECT 1")
+                    seen["open"].append(other)
+                except duckdb.Error:
+                    pass
+
+    monkeypatch.setattr(tool, "run_pipeline", lambda **kwargs: ("r1", tmp_path))
+    monkeypatch.setattr(tool, "connect", connect)
+    monkeypatch.setattr(dispatcher, "build_channel", lambda name, target: Webhook())
+    args = tool.build_parser().parse_args(["run", "manual", "--config-dir", str(config_dir)])
+    assert tool.cmd_run(args) == 0
+
+    assert seen == {"locked": False, "open": []}
+    assert len(opened) == 2
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    assert outbox_counts(conn) == {"sent": 1}
+    conn.close()
@@ -0,0 +1,39 @@
+from urllib.request import urlopen
+
+import pytest
+
+from benchmarks.bench_ingest import compare
+from benchmarks.fixture_server import FixtureServer
+from src.app.ingest.estat import parse_estat
+from src.app.ingest.rss import parse_rss
+
+SOURCE = {"id": "bench", "name": "Bench", "category": "jp", "kind": "rss", "url": ""}
+
+
+def test_fixture_server_serves_parseable_feeds_and_errors():
+    with FixtureServer(seed=1) as server:
+        rss = urlopen(server.url("/rss", items=5)).read().decode("utf-8")
+        atom = urlopen(server.url("/atom", items=3, seed=2)).read().decode("utf-8")
+        estat = urlopen(server.url("/estat", values=4)).read().decode("utf-8")
+        with pytest.raises(Exception):
+            urlopen(server.url("/rss", error_rate=1))
+    assert len(parse_rss(rss, SOURCE)) == 5
+    assert len(parse_rss(atom, SOURCE)) == 3
+    assert len(parse_estat(estat, {**SOURCE, "kind": "estat_api"})) == 4
+    assert (server.requests, server.errors) == (4, 1)
+
+
+def test_compare_flags_slower_cases_only():
+    baseline = [
+        {"benchmark": "parse_rss", "items": 100, "seconds": 1.0},
+        {"benchmark": "parse_rss", "items": 500, "seconds": 1.0},
+    ]
+    results = [
+        {"benchmark": "parse_rss", "items": 100, "seconds": 1.2},
+        {"benchmark": "parse_rss", "items": 500, "seconds": 1.5},
+        {"benchmark": "dedupe_items", "items": 100, "seconds": 9.0},
+    ]
+    regressions = compare(results, baseline, tolerance=0.25)
+    assert [(r["baseline_seconds"], r["seconds"], r["ratio"]) for r in regressions] == [
+        (1.0, 1.5, 1.5)
+    ]
@@ -0,0 +1,276 @@
+import importlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import duckdb
+import pytest
+import yaml
+
+from src.app.ingest.fetch import FetchSession, NotModifiedError
+from src.storage import queries
+
+RSS_TEXT = Path("tests/fixtures/rss_sample.xml").read_text(encoding="utf-8")
+ETAG = '"rss-v1"'
+
+
+class _ConditionalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = RSS_TEXT.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", ETAG)
+        self.send_header("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def feed_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ConditionalHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_session_sends_validators_and_raises_on_304(feed_server):
+    url = f"{feed_server}/rss"
+    with FetchSession(http2=False) as session:
+        assert "Item One" in session(url, [feed_server])
+        assert session.updated_validators() == [
+            {"url": url, "etag": ETAG, "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        ]
+
+    with FetchSession(http2=False, validators={url: {"etag": ETAG}}) as session:
+        with pytest.raises(NotModifiedError):
+            session(url, [feed_server])
+
+
+def test_pipeline_records_not_modified_and_carries_items(tmp_path: Path, monkeypatch, feed_server):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    sources = {
+        "sources": [
+            {
+                "id": "rss1",
+                "name": "RSS Source",
+                "category": "jp",
+                "kind": "rss",
+                "url": f"{feed_server}/rss",
+                "enabled": True,
+            }
+        ]
+    }
+    (config_dir / "sources.yml").write_text(yaml.safe_dump(sources), encoding="utf-8")
+
+    db_path = tmp_path / "app.duckdb"
+    monkeypatch.setenv("APP_DB_PATH", str(db_path))
+    monkeypatch.setenv("APP_OUTPUT_ROOT", str(tmp_path / "output/runs"))
+
+    import src.app.pipeline as pipeline
+
+    importlib.reload(pipeline)
+
+    first_run, _ = pipeline.run_pipeline(config_dir=config_dir, run_id="run-1")
+    second_run, _ = pipeline.run_pipeline(config_dir=config_dir, run_id="run-2")
+
+    conn = duckdb.connect(str(db_path))
+    statuses = conn.execute(
+        "SELECT run_id, status, item_count, http_status FROM fact_source_run ORDER BY run_id"
+    ).fetchall()
+    assert statuses == [(first_run, "success", 2, None), (second_run, "not_modified", 2, 304)]
+
+    run_status = conn.execute("SELECT status FROM fact_run WHERE run_id = ?", [second_run])
+    assert run_status.fetchone()[0] == "success"
+
+    carried = conn.execute("SELECT COUNT(*) FROM items WHERE run_id = ?", [second_run])
+    assert carried.fetchone()[0] == 2
+
+    health = queries.get_source_health(conn, second_run)
+    assert health[0]["not_modified_count"] == 1
+    assert health[0]["fail_count"] == 0
+    assert health[0]["consecutive_failures"] == 0
+    assert health[0]["success_rate"] == 100.0
+    conn.close()
+
+
+class _VersionedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    version = {"etag": '"v1"', "links": ["b", "a"]}
+
+    def do_GET(self):
+        etag = self.version["etag"]
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        entries = "".join(
+            f"<item><title>{link}</title><link>https://example.com/{link}</link></item>"
+            for link in self.version["links"]
+        )
+        body = f"<rss><channel>{entries}</channel></rss>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_incremental_early_stop_keeps_validators(tmp_path: Path, monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _VersionedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/rss"
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    sources = {
+        "fetch": {"incremental": True, "stop_after_known": 1},
+        "sources": [{"id": "rss1", "name": "RSS", "category": "jp", "kind": "rss", "url": url}],
+    }
+    (config_dir / "sources.yml").write_text(yaml.safe_dump(sources), encoding="utf-8")
+    db_path = tmp_path / "app.duckdb"
+    monkeypatch.setenv("APP_DB_PATH", str(db_path))
+    monkeypatch.setenv("APP_OUTPUT_ROOT", str(tmp_path / "output/runs"))
+
+    import src.app.pipeline as pipeline
+
+    importlib.reload(pipeline)
+    _VersionedHandler.version = {"etag": '"v1"', "links": ["b", "a"]}
+    try:
+        pipeline.run_pipeline(config_dir=config_dir, run_id="run-1")
+        # The second run stops reading at the first known item.
+        _VersionedHandler.version = {"etag": '"v2"', "links": ["c", "b", "a"]}
+        pipeline.run_pipeline(config_dir=config_dir, run_id="run-2")
+        pipeline.run_pipeline(config_dir=config_dir, run_id="run-3")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    conn = duckdb.connect(str(db_path))
+    statuses = conn.execute(
+        "SELECT run_id, status, item_count FROM fact_source_run ORDER BY run_id"
+    ).fetchall()
+    assert statuses == [
+        ("run-1", "success", 2),
+        ("run-2", "success", 2),
+        ("run-3", "not_modified", 2),
+    ]
+    etag = conn.execute("SELECT etag FROM http_validator_cache").fetchone()[0]
+    assert etag == '"v2"'
+    conn.close()
+
+
+class _PagedEstatHandler(BaseHTTPRequestHandler):
+    """Two e-Stat pages of one cell each, with their own ETags."""
+
+    protocol_version = "HTTP/1.1"
+    pages = {1: ('"p1-v1"', "100"), 2: ('"p2-v1"', "200")}
+    conditional_starts: list = []
+
+    def do_GET(self):
+        start = int(parse_qs(urlsplit(self.path).query).get("startPosition", ["1"])[0])
+        etag, value = self.pages[start]
+        if self.headers.get("If-None-Match"):
+            self.conditional_starts.append(start)
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        result_inf = {"TOTAL_NUMBER": 2, "FROM_NUMBER": start, "TO_NUMBER": start}
+        if start == 1:
+            result_inf["NEXT_KEY"] = 2
+        cell = {"@tab": "01", "@area": "00000", "@time": f"20240{start}0{start}0{start}"}
+        data = {
+            "GET_STATS_DATA": {
+                "STATISTICAL_DATA": {
+                    "RESULT_INF": result_inf,
+                    "TABLE_INF": {"@id": "T1", "TITLE": "Paged table"},
+                    "DATA_INF": {"VALUE": [{**cell, "$": value}]},
+                }
+            }
+        }
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_estat_continuation_pages_are_not_conditional(tmp_path: Path, monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _PagedEstatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/estat"
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    source = {
+        "id": "estat1",
+        "name": "eStat",
+        "category": "jp",
+        "kind": "estat_api",
+        "url": base_url,
+        "params": {"dataset_id": "T1"},
+    }
+    (config_dir / "sources.yml").write_text(yaml.safe_dump({"sources": [source]}), encoding="utf-8")
+    db_path = tmp_path / "app.duckdb"
+    monkeypatch.setenv("APP_DB_PATH", str(db_path))
+    monkeypatch.setenv("APP_OUTPUT_ROOT", str(tmp_path / "output/runs"))
+
+    import src.app.pipeline as pipeline
+
+    importlib.reload(pipeline)
+    _PagedEstatHandler.pages = {1: ('"p1-v1"', "100"), 2: ('"p2-v1"', "200")}
+    _PagedEstatHandler.conditional_starts = []
+    try:
+        pipeline.run_pipeline(config_dir=config_dir, run_id="run-1")
+        conn = duckdb.connect(str(db_path))
+        cached = conn.execute("SELECT url, etag FROM http_validator_cache").fetchall()
+        conn.close()
+        assert cached == [(f"{base_url}?statsDataId=T1", '"p1-v1"')]
+
+        # The first page changed; the second did not, and the session knows its ETag too.
+        _PagedEstatHandler.pages[1] = ('"p1-v2"', "150")
+        validators = {
+            f"{base_url}?statsDataId=T1": {"etag": '"p1-v1"'},
+            f"{base_url}?statsDataId=T1&startPosition=2": {"etag": '"p2-v1"'},
+        }
+        with FetchSession(http2=False, validators=validators) as session:
+            pipeline.run_pipeline(config_dir=config_dir, fetcher=session, run_id="run-2")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert _PagedEstatHandler.conditional_starts == [1]
+    conn = duckdb.connect(str(db_path))
+    statuses = conn.execute("SELECT run_id, status FROM fact_source_run ORDER BY run_id")
+    assert statuses.fetchall() == [("run-1", "success"), ("run-2", "success")]
+    values = conn.execute("SELECT time_code, value, run_id FROM fact_observation ORDER BY 1")
+    assert values.fetchall() == [("2024010101", 150.0, "run-2"), ("2024020202", 200.0, "run-2")]
+    conn.close()
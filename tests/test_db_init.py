@@ -20,4 +20,37 @@ def test_init_db_creates_tables(tmp_path: Path):
         "items",
         "dim_series_resolution",
         "dim_indicator_series",
+        "http_validator_cache",
     }.issubset(tables)
+
+
+def test_init_db_rekeys_items_from_older_databases(tmp_path: Path):
+    db_path = tmp_path / "app.duckdb"
+    conn = duckdb.connect(str(db_path))
+    conn.execute(
+        """
+        CREATE TABLE items (
+            run_id TEXT, source_id TEXT, source_name TEXT, category TEXT, kind TEXT,
+            title TEXT, summary TEXT, url TEXT, published_at TIMESTAMP, fetched_at TIMESTAMP,
+            PRIMARY KEY (run_id, source_id, url)
+        )
+        """
+    )
+    conn.execute("CREATE UNIQUE INDEX idx_items_source_url ON items(source_id, url)")
+    conn.execute("INSERT INTO items (run_id, source_id, url, title) VALUES ('r1', 's1', 'u', 'A')")
+    conn.close()
+
+    init_db(db_path=db_path)
+    init_db(db_path=db_path)
+
+    conn = duckdb.connect(str(db_path))
+    key = conn.execute(
+        """
+        SELECT constraint_column_names FROM duckdb_constraints()
+        WHERE table_name = 'items' AND constraint_type = 'PRIMARY KEY'
+        """
+    ).fetchone()[0]
+    assert key == ["source_id", "url"]
+    rows = conn.execute("SELECT run_id, source_id, url, title, content_hash FROM items").fetchall()
+    assert rows == [("r1", "s1", "u", "A", None)]
+    conn.close()
@@ -0,0 +1,103 @@
+import csv
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import duckdb
+
+from src.storage.exports import export_formats, export_run_items
+from src.storage.items import upsert_items
+from src.storage.migrate import init_db
+
+
+def _seed(db_path: Path):
+    init_db(db_path=db_path)
+    conn = duckdb.connect(str(db_path))
+    conn.execute("SET TimeZone = 'UTC'")
+    conn.executemany(
+        """
+        INSERT INTO items (
+            run_id, source_id, source_name, category, kind,
+            title, summary, url, published_at, fetched_at
+        )
+        VALUES (?, 's1', 'Source', 'jp', 'rss', ?, 'sum', ?, ?, ?)
+        """,
+        [
+            ["r1", "First", "https://a", datetime(2024, 1, 2, 3, 4, 5), datetime(2024, 1, 3)],
+            ["r1", "Second", "https://b", None, datetime(2024, 1, 3)],
+            ["r0", "Old", "https://c", datetime(2023, 1, 1), datetime(2023, 1, 1)],
+        ],
+    )
+    return conn
+
+
+def test_export_run_items_writes_each_format(tmp_path: Path):
+    conn = _seed(tmp_path / "app.duckdb")
+    out = tmp_path / "out"
+
+    written = export_run_items(conn, "r1", out, formats=["csv", "parquet", "jsonl"])
+
+    assert sorted(p.name for p in written.values()) == [
+        "brief_items.csv",
+        "brief_items.jsonl",
+        "brief_items.parquet",
+    ]
+    with written["csv"].open(encoding="utf-8", newline="") as file:
+        rows = list(csv.DictReader(file))
+    assert [r["title"] for r in rows] == ["First", "Second"]
+    assert rows[0]["published_at"] == "2024-01-02T03:04:05+00:00"
+
+    parquet_rows = conn.execute(
+        "SELECT title, published_at FROM read_parquet(?) ORDER BY title", [str(written["parquet"])]
+    ).fetchall()
+    assert parquet_rows == [("First", datetime(2024, 1, 2, 3, 4, 5)), ("Second", None)]
+
+    lines = written["jsonl"].read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["url"] for line in lines] == ["https://a", "https://b"]
+    conn.close()
+
+
+def test_export_formats_from_env(monkeypatch):
+    monkeypatch.delenv("APP_EXPORT_FORMATS", raising=False)
+    assert export_formats() == ["csv", "parquet"]
+    monkeypatch.setenv("APP_EXPORT_FORMATS", "Parquet, jsonl,xml,parquet")
+    assert export_formats() == ["parquet", "jsonl"]
+
+
+def test_text_exports_keep_the_isoformat_contract(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    conn.execute("SET TimeZone = 'Asia/Tokyo'")
+    published = [
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, 3, 4, 6, 250000, tzinfo=timezone.utc),
+    ]
+    upsert_items(
+        conn,
+        "r1",
+        [
+            {
+                "source_id": "s1",
+                "source_name": "Source",
+                "category": "jp",
+                "kind": "rss",
+                "title": f"Item {i}",
+                "summary": "",
+                "url": f"https://a/{i}",
+                "published_at": value,
+                "fetched_at": value,
+            }
+            for i, value in enumerate(published)
+        ],
+    )
+
+    written = export_run_items(conn, "r1", tmp_path / "out", formats=["csv", "jsonl"])
+    with written["csv"].open(encoding="utf-8", newline="") as file:
+        csv_values = sorted(row["published_at"] for row in csv.DictReader(file))
+    lines = written["jsonl"].read_text(encoding="utf-8").splitlines()
+    jsonl_values = sorted(json.loads(line)["published_at"] for line in lines)
+    expected = sorted(value.isoformat() for value in published)
+    assert expected == ["2024-01-02T03:04:05+00:00", "2024-01-02T03:04:06.250000+00:00"]
+    assert csv_values == expected
+    assert jsonl_values == expected
+    conn.close()
@@ -0,0 +1,91 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from benchmarks.fixture_server import FixtureServer
+from src.app.ingest.estat import iter_estat_pages
+from src.app.ingest.fetch import FetchError, FetchSession, fetch_text
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = f"payload for {self.path}".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def feed_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_session_reuses_connections(feed_server):
+    allowed = [feed_server]
+    with FetchSession(http2=False) as session:
+        assert session(f"{feed_server}/a", allowed) == "payload for /a"
+        assert session(f"{feed_server}/b", allowed) == "payload for /b"
+        assert session.fetch_text(f"{feed_server}/c") == "payload for /c"
+        stats = session.stats()
+
+    assert stats["requests"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 2
+
+
+def test_fetch_session_rejects_disallowed_url(feed_server):
+    with FetchSession(http2=False) as session:
+        with pytest.raises(FetchError):
+            session(f"{feed_server}/a", ["https://other.example.com"])
+        assert session.stats()["requests"] == 0
+
+
+def test_fetch_text_without_session(feed_server):
+    assert fetch_text(f"{feed_server}/x", allowed_urls=[feed_server]) == "payload for /x"
+
+
+def test_fetch_session_streams_bytes(feed_server):
+    with FetchSession(http2=False) as session:
+        body = b"".join(session.iter_bytes(f"{feed_server}/stream", [feed_server], chunk_size=4))
+        assert body == b"payload for /stream"
+        assert session.stats()["requests"] == 1
+
+
+def test_paged_estat_does_not_hold_the_host_slot_while_waiting():
+    source = {"id": "e", "name": "E", "category": "jp", "kind": "estat_api", "url": ""}
+    counts = []
+
+    def read_table(session, server):
+        pages = iter_estat_pages(
+            lambda url: session.iter_bytes(url, [server.base_url], chunk_size=4096),
+            f"{server.base_url}/estat",
+            {"query": {"values": 20000, "limit": 5000}},
+            source,
+        )
+        counts.append(sum(1 for _ in pages))
+
+    # One connection per host for two paged tables, each page arriving in many chunks.
+    with FixtureServer() as server, FetchSession(http2=False, per_host_connections=1) as session:
+        threads = [
+            threading.Thread(target=read_table, args=(session, server), daemon=True)
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+        assert not any(thread.is_alive() for thread in threads)
+    assert counts == [20000, 20000]
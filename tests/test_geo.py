@@ -0,0 +1,101 @@
+from datetime import datetime
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from src.core.config_schema import GeoConfig, GeoPlace
+from src.core.geo import GeoTagger
+from src.storage import queries
+from src.storage.item_geo import get_geo_counts, tag_run_items
+from src.storage.items import upsert_items
+from src.storage.migrate import init_db
+
+ROLLUPS = {"tokyo_metro": ["Tokyo", "Kanagawa", "Chiba", "Saitama"], "kansai": ["Osaka", "Kyoto"]}
+
+
+def _keys(tagger: GeoTagger, text: str) -> dict:
+    row = {"source_id": "s", "url": "u", "title": text}
+    return {r["geo_key"]: (r["geo_level"], r["hit_count"]) for r in tagger.tag_item(row)}
+
+
+def test_tagger_resolves_japanese_and_romanized_names():
+    tagger = GeoTagger(ROLLUPS)
+    # 東京都 is Tokyo, not the 京都 inside it.
+    assert _keys(tagger, "東京都で会見") == {
+        "Tokyo": ("prefecture", 1),
+        "tokyo_metro": ("rollup", 1),
+    }
+    assert _keys(tagger, "Yokohama port and 横浜 again; Kyoto too") == {
+        "Yokohama": ("municipality", 2),
+        "Kanagawa": ("prefecture", 2),
+        "tokyo_metro": ("rollup", 2),
+        "Kyoto": ("prefecture", 1),
+        "kansai": ("rollup", 1),
+    }
+    # Word boundaries for romanized names; surname-like short forms are not places.
+    assert _keys(tagger, "Miear Nagoyan 山口さん Kawasaki Heavy") == {}
+    assert _keys(tagger, "大阪府と兵庫県") == {
+        "Osaka": ("prefecture", 1),
+        "kansai": ("rollup", 1),
+        "Hyogo": ("prefecture", 1),
+    }
+
+
+def test_config_places_extend_the_index():
+    config = GeoConfig(
+        geo_rollups=ROLLUPS,
+        places=[GeoPlace(name="Shibuya", prefecture="Tokyo", aliases=["渋谷区", "渋谷"])],
+    )
+    assert _keys(GeoTagger.from_config(config), "渋谷で新店舗") == {
+        "Shibuya": ("municipality", 1),
+        "Tokyo": ("prefecture", 1),
+        "tokyo_metro": ("rollup", 1),
+    }
+    with pytest.raises(ValueError):
+        GeoTagger(places=[GeoPlace(name="Atlantis", prefecture="Nowhere")])
+
+
+def test_region_filter_uses_item_geo(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    stamp = datetime(2024, 1, 2)
+    items = [
+        ("https://a", "千葉県で地震"),
+        ("https://b", "Osaka expo"),
+        ("https://c", "No place here"),
+    ]
+    upsert_items(
+        conn,
+        "r1",
+        [
+            {
+                "source_id": "s1",
+                "source_name": "S1",
+                "category": "jp",
+                "kind": "rss",
+                "title": title,
+                "summary": "",
+                "url": url,
+                "published_at": stamp,
+                "fetched_at": stamp,
+            }
+            for url, title in items
+        ],
+    )
+    stats = tag_run_items(conn, "r1", GeoTagger(ROLLUPS))
+    assert stats == {"items_scanned": 3, "items_tagged": 2, "tags": 4}
+
+    page, _ = queries.get_items_page(conn, geo="tokyo_metro")
+    assert [item["url"] for item in page] == ["https://a"]
+    assert [i["url"] for i in queries.get_items_for_run(conn, "r1", geo="Osaka")] == ["https://b"]
+    assert get_geo_counts(conn, "r1")[0] == {
+        "geo_key": "Chiba",
+        "geo_level": "prefecture",
+        "items": 1,
+    }
+
+    # Re-tagging replaces the run's rows.
+    tag_run_items(conn, "r1", GeoTagger())
+    assert queries.get_items_page(conn, geo="tokyo_metro")[0] == []
+    conn.close()
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import duckdb
+
+from src.pipeline.run_manager import RunUnitOfWork, delete_run
+from src.storage import queries
+from src.storage.health_rollup import rebuild_source_health_rollup
+from src.storage.migrate import init_db
+
+STATUSES = {
+    "steady": ["success", "success", "not_modified", "success"],
+    "flaky": ["success", "failed", "success", "failed"],
+    "broken": ["success", "failed", "failed", "failed"],
+}
+
+
+def _record_runs(conn, count: int) -> list[str]:
+    base = datetime(2024, 1, 1)
+    run_ids = []
+    for index in range(count):
+        run_id = f"run-{index}"
+        started = base + timedelta(hours=index)
+        conn.execute(
+            "INSERT INTO fact_run (run_id, started_at, status) VALUES (?, ?, 'success')",
+            [run_id, started],
+        )
+        uow = RunUnitOfWork(run_id, conn)
+        with uow.transaction():
+            for source_id, statuses in STATUSES.items():
+                status = statuses[index]
+                uow.record_source_run(
+                    source_id,
+                    started,
+                    started + timedelta(seconds=index + 1),
+                    status,
+                    0 if status == "failed" else 5,
+                    error_class="FetchError" if status == "failed" else None,
+                )
+        run_ids.append(run_id)
+    return run_ids
+
+
+def _by_source(rows: list[dict]) -> dict:
+    return {row["source_id"]: row for row in rows}
+
+
+def test_rollup_matches_reference_query(tmp_path: Path):
+    db_path = tmp_path / "app.duckdb"
+    init_db(db_path=db_path)
+    conn = duckdb.connect(str(db_path))
+    run_ids = _record_runs(conn, 4)
+
+    rollup = queries.get_source_health_rollup(conn, run_ids[-1])
+    reference = queries.get_source_health(conn, run_ids[-1], lookback_runs=20)
+    assert [r["source_id"] for r in rollup] == ["broken", "flaky", "steady"]
+    assert rollup == reference
+
+    broken = _by_source(rollup)["broken"]
+    assert broken["consecutive_failures"] == 3
+    assert broken["last_success_at"] == datetime(2024, 1, 1, 0, 0, 1)
+    assert _by_source(rollup)["steady"]["not_modified_count"] == 1
+
+    rebuild_source_health_rollup(conn)
+    assert queries.get_source_health_rollup(conn, run_ids[-1]) == rollup
+    conn.close()
+
+
+def test_rollup_window_and_delete_run(tmp_path: Path):
+    db_path = tmp_path / "app.duckdb"
+    init_db(db_path=db_path)
+    conn = duckdb.connect(str(db_path))
+    run_ids = _record_runs(conn, 4)
+
+    rebuild_source_health_rollup(conn, window=2)
+    flaky = _by_source(queries.get_source_health_rollup(conn, run_ids[-1]))["flaky"]
+    assert (flaky["runs"], flaky["success_count"], flaky["fail_count"]) == (2, 1, 1)
+    assert flaky["avg_duration_seconds"] == 3.5
+
+    delete_run(run_ids[-1], conn=conn)
+    broken = _by_source(queries.get_source_health_rollup(conn, run_ids[-2]))["broken"]
+    assert broken["runs"] == 3
+    assert broken["consecutive_failures"] == 2
+    assert broken["last_status"] == "failed"
+    conn.close()
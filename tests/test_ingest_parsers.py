@@ -1,7 +1,13 @@
+import json
+import threading
+import time
 from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
 
-from src.app.ingest.estat import parse_estat
-from src.app.ingest.rss import parse_rss
+import pytest
+
+from src.app.ingest.estat import iter_estat, iter_estat_pages, parse_estat
+from src.app.ingest.rss import iter_rss, parse_rss
 
 
 def test_parse_rss_sample():
@@ -28,3 +34,113 @@ def test_parse_estat_sample():
     assert items[0]["source_id"] == "estat1"
     assert items[0]["summary"]
     assert items[0]["title"]
+
+
+def test_iter_rss_streams_chunks_lazily():
+    fixture = Path("tests/fixtures/rss_sample.xml").read_bytes()
+    source = {"id": "rss1", "name": "RSS Source", "category": "jp", "kind": "rss"}
+    fed = []
+
+    def chunks():
+        for start in range(0, len(fixture), 16):
+            fed.append(start)
+            yield fixture[start : start + 16]
+
+    stream = iter_rss(chunks(), source)
+    first = next(stream)
+    assert first["title"] == "Item One"
+    assert len(fed) * 16 < len(fixture)
+
+    rest = list(stream)
+    expected = parse_rss(fixture.decode("utf-8"), source)
+    assert [i["url"] for i in [first, *rest]] == [i["url"] for i in expected]
+
+
+def test_iter_rss_parses_atom_entries():
+    atom = """<?xml version="1.0" encoding="utf-8"?>
+    <feed xmlns="http://www.w3.org/2005/Atom">
+      <title>Atom</title>
+      <entry>
+        <title>Entry One</title>
+        <link href="https://example.com/e1"/>
+        <summary>First entry.</summary>
+        <updated>2024-01-03T00:00:00Z</updated>
+      </entry>
+    </feed>
+    """
+    source = {"id": "atom1", "name": "Atom Source", "category": "jp", "kind": "rss"}
+    items = list(iter_rss([atom.encode("utf-8")], source))
+    assert len(items) == 1
+    assert items[0]["url"] == "https://example.com/e1"
+    assert items[0]["summary"] == "First entry."
+    assert items[0]["published_at"].year == 2024
+
+
+def test_iter_estat_streams_values_across_chunks():
+    source = {"id": "estat1", "name": "eStat", "category": "jp", "kind": "estat_api"}
+    document = {
+        "GET_STATS_DATA": {
+            "STATISTICAL_DATA": {
+                "TABLE_INF": {"TITLE": {"@title": "人口 ]}"}},
+                "CLASS_INF": {"VALUE": ["not", "records"]},
+                "DATA_INF": {
+                    "NOTE": {"@char": "-", "$": "no data"},
+                    "VALUE": [
+                        {"@time": "2024000101", "$": "125,000 }"},
+                        {"@time": "2024000101", "$": '[\\"quoted\\"]'},
+                        {"@time": "2023000404", "$": "-"},
+                    ],
+                },
+            }
+        }
+    }
+    data = json.dumps(document, ensure_ascii=False).encode("utf-8")
+    for size in (1, 7, len(data)):
+        chunks = [data[start : start + size] for start in range(0, len(data), size)]
+        items = list(iter_estat(chunks, source))
+        assert [i["summary"] for i in items] == ["125,000 }", '[\\"quoted\\"]', "-"]
+        assert items[0]["title"] == "人口 ]} 2024000101"
+
+    single = {"GET_STATS_DATA": {"STATISTICAL_DATA": {"DATA_INF": {"VALUE": {"$": "1"}}}}}
+    assert [i["summary"] for i in parse_estat(json.dumps(single), source)] == ["1"]
+    with pytest.raises(ValueError):
+        list(iter_estat([data[: len(data) // 2]], source))
+
+
+def _estat_page(total: int, start: int, size: int) -> str:
+    last = min(total, start + size - 1)
+    info = {"TOTAL_NUMBER": total, "FROM_NUMBER": start, "TO_NUMBER": last}
+    if last < total:
+        info["NEXT_KEY"] = last + 1
+    values = [{"@time": "2024000101", "$": str(n)} for n in range(start, last + 1)]
+    data = {"STATISTICAL_DATA": {"RESULT_INF": info, "DATA_INF": {"VALUE": values}}}
+    return json.dumps({"GET_STATS_DATA": data})
+
+
+def test_iter_estat_pages_fetches_remaining_pages_concurrently():
+    source = {"id": "estat1", "name": "eStat", "category": "jp", "kind": "estat_api"}
+    requested = []
+    active = [0, 0]
+    lock = threading.Lock()
+
+    def open_page(url):
+        start = int(parse_qs(urlsplit(url).query).get("startPosition", ["1"])[0])
+        with lock:
+            requested.append(start)
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        # The first response holds 10 rows, later ones only 7: the plan has to follow
+        # NEXT_KEY instead of the page size guessed from the first page.
+        return [_estat_page(45, start, 10 if start == 1 else 7)]
+
+    items = list(iter_estat_pages(open_page, "https://api.example.com", {"app_id": "x"}, source, 3))
+    assert [int(i["summary"]) for i in items] == list(range(1, 46))
+    assert requested[:4] == [1, 11, 21, 31]
+    assert {11, 18, 25, 32, 39} <= set(requested)
+    assert 1 < active[1] <= 3
+
+    single = list(iter_estat_pages(lambda url: [_estat_page(5, 1, 10)], "u", {}, source))
+    assert len(single) == 5
@@ -0,0 +1,113 @@
+import importlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+from src.storage import queries
+from src.storage.migrate import init_db
+
+
+def _seed(conn, count: int = 23) -> None:
+    base = datetime(2024, 1, 1)
+    rows = []
+    for i in range(count):
+        # Duplicate timestamps and missing published_at exercise the tie-breakers.
+        published = None if i % 7 == 0 else base + timedelta(hours=i // 2)
+        rows.append(
+            [
+                "r1" if i < 15 else "r2",
+                f"s{i % 3}",
+                f"Source {i % 3}",
+                "jp" if i % 2 else "us",
+                "rss",
+                f"Item {i}",
+                f"https://example.com/{i}",
+                published,
+                base + timedelta(days=1),
+            ]
+        )
+    conn.executemany(
+        """
+        INSERT INTO items (
+            run_id, source_id, source_name, category, kind, title, url, published_at, fetched_at
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+
+
+def _walk(conn, **filters) -> list[str]:
+    titles, cursor = [], None
+    while True:
+        items, cursor = queries.get_items_page(conn, cursor=cursor, limit=4, **filters)
+        titles.extend(item["title"] for item in items)
+        if cursor is None:
+            return titles
+
+
+def _expected(conn, where: str = "TRUE", params=()) -> list[str]:
+    rows = conn.execute(
+        f"""
+        SELECT title FROM items WHERE {where}
+        ORDER BY published_at DESC NULLS LAST, fetched_at DESC, source_id DESC, url DESC
+        """,
+        list(params),
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def test_keyset_pages_cover_everything_once(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    _seed(conn)
+
+    assert _walk(conn) == _expected(conn)
+    assert _walk(conn, category="jp", source_ids=["s1", "s2"]) == _expected(
+        conn, "category = 'jp' AND source_id IN ('s1', 's2')"
+    )
+    since, until = datetime(2024, 1, 1, 3), datetime(2024, 1, 1, 8)
+    assert _walk(conn, published_from=since, published_to=until, run_id="r1") == _expected(
+        conn, "published_at >= ? AND published_at < ? AND run_id = 'r1'", [since, until]
+    )
+
+    with pytest.raises(ValueError):
+        queries.get_items_page(conn, cursor="not-a-cursor")
+    conn.close()
+
+
+def test_items_api_paginates(monkeypatch, tmp_path: Path):
+    db_path = tmp_path / "web.duckdb"
+    monkeypatch.setenv("APP_SESSION_SECRET", "test-secret")
+    monkeypatch.setenv("APP_VIEWER_USER", "viewer")
+    monkeypatch.setenv("APP_VIEWER_PASS", "viewerpass")
+    monkeypatch.setenv("APP_DB_PATH", str(db_path))
+    init_db(db_path=db_path)
+    conn = duckdb.connect(str(db_path))
+    _seed(conn, count=5)
+    conn.close()
+
+    import src.app.auth.deps as deps
+
+    deps.get_session_manager.cache_clear()
+    import src.app.main as main
+
+    importlib.reload(main)
+    with TestClient(main.app) as client:
+        main.app.state.database.run_lock_path = tmp_path / "run.lock"
+        assert client.get("/api/items").status_code == 401
+        client.post("/login", data={"username": "viewer", "password": "viewerpass"})
+
+        first = client.get("/api/items", params={"limit": 3}).json()
+        assert len(first["items"]) == 3
+        second = client.get(
+            "/api/items", params={"limit": 3, "cursor": first["next_cursor"]}
+        ).json()
+        assert len(second["items"]) == 2
+        assert second["next_cursor"] is None
+
+        bad = client.get("/api/items", params={"cursor": "%%%"})
+        assert bad.status_code == 400
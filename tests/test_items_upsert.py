@@ -0,0 +1,70 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+import duckdb
+
+from src.storage.items import upsert_items
+from src.storage.migrate import apply_schema
+
+
+def _apply_schema(conn):
+    schema_path = Path(__file__).resolve().parents[1] / "src" / "storage" / "schema.sql"
+    apply_schema(conn, schema_path)
+
+
+def _item(url: str, title: str) -> dict:
+    now = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    return {
+        "source_id": "s1",
+        "source_name": "Source A",
+        "category": "jp",
+        "kind": "rss",
+        "title": title,
+        "summary": f"{title} summary",
+        "url": url,
+        "published_at": now,
+        "fetched_at": now,
+    }
+
+
+def test_bulk_upsert_inserts_then_updates_latest_row():
+    conn = duckdb.connect(":memory:")
+    conn.execute("SET TimeZone = 'UTC'")
+    _apply_schema(conn)
+
+    stats = upsert_items(conn, "r1", [_item("https://a", "A"), _item("https://b", "B")])
+    assert stats == {"inserted": 2, "updated": 0, "unchanged": 0}
+    stats = upsert_items(conn, "r2", [_item("https://b", "B2"), _item("https://c", "C")])
+    assert stats == {"inserted": 1, "updated": 1, "unchanged": 0}
+    assert upsert_items(conn, "r3", []) == {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    rows = conn.execute(
+        "SELECT run_id, url, title, published_at FROM items ORDER BY url"
+    ).fetchall()
+    assert rows == [
+        ("r1", "https://a", "A", datetime(2024, 1, 2)),
+        ("r2", "https://b", "B2", datetime(2024, 1, 2)),
+        ("r2", "https://c", "C", datetime(2024, 1, 2)),
+    ]
+    staged = conn.execute("SELECT COUNT(*) FROM _items_stage").fetchone()[0]
+    assert staged == 0
+
+
+def test_unchanged_items_only_move_to_the_new_run():
+    conn = duckdb.connect(":memory:")
+    conn.execute("SET TimeZone = 'UTC'")
+    _apply_schema(conn)
+
+    upsert_items(conn, "r1", [_item("https://a", "A"), _item("https://b", "B")])
+    refetched = [{**_item("https://a", "A"), "fetched_at": datetime(2024, 1, 3)}]
+    refetched.append(_item("https://b", "B edited"))
+    assert upsert_items(conn, "r2", refetched) == {"inserted": 0, "updated": 1, "unchanged": 1}
+
+    rows = conn.execute("SELECT run_id, url, title, fetched_at FROM items ORDER BY url").fetchall()
+    assert rows == [
+        ("r2", "https://a", "A", datetime(2024, 1, 2)),
+        ("r2", "https://b", "B edited", datetime(2024, 1, 2)),
+    ]
+    # The search index follows the edit.
+    titles = conn.execute("SELECT title FROM search_doc ORDER BY url").fetchall()
+    assert titles == [("A",), ("B edited",)]
@@ -0,0 +1,141 @@
+from datetime import datetime
+from pathlib import Path
+
+import duckdb
+
+from src.core.minhash import band_keys, item_features, minhash, similarity
+from src.pipeline.run_manager import delete_run
+from src.storage import queries
+from src.storage.items import upsert_items
+from src.storage.migrate import init_db
+from src.storage.near_dup import cluster_run_items
+
+BOJ = "Bank of Japan holds rates steady as yen weakens"
+BOJ_SUMMARY = "The BOJ kept its policy rate unchanged on Tuesday."
+
+
+def _item(source_id: str, url: str, title: str, summary: str = "", hour: int = 0) -> dict:
+    return {
+        "source_id": source_id,
+        "source_name": source_id.upper(),
+        "category": "jp",
+        "kind": "rss",
+        "title": title,
+        "summary": summary,
+        "url": url,
+        "published_at": datetime(2024, 1, 2, hour),
+        "fetched_at": datetime(2024, 1, 2, 12),
+    }
+
+
+def _clusters(conn) -> dict:
+    rows = conn.execute("SELECT url, cluster_id FROM item_signature").fetchall()
+    ids = {url: cluster_id for url, cluster_id in rows}
+    return {url: sorted(u for u, c in ids.items() if c == cluster_id) for url, cluster_id in rows}
+
+
+def test_signatures_estimate_similarity_and_share_buckets():
+    a = minhash(item_features(BOJ, BOJ_SUMMARY))
+    b = minhash(item_features(BOJ + " further", BOJ_SUMMARY + " citing inflation"))
+    c = minhash(item_features("Toyota recalls 1 million cars", "Airbag fault in sedans"))
+    assert similarity(a, a) == 1.0
+    assert similarity(a, b) > 0.6
+    assert similarity(a, c) < 0.2
+    assert set(band_keys(a)) & set(band_keys(b))
+    assert not set(band_keys(a)) & set(band_keys(c))
+    assert minhash(item_features("", None)) is None
+
+
+def test_items_cluster_across_sources_and_runs(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    upsert_items(
+        conn,
+        "r1",
+        [
+            _item("s1", "https://a/1", BOJ, BOJ_SUMMARY, hour=1),
+            _item("s2", "https://b/1", BOJ + " further", BOJ_SUMMARY, hour=2),
+            _item("s3", "https://c/1", "日銀、金融政策の現状維持を決定 円安進む", hour=3),
+            _item("s1", "https://a/2", "", hour=4),
+        ],
+    )
+    assert cluster_run_items(conn, "r1") == {
+        "items": 4,
+        "candidates": 1,
+        "duplicates": 1,
+        "clusters": 3,
+    }
+
+    upsert_items(
+        conn,
+        "r2",
+        [
+            _item("s3", "https://c/2", "日銀、金融政策の現状維持を決定　円安が進む", hour=5),
+            _item("s4", "https://d/1", "BOJ holds rates steady as yen weakens", BOJ_SUMMARY, 6),
+            _item("s2", "https://b/1", BOJ + " further", BOJ_SUMMARY, hour=2),
+        ],
+    )
+    # Only the two new items are signed; each finds its story from the earlier run.
+    stats = cluster_run_items(conn, "r2")
+    assert stats["items"] == 2 and stats["duplicates"] == 2 and stats["clusters"] == 0
+    clusters = _clusters(conn)
+    assert clusters["https://a/1"] == ["https://a/1", "https://b/1", "https://d/1"]
+    assert clusters["https://c/1"] == ["https://c/1", "https://c/2"]
+    assert clusters["https://a/2"] == ["https://a/2"]
+    assert cluster_run_items(conn, "r2")["items"] == 0
+
+    items = queries.get_items_for_run(conn, "r2", collapse_duplicates=True)
+    assert [(i["url"], i["cluster_size"]) for i in items] == [
+        ("https://d/1", 2),
+        ("https://c/2", 1),
+    ]
+    assert len(queries.get_items_for_run(conn, "r2")) == 3
+
+    # Deleting r2 removes its items (b/1 moved to r2 on upsert) and their signatures.
+    delete_run("r2", conn=conn)
+    assert conn.execute("SELECT COUNT(*) FROM item_signature").fetchone()[0] == 3
+    orphans = conn.execute(
+        """
+        SELECT COUNT(*) FROM item_lsh_bucket
+        WHERE item_id NOT IN (SELECT item_id FROM item_signature)
+        """
+    ).fetchone()[0]
+    assert orphans == 0
+    conn.close()
+
+
+def test_edited_item_is_signed_again(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    upsert_items(
+        conn,
+        "r1",
+        [
+            _item("s1", "https://a/1", BOJ, BOJ_SUMMARY, hour=1),
+            _item("s2", "https://b/1", BOJ + " further", BOJ_SUMMARY, hour=2),
+        ],
+    )
+    cluster_run_items(conn, "r1")
+    assert _clusters(conn)["https://b/1"] == ["https://a/1", "https://b/1"]
+    item_id = conn.execute("SELECT item_id FROM item_signature WHERE url = 'https://b/1'")
+    item_id = item_id.fetchone()[0]
+
+    # The story behind b/1 was replaced; it leaves the BOJ cluster under the same id.
+    upsert_items(
+        conn,
+        "r2",
+        [_item("s2", "https://b/1", "Toyota recalls 1 million cars", "Airbag fault", hour=2)],
+    )
+    stats = cluster_run_items(conn, "r2")
+    assert stats["items"] == 1 and stats["clusters"] == 1 and stats["duplicates"] == 0
+    assert _clusters(conn)["https://b/1"] == ["https://b/1"]
+    assert conn.execute(
+        "SELECT item_id, cluster_id FROM item_signature WHERE url = 'https://b/1'"
+    ).fetchone() == (item_id, item_id)
+    buckets = conn.execute(
+        "SELECT list(bucket ORDER BY bucket) FROM item_lsh_bucket WHERE item_id = ?", [item_id]
+    ).fetchone()[0]
+    signature = minhash(item_features("Toyota recalls 1 million cars", "Airbag fault"))
+    assert buckets == sorted(band_keys(signature))
+    assert cluster_run_items(conn, "r2")["items"] == 0
+    conn.close()
@@ -0,0 +1,114 @@
+import json
+from datetime import date
+from pathlib import Path
+
+import duckdb
+
+from src.app.ingest.estat import estat_table_item, iter_estat_observations, period_start
+from src.pipeline.run_manager import delete_run
+from src.storage.indicator_series import upsert_dim_indicator_series
+from src.storage.migrate import init_db
+from src.storage.observations import (
+    get_observations,
+    spool_observations,
+    upsert_observation_files,
+    upsert_observations,
+)
+
+SOURCE = {
+    "id": "estat1",
+    "name": "eStat",
+    "category": "jp",
+    "kind": "estat_api",
+    "url": "https://api.example.com",
+    "params": {"stats_data_id": "0003"},
+}
+
+
+def _response(values: list) -> str:
+    table = {"@id": "0003", "TITLE": {"@no": "1", "$": "CPI"}}
+    data = {"STATISTICAL_DATA": {"TABLE_INF": table, "DATA_INF": {"VALUE": values}}}
+    return json.dumps({"GET_STATS_DATA": data})
+
+
+def _cell(time_code: str, value: str, area: str = "00000") -> dict:
+    return {
+        "@tab": "1",
+        "@cat01": "0001",
+        "@area": area,
+        "@time": time_code,
+        "@unit": "%",
+        "$": value,
+    }
+
+
+def test_estat_cells_become_typed_observations():
+    assert period_start("2024000303") == date(2024, 3, 1)
+    assert period_start("2024000000") == date(2024, 1, 1)
+    assert period_start("2023100000") == date(2023, 4, 1)
+    assert period_start("2024Q1") is None
+
+    body = _response([_cell("2024000202", "1,234.5"), _cell("2024000101", "-", area="13000")])
+    first, second = iter_estat_observations([body], SOURCE)
+    assert first["stats_data_id"] == "0003"
+    assert first["dimension_key"] == "area=00000;cat01=0001;tab=1"
+    assert (first["period"], first["value"], first["annotation"]) == (
+        date(2024, 2, 1),
+        1234.5,
+        None,
+    )
+    assert (second["value"], second["annotation"], second["area_code"]) == (None, "-", "13000")
+
+    item = estat_table_item(first, SOURCE)
+    assert (item["title"], item["summary"]) == ("CPI 2024000202", "1234.5")
+
+
+def test_observations_upsert_link_series_and_query_by_period(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    upsert_dim_indicator_series(conn, [{"series_key": "cpi", "resolved_id": "0003"}])
+    months = [f"2024000{m}0{m}" for m in range(1, 4)]
+    cells = [_cell(code, str(100 + i)) for i, code in enumerate(months)]
+    cells.append(_cell("2024000101", "7", area="13000"))
+    observations = list(iter_estat_observations([_response(cells)], SOURCE))
+
+    assert upsert_observations(conn, "r1", observations) == {
+        "inserted": 4,
+        "updated": 0,
+        "unchanged": 0,
+    }
+    revised = [{**o, "value": 999.0} if o["time_code"] == months[2] else o for o in observations]
+    assert upsert_observations(conn, "r2", revised) == {
+        "inserted": 0,
+        "updated": 1,
+        "unchanged": 3,
+    }
+
+    national = "area=00000;cat01=0001;tab=1"
+    rows = get_observations(conn, series_key="cpi", dimension_key=national, start=date(2024, 2, 1))
+    assert [(r["time_code"], r["value"]) for r in rows] == [(months[1], 101.0), (months[2], 999.0)]
+    assert len(get_observations(conn, stats_data_id="0003")) == 4
+
+    delete_run("r2", conn=conn)
+    assert conn.execute("SELECT COUNT(*) FROM fact_observation").fetchone()[0] == 0
+    conn.close()
+
+
+def test_spooled_observations_load_from_files(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    cells = [_cell("2024000101", "1"), _cell("2024000202", "2"), _cell("2024000101", "3")]
+    observations = iter_estat_observations([_response(cells)], SOURCE)
+    first, second = tmp_path / "first.ndjson", tmp_path / "second.ndjson"
+    assert spool_observations(observations, first) == 3
+    later = iter_estat_observations([_response([_cell("2024000202", "-")])], SOURCE)
+    assert spool_observations(later, second) == 1
+
+    stats = upsert_observation_files(conn, "r1", [first, second])
+    assert stats == {"inserted": 2, "updated": 0, "unchanged": 0}
+    rows = get_observations(conn, stats_data_id="0003")
+    assert [(r["time_code"], r["period"], r["value"], r["annotation"]) for r in rows] == [
+        ("2024000101", date(2024, 1, 1), 3.0, None),
+        ("2024000202", date(2024, 2, 1), None, "-"),
+    ]
+    conn.close()
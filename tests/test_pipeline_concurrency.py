@@ -0,0 +1,94 @@
+import importlib
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import duckdb
+import yaml
+
+from src.app.ingest.concurrency import host_of, run_bounded
+
+
+def test_run_bounded_respects_limits_and_order():
+    lock = threading.Lock()
+    active = defaultdict(int)
+    peak = defaultdict(int)
+    peak_total = {"value": 0, "active": 0}
+
+    def worker(url: str) -> str:
+        host = host_of(url)
+        with lock:
+            active[host] += 1
+            peak_total["active"] += 1
+            peak[host] = max(peak[host], active[host])
+            peak_total["value"] = max(peak_total["value"], peak_total["active"])
+        time.sleep(0.05)
+        with lock:
+            active[host] -= 1
+            peak_total["active"] -= 1
+        return url
+
+    urls = [f"https://a.example.com/{i}" for i in range(4)] + [
+        f"https://b{i}.example.com/feed" for i in range(4)
+    ]
+    results = run_bounded(urls, worker, url_of=lambda u: u, max_concurrency=3, per_host_limit=1)
+
+    assert results == urls
+    assert peak["a.example.com"] == 1
+    assert peak_total["value"] <= 3
+
+
+def test_pipeline_fetches_sources_concurrently(tmp_path: Path, monkeypatch):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    sources = {
+        "fetch": {"max_concurrency": 4, "per_host_limit": 4},
+        "sources": [
+            {
+                "id": f"rss{i}",
+                "name": f"RSS {i}",
+                "category": "jp",
+                "kind": "rss",
+                "url": f"https://feed{i}.example.com/rss",
+                "enabled": True,
+            }
+            for i in range(4)
+        ],
+    }
+    (config_dir / "sources.yml").write_text(yaml.safe_dump(sources), encoding="utf-8")
+    rss_text = Path("tests/fixtures/rss_sample.xml").read_text(encoding="utf-8")
+
+    def slow_fetch(url: str, allowed_urls):
+        time.sleep(0.3)
+        if "feed3" in url:
+            raise RuntimeError("boom")
+        return rss_text
+
+    db_path = tmp_path / "app.duckdb"
+    monkeypatch.setenv("APP_DB_PATH", str(db_path))
+    monkeypatch.setenv("APP_OUTPUT_ROOT", str(tmp_path / "output/runs"))
+    monkeypatch.setenv("RUN_ID", "run-concurrent")
+
+    import src.app.pipeline as pipeline
+
+    importlib.reload(pipeline)
+
+    started = time.perf_counter()
+    run_id, _ = pipeline.run_pipeline(config_dir=config_dir, mode="manual", fetcher=slow_fetch)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0
+
+    conn = duckdb.connect(str(db_path))
+    rows = conn.execute(
+        "SELECT source_id, status FROM fact_source_run WHERE run_id = ? ORDER BY source_id",
+        [run_id],
+    ).fetchall()
+    assert rows == [
+        ("rss0", "success"),
+        ("rss1", "success"),
+        ("rss2", "success"),
+        ("rss3", "failed"),
+    ]
+    conn.close()
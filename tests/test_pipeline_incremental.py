@@ -0,0 +1,117 @@
+import importlib
+import json
+from pathlib import Path
+
+import duckdb
+import yaml
+
+from src.app.pipeline import _take_new_items
+
+
+def _rss(*links: str) -> str:
+    items = "".join(
+        f"<item><title>{link}</title><link>https://example.com/{link}</link></item>"
+        for link in links
+    )
+    return f"<rss><channel>{items}</channel></rss>"
+
+
+def test_take_new_items_stops_after_consecutive_known():
+    parsed = iter([{"url": url} for url in ["n1", "k1", "n2", "k2", "k3", "never-read"]])
+    new_items, known = _take_new_items(parsed, {"k1", "k2", "k3", "never-read"}, 2)
+    assert [i["url"] for i in new_items] == ["n1", "n2"]
+    assert known == ["k1", "k2", "k3"]
+    assert next(parsed)["url"] == "never-read"
+
+
+def test_incremental_run_reports_new_and_known(tmp_path: Path, monkeypatch):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    sources = {
+        "fetch": {"incremental": True, "stop_after_known": 1},
+        "sources": [
+            {
+                "id": "rss1",
+                "name": "RSS Source",
+                "category": "jp",
+                "kind": "rss",
+                "url": "https://example.com/rss",
+                "enabled": True,
+            }
+        ],
+    }
+    (config_dir / "sources.yml").write_text(yaml.safe_dump(sources), encoding="utf-8")
+    feeds = {"run-1": _rss("b", "a"), "run-2": _rss("c", "b", "a")}
+    current = {"run": "run-1"}
+
+    def fake_fetch(url: str, allowed_urls):
+        return feeds[current["run"]]
+
+    db_path = tmp_path / "app.duckdb"
+    monkeypatch.setenv("APP_DB_PATH", str(db_path))
+    monkeypatch.setenv("APP_OUTPUT_ROOT", str(tmp_path / "output/runs"))
+
+    import src.app.pipeline as pipeline
+
+    importlib.reload(pipeline)
+
+    pipeline.run_pipeline(config_dir=config_dir, fetcher=fake_fetch, run_id="run-1")
+    current["run"] = "run-2"
+    _, output_dir = pipeline.run_pipeline(config_dir=config_dir, fetcher=fake_fetch, run_id="run-2")
+
+    stats = json.loads((output_dir / "run_stats.json").read_text(encoding="utf-8"))
+    assert stats["sources"]["rss1"]["new"] == 1
+    assert stats["sources"]["rss1"]["known"] == 1
+    assert stats["sources"]["rss1"]["count"] == 2
+    assert stats["item_count"] == 2
+
+    # Only the known item read before the early stop is carried; ``a`` stays with run-1.
+    conn = duckdb.connect(str(db_path))
+    urls = conn.execute("SELECT url FROM items WHERE run_id = 'run-2' ORDER BY url").fetchall()
+    assert [u[0] for u in urls] == ["https://example.com/b", "https://example.com/c"]
+    run_count = conn.execute("SELECT item_count FROM runs WHERE run_id = 'run-2'").fetchone()
+    assert run_count[0] == 2
+    conn.close()
+
+
+def test_sliding_feed_does_not_accumulate_dropped_items(tmp_path: Path, monkeypatch):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    sources = {
+        "fetch": {"incremental": True, "stop_after_known": 3},
+        "sources": [
+            {
+                "id": "rss1",
+                "name": "RSS Source",
+                "category": "jp",
+                "kind": "rss",
+                "url": "https://example.com/rss",
+                "enabled": True,
+            }
+        ],
+    }
+    (config_dir / "sources.yml").write_text(yaml.safe_dump(sources), encoding="utf-8")
+    current = {"newest": 10}
+
+    def fake_fetch(url: str, allowed_urls):
+        # Ten entries, newest first; each run one new entry pushes the oldest out.
+        newest = current["newest"]
+        return _rss(*(f"e{n}" for n in range(newest, newest - 10, -1)))
+
+    monkeypatch.setenv("APP_DB_PATH", str(tmp_path / "app.duckdb"))
+    monkeypatch.setenv("APP_OUTPUT_ROOT", str(tmp_path / "output/runs"))
+
+    import src.app.pipeline as pipeline
+
+    importlib.reload(pipeline)
+
+    counts = []
+    for run in range(5):
+        current["newest"] = 10 + run
+        _, output_dir = pipeline.run_pipeline(
+            config_dir=config_dir, fetcher=fake_fetch, run_id=f"run-{run}"
+        )
+        stats = json.loads((output_dir / "run_stats.json").read_text(encoding="utf-8"))
+        counts.append(stats["item_count"])
+    # The first run stores the whole feed; later ones one new entry plus the three known.
+    assert counts == [10, 4, 4, 4, 4]
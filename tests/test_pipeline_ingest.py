@@ -1,4 +1,5 @@
 import importlib
+import tempfile
 from pathlib import Path
 
 import duckdb
@@ -45,6 +46,9 @@ def test_pipeline_ingests_and_exports(tmp_path: Path, monkeypatch):
     monkeypatch.setenv("APP_DB_PATH", str(db_path))
     monkeypatch.setenv("APP_OUTPUT_ROOT", str(tmp_path / "output/runs"))
     monkeypatch.setenv("RUN_ID", "test-run-123")
+    spool_dir = tmp_path / "spool"
+    spool_dir.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(spool_dir))
 
     import src.app.pipeline as pipeline
 
@@ -60,6 +64,18 @@ def test_pipeline_ingests_and_exports(tmp_path: Path, monkeypatch):
     conn = duckdb.connect(str(db_path))
     item_count = conn.execute("SELECT COUNT(*) FROM items WHERE run_id = ?", [run_id]).fetchone()[0]
     assert item_count >= 2
+    observations = conn.execute(
+        """
+        SELECT stats_data_id, time_code, value, run_id
+        FROM fact_observation ORDER BY time_code
+        """
+    ).fetchall()
+    assert observations == [
+        ("123", "2023Q4", 124500000.0, run_id),
+        ("123", "2024Q1", 125000000.0, run_id),
+    ]
+    # e-Stat cells were spooled to a temp file, which is gone after the run.
+    assert list(spool_dir.iterdir()) == []
 
     fact_run = conn.execute(
         "SELECT run_id, started_at, ended_at, status FROM fact_run WHERE run_id = ?", [run_id]
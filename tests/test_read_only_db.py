@@ -0,0 +1,65 @@
+import os
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from src.storage.db import DatabaseUnavailableError, ReadOnlyDatabase
+
+
+def _make_db(path: Path, value: int) -> None:
+    conn = duckdb.connect(str(path))
+    conn.execute("CREATE OR REPLACE TABLE t AS SELECT ? AS v", [value])
+    conn.close()
+
+
+def test_cursor_shares_one_connection_and_reopens_on_swap(tmp_path: Path):
+    db_path = tmp_path / "app.duckdb"
+    _make_db(db_path, 1)
+    database = ReadOnlyDatabase(db_path, threads=2, run_lock_path=tmp_path / "run.lock")
+
+    with database.cursor() as cur:
+        assert cur.execute("SELECT v FROM t").fetchone() == (1,)
+        assert cur.execute("SELECT current_setting('threads')").fetchone() == (2,)
+        first = database._current
+    with database.cursor() as cur:
+        cur.execute("SELECT 1")
+    assert database._current is first
+
+    # The pipeline writes a new file and renames it over the old one.
+    staged = tmp_path / "staged.duckdb"
+    _make_db(staged, 2)
+    os.replace(staged, db_path)
+    with database.cursor() as cur:
+        assert cur.execute("SELECT v FROM t").fetchone() == (2,)
+    assert database._current is not first
+    database.close()
+
+
+def test_run_lock_releases_connection_for_writer(tmp_path: Path):
+    db_path = tmp_path / "app.duckdb"
+    lock_path = tmp_path / "run.lock"
+    _make_db(db_path, 1)
+    database = ReadOnlyDatabase(db_path, run_lock_path=lock_path, idle_release_seconds=60)
+
+    with database.cursor() as cur:
+        cur.execute("SELECT 1")
+    assert database.release_if_idle() is False
+
+    lock_path.write_text("now", encoding="utf-8")
+    assert database.release_if_idle() is True
+    with pytest.raises(DatabaseUnavailableError):
+        with database.cursor():
+            pass
+
+    lock_path.unlink()
+    with database.cursor() as cur:
+        assert cur.execute("SELECT v FROM t").fetchone() == (1,)
+    database.close()
+
+
+def test_missing_database_is_unavailable(tmp_path: Path):
+    database = ReadOnlyDatabase(tmp_path / "missing.duckdb", run_lock_path=tmp_path / "run.lock")
+    with pytest.raises(DatabaseUnavailableError):
+        with database.cursor():
+            pass
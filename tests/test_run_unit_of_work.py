@@ -0,0 +1,94 @@
+from datetime import datetime, timezone
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from src.pipeline import run_manager
+from src.pipeline.run_manager import (
+    RunUnitOfWork,
+    add_run_finished_listener,
+    create_run,
+    finish_run,
+)
+from src.storage.migrate import init_db
+
+
+def _count(conn, table: str) -> int:
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_unit_of_work_flushes_on_commit(tmp_path: Path):
+    db_path = tmp_path / "app.duckdb"
+    init_db(db_path=db_path)
+    conn = duckdb.connect(str(db_path))
+    reader = conn.cursor()
+
+    run_id, _ = create_run("test", conn=conn, run_id="run-uow")
+    assert reader.execute("SELECT status FROM fact_run").fetchall() == [("running",)]
+
+    now = datetime.now(timezone.utc)
+    uow = RunUnitOfWork(run_id, conn)
+    with uow.transaction():
+        uow.record_source_run("s1", now, now, "success", 3)
+        uow.record_source_run("s2", now, now, "failed", 0, error_class="FetchError")
+        uow.record_series_resolution("k1", "passthrough", "v", "v", "resolved", None)
+        assert _count(conn, "fact_source_run") == 0
+        assert _count(reader, "dim_series_resolution") == 0
+
+    rows = reader.execute(
+        "SELECT source_id, status, item_count FROM fact_source_run ORDER BY source_id"
+    ).fetchall()
+    assert rows == [("s1", "success", 3), ("s2", "failed", 0)]
+    assert _count(reader, "dim_series_resolution") == 1
+    conn.close()
+
+
+def test_unit_of_work_rolls_back_on_error(tmp_path: Path):
+    db_path = tmp_path / "app.duckdb"
+    init_db(db_path=db_path)
+    conn = duckdb.connect(str(db_path))
+    run_id, _ = create_run("test", conn=conn, run_id="run-uow")
+
+    now = datetime.now(timezone.utc)
+    uow = RunUnitOfWork(run_id, conn)
+    with pytest.raises(RuntimeError):
+        with uow.transaction():
+            uow.record_source_run("s1", now, now, "success", 1)
+            conn.execute("UPDATE fact_run SET status = 'success'")
+            raise RuntimeError("boom")
+
+    assert _count(conn, "fact_source_run") == 0
+    assert conn.execute("SELECT status FROM fact_run").fetchall() == [("running",)]
+    conn.close()
+
+
+def test_finish_run_notifies_listeners_after_the_unit_of_work_commits(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(run_manager, "_run_finished_listeners", [])
+    db_path = tmp_path / "app.duckdb"
+    init_db(db_path=db_path)
+    conn = duckdb.connect(str(db_path))
+    reader = conn.cursor()
+    seen = []
+
+    def listener(run_id: str, status: str) -> None:
+        # Listeners (the web cache) must observe the committed run.
+        row = reader.execute("SELECT status FROM fact_run WHERE run_id = ?", [run_id]).fetchone()
+        seen.append((run_id, status, row[0]))
+
+    add_run_finished_listener(listener)
+    run_id, _ = create_run("test", conn=conn, run_id="run-ok")
+    uow = RunUnitOfWork(run_id, conn)
+    with uow.transaction():
+        finish_run(run_id, "success", uow=uow)
+        assert seen == []
+    assert seen == [("run-ok", "success", "success")]
+
+    run_id, _ = create_run("test", conn=conn, run_id="run-rolled-back")
+    uow = RunUnitOfWork(run_id, conn)
+    with pytest.raises(RuntimeError):
+        with uow.transaction():
+            finish_run(run_id, "success", uow=uow)
+            raise RuntimeError("boom")
+    assert seen == [("run-ok", "success", "success")]
+    conn.close()
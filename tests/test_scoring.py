@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from src.core.config_schema import ScoringConfig
+from src.storage import queries
+from src.storage.items import upsert_items
+from src.storage.migrate import init_db
+from src.storage.scoring import score_run_items
+
+FETCHED = datetime(2024, 1, 3)
+
+
+def _item(url: str, title: str, hours_old=None, category: str = "jp", source_id: str = "s1"):
+    return {
+        "source_id": source_id,
+        "source_name": source_id.upper(),
+        "category": category,
+        "kind": "rss",
+        "title": title,
+        "summary": "",
+        "url": url,
+        "published_at": FETCHED - timedelta(hours=hours_old) if hours_old is not None else None,
+        "fetched_at": FETCHED,
+    }
+
+
+def test_scores_follow_rules_and_order_items(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    upsert_items(
+        conn,
+        "r1",
+        [
+            _item("https://a", "Rate hike expected", hours_old=0),
+            _item("https://b", "Weather", hours_old=24, category="us"),
+            _item("https://c", "Yen and rate outlook", hours_old=48, source_id="s2"),
+            _item("https://d", "Undated", hours_old=None, category="us"),
+        ],
+    )
+    conn.execute(
+        """
+        INSERT INTO fact_item_match (run_id, source_id, url, entity, hit_count)
+        VALUES ('r1', 's2', 'https://c', 'Yen', 1), ('r1', 's2', 'https://c', 'BOJ', 2)
+        """
+    )
+    config = ScoringConfig(
+        default_score=0.5,
+        rules=[
+            {"name": "fresh", "feature": "recency", "weight": 2.0, "half_life_hours": 24},
+            {"name": "jp", "feature": "category", "values": ["jp"]},
+            {"name": "watch", "feature": "watchlist", "weight": 0.25},
+            {"name": "terms", "feature": "keyword", "values": ["RATE", "yen"], "weight": 4},
+            {"name": "s2", "feature": "source", "values": ["s2"], "weight": -1},
+        ],
+    )
+    assert score_run_items(conn, "r1", config, as_of=FETCHED) == {"items": 4, "rules": 5}
+
+    scores = dict(conn.execute("SELECT url, score FROM fact_item_score").fetchall())
+    assert scores["https://a"] == pytest.approx(0.5 + 2.0 + 1 + 4 * 0.5)
+    assert scores["https://b"] == pytest.approx(0.5 + 2.0 * 0.5)
+    assert scores["https://c"] == pytest.approx(0.5 + 2.0 * 0.25 + 1 + 0.25 * 2 + 4 - 1)
+    assert scores["https://d"] == pytest.approx(0.5)
+
+    ranked = queries.get_items_for_run(conn, "r1", order_by="score")
+    assert [item["url"] for item in ranked] == ["https://a", "https://c", "https://b", "https://d"]
+    assert ranked[0]["score"] == pytest.approx(5.5)
+    newest = queries.get_items_for_run(conn, "r1")
+    assert [item["url"] for item in newest] == ["https://a", "https://b", "https://c", "https://d"]
+    with pytest.raises(ValueError):
+        queries.get_items_for_run(conn, "r1", order_by="title")
+
+    # Re-scoring replaces the run's rows.
+    score_run_items(conn, "r1", ScoringConfig(default_score=1.0), as_of=FETCHED)
+    assert conn.execute("SELECT COUNT(*), MIN(score) FROM fact_item_score").fetchone() == (4, 1.0)
+    conn.close()
+
+
+def test_unchanged_item_decays_in_later_runs(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    config = ScoringConfig(
+        rules=[{"name": "fresh", "feature": "recency", "weight": 1.0, "half_life_hours": 24}]
+    )
+    item = _item("https://a", "Rate hike expected", hours_old=0)
+    upsert_items(conn, "r1", [item])
+    score_run_items(conn, "r1", config, as_of=FETCHED)
+
+    # The next day's run sees the same content; the stored row keeps its first fetched_at.
+    later = FETCHED + timedelta(hours=24)
+    assert upsert_items(conn, "r2", [{**item, "fetched_at": later}])["unchanged"] == 1
+    score_run_items(conn, "r2", config, as_of=later)
+
+    scores = dict(conn.execute("SELECT run_id, score FROM fact_item_score").fetchall())
+    assert scores["r1"] == pytest.approx(1.0)
+    assert scores["r2"] == pytest.approx(0.5)
+    conn.close()
+
+
+def test_recency_uses_one_time_base_outside_utc(tmp_path: Path):
+    init_db(db_path=tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    conn.execute("SET TimeZone = 'Asia/Tokyo'")
+    config = ScoringConfig(
+        rules=[{"name": "fresh", "feature": "recency", "weight": 1.0, "half_life_hours": 24}]
+    )
+    run_start = datetime(2024, 1, 3, 12, tzinfo=timezone.utc)
+    upsert_items(
+        conn,
+        "r1",
+        [
+            {
+                **_item("https://a", "Nine hours old"),
+                "published_at": run_start - timedelta(hours=9),
+            },
+            {**_item("https://b", "A day old"), "published_at": run_start - timedelta(hours=24)},
+        ],
+    )
+    score_run_items(conn, "r1", config, as_of=run_start)
+
+    scores = dict(conn.execute("SELECT url, score FROM fact_item_score").fetchall())
+    assert scores["https://a"] == pytest.approx(0.5 ** (9 / 24))
+    assert scores["https://b"] == pytest.approx(0.5)
+    conn.close()
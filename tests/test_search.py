@@ -0,0 +1,97 @@
+import importlib
+from datetime import datetime
+from pathlib import Path
+
+import duckdb
+from fastapi.testclient import TestClient
+
+from src.core.text_search import highlight, query_terms, tokenize
+from src.pipeline.run_manager import delete_run
+from src.storage.items import upsert_items
+from src.storage.migrate import init_db
+from src.storage.search import rebuild_search_index, search_items
+
+
+def _item(url: str, title: str, summary: str = "") -> dict:
+    return {
+        "source_id": "s1",
+        "source_name": "Source A",
+        "category": "jp",
+        "kind": "rss",
+        "title": title,
+        "summary": summary,
+        "url": url,
+        "published_at": datetime(2024, 1, 2),
+        "fetched_at": datetime(2024, 1, 2),
+    }
+
+
+def test_tokenize_and_highlight():
+    assert tokenize("日本銀行、ＧＤＰ Growth") == ["日本", "本銀", "銀行", "gdp", "growth"]
+    assert query_terms("rate Rate 金") == ["rate", "金"]
+    marked = highlight("<b>Rates</b> and rate cuts", ["rate"])
+    assert str(marked) == "&lt;b&gt;Rates&lt;/b&gt; and <mark>rate</mark> cuts"
+    assert (
+        str(highlight("日本銀行が利上げ", query_terms("日本銀行")))
+        == "<mark>日本銀行</mark>が利上げ"
+    )
+
+
+def test_index_follows_item_upserts(tmp_path: Path):
+    db_path = tmp_path / "app.duckdb"
+    init_db(db_path=db_path)
+    conn = duckdb.connect(str(db_path))
+
+    upsert_items(
+        conn,
+        "r1",
+        [
+            _item("https://a", "Bank of Japan holds rates", "The central bank kept rates."),
+            _item("https://b", "Exports rise", "Rates were not discussed; exports and rates."),
+            _item("https://c", "日本銀行が金利据え置き", "金融政策決定会合"),
+        ],
+    )
+    hits = search_items(conn, query_terms("rates"))
+    assert [h["url"] for h in hits] == ["https://a", "https://b"]
+    assert search_items(conn, query_terms("bank rates"))[0]["url"] == "https://a"
+    assert [h["url"] for h in search_items(conn, query_terms("日本銀行"))] == ["https://c"]
+    assert search_items(conn, query_terms("rates unknownword")) == []
+
+    # Updating an item replaces its postings.
+    upsert_items(conn, "r2", [_item("https://a", "Bank of Japan raises yields")])
+    assert [h["url"] for h in search_items(conn, query_terms("rates"))] == ["https://b"]
+    assert search_items(conn, query_terms("yields"))[0]["title"] == "Bank of Japan raises yields"
+
+    before = search_items(conn, query_terms("bank"))
+    rebuild_search_index(conn)
+    assert search_items(conn, query_terms("bank")) == before
+
+    delete_run("r2", conn=conn)
+    assert search_items(conn, query_terms("yields")) == []
+    conn.close()
+
+
+def test_search_route_renders_highlights(monkeypatch, tmp_path: Path):
+    db_path = tmp_path / "web.duckdb"
+    monkeypatch.setenv("APP_SESSION_SECRET", "test-secret")
+    monkeypatch.setenv("APP_VIEWER_USER", "viewer")
+    monkeypatch.setenv("APP_VIEWER_PASS", "viewerpass")
+    monkeypatch.setenv("APP_DB_PATH", str(db_path))
+    init_db(db_path=db_path)
+    conn = duckdb.connect(str(db_path))
+    upsert_items(conn, "r1", [_item("https://a", "Bank of Japan holds rates", "Rates unchanged")])
+    conn.close()
+
+    import src.app.auth.deps as deps
+
+    deps.get_session_manager.cache_clear()
+    import src.app.main as main
+
+    importlib.reload(main)
+    with TestClient(main.app) as client:
+        main.app.state.database.run_lock_path = tmp_path / "run.lock"
+        client.post("/login", data={"username": "viewer", "password": "viewerpass"})
+        response = client.get("/search", params={"q": "rates"})
+    assert response.status_code == 200
+    assert "Bank of Japan holds <mark>rates</mark>" in response.text
+    assert "1 result for" in response.text
@@ -0,0 +1,118 @@
+import importlib
+import math
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.downsample import lttb
+from src.storage.indicator_series import upsert_dim_indicator_series
+from src.storage.migrate import init_db
+from src.storage.observations import get_series, upsert_observations
+
+
+def _observations(months: int) -> list[dict]:
+    rows = []
+    for i in range(months):
+        year, month = 2000 + i // 12, i % 12 + 1
+        for area, scale in (("00000", 1.0), ("13000", 0.1)):
+            rows.append(
+                {
+                    "source_id": "estat1",
+                    "stats_data_id": "0003",
+                    "series_key": None,
+                    "dimension_key": f"area={area};tab=1",
+                    "area_code": area,
+                    "time_code": f"{year}00{month:02d}{month:02d}",
+                    "period": date(year, month, 1),
+                    "value": scale * (100 + i + (50 if i == 37 else 0)),
+                    "annotation": None,
+                    "unit": "index",
+                }
+            )
+    return rows
+
+
+def _seed(db_path: Path, months: int = 120) -> None:
+    init_db(db_path=db_path)
+    conn = duckdb.connect(str(db_path))
+    upsert_dim_indicator_series(conn, [{"series_key": "cpi", "resolved_id": "0003"}])
+    upsert_observations(conn, "r1", _observations(months))
+    conn.close()
+
+
+def test_lttb_keeps_ends_and_spikes():
+    xs = list(range(1000))
+    ys = [math.sin(x / 50) for x in xs]
+    ys[500] = 10.0
+    kept = lttb(xs, ys, 50)
+    assert len(kept) == 50 and kept[0] == 0 and kept[-1] == 999
+    assert kept == sorted(kept) and 500 in kept
+    assert lttb(xs[:10], ys[:10], 50) == list(range(10))
+    with pytest.raises(ValueError):
+        lttb(xs, ys, 2)
+
+
+def test_series_are_bucketed_or_downsampled(tmp_path: Path):
+    _seed(tmp_path / "app.duckdb")
+    conn = duckdb.connect(str(tmp_path / "app.duckdb"))
+    national = "area=00000;tab=1"
+
+    (yearly,) = get_series(conn, ["cpi"], dimension_key=national, method="max", bucket="year")
+    assert yearly["raw_count"] == 120 and len(yearly["points"]) == 10
+    assert yearly["points"][3] == (date(2003, 1, 1), 187.0)
+    last = get_series(
+        conn,
+        ["cpi"],
+        start=date(2001, 1, 1),
+        end=date(2001, 12, 1),
+        method="last",
+        bucket="quarter",
+    )
+    assert [line["dimension_key"] for line in last] == [national, "area=13000;tab=1"]
+    assert last[0]["points"] == [
+        (date(2001, 1, 1), 114.0),
+        (date(2001, 4, 1), 117.0),
+        (date(2001, 7, 1), 120.0),
+        (date(2001, 10, 1), 123.0),
+    ]
+
+    (chart,) = get_series(conn, ["cpi"], dimension_key=national, points=20)
+    assert len(chart["points"]) == 20 and (date(2003, 2, 1), 187.0) in chart["points"]
+    assert get_series(conn, ["unknown"]) == []
+    with pytest.raises(ValueError):
+        get_series(conn, ["cpi"], method="median")
+    conn.close()
+
+
+def test_series_api(monkeypatch, tmp_path: Path):
+    db_path = tmp_path / "web.duckdb"
+    monkeypatch.setenv("APP_SESSION_SECRET", "test-secret")
+    monkeypatch.setenv("APP_VIEWER_USER", "viewer")
+    monkeypatch.setenv("APP_VIEWER_PASS", "viewerpass")
+    monkeypatch.setenv("APP_DB_PATH", str(db_path))
+    _seed(db_path)
+
+    import src.app.auth.deps as deps
+
+    deps.get_session_manager.cache_clear()
+    import src.app.main as main
+
+    importlib.reload(main)
+    with TestClient(main.app) as client:
+        main.app.state.database.run_lock_path = tmp_path / "run.lock"
+        assert client.get("/api/series", params={"key": "cpi"}).status_code == 401
+        client.post("/login", data={"username": "viewer", "password": "viewerpass"})
+
+        body = client.get(
+            "/api/series",
+            params={"key": ["cpi", "gdp"], "from": "2005-01-01", "points": 10},
+        ).json()
+        assert body["missing"] == ["gdp"]
+        assert [len(line["points"]) for line in body["series"]] == [10, 10]
+        assert body["series"][0]["points"][0] == ["2005-01-01", 160.0]
+
+        assert client.get("/api/series", params={"key": "cpi", "method": "x"}).status_code == 400
+        assert client.get("/api/series").status_code == 422
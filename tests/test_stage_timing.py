@@ -0,0 +1,100 @@
+import importlib
+import json
+import pstats
+import threading
+from pathlib import Path
+
+import duckdb
+import pytest
+import yaml
+
+from src.core.timing import RunProfiler, StageTimer
+from src.storage.run_stages import get_run_stages
+
+
+def test_timer_records_spans_from_threads_and_failures():
+    timer = StageTimer()
+
+    def fetch(source_id: str) -> None:
+        with timer.span("fetch", source_id=source_id) as span:
+            span["bytes"] = 10
+            span["items"] = 2
+
+    threads = [threading.Thread(target=fetch, args=(f"s{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    with pytest.raises(RuntimeError):
+        with timer.span("export"):
+            raise RuntimeError("disk full")
+
+    spans = timer.spans()
+    assert sorted(s["source_id"] for s in spans if s["stage"] == "fetch") == [
+        "s0",
+        "s1",
+        "s2",
+        "s3",
+    ]
+    assert spans[-1]["stage"] == "export" and spans[-1]["bytes"] is None
+    assert all(s["wall_ms"] >= 0 and s["cpu_ms"] >= 0 for s in spans)
+    assert RunProfiler("").enabled is False
+
+
+def test_pipeline_reports_stages_and_writes_profile(tmp_path: Path, monkeypatch):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    sources = {
+        "sources": [
+            {
+                "id": "rss1",
+                "name": "RSS Source",
+                "category": "jp",
+                "kind": "rss",
+                "url": "https://example.com/rss",
+                "enabled": True,
+            }
+        ]
+    }
+    (config_dir / "sources.yml").write_text(yaml.safe_dump(sources), encoding="utf-8")
+    rss_text = Path("tests/fixtures/rss_sample.xml").read_text(encoding="utf-8")
+
+    db_path = tmp_path / "app.duckdb"
+    monkeypatch.setenv("APP_DB_PATH", str(db_path))
+    monkeypatch.setenv("APP_OUTPUT_ROOT", str(tmp_path / "output/runs"))
+    monkeypatch.setenv("APP_PROFILE", "cprofile")
+    monkeypatch.setenv("RUN_ID", "run-1")
+
+    import src.app.pipeline as pipeline
+
+    importlib.reload(pipeline)
+    run_id, output_dir = pipeline.run_pipeline(
+        config_dir=config_dir, fetcher=lambda url, allowed: rss_text
+    )
+
+    stats = json.loads((output_dir / "run_stats.json").read_text(encoding="utf-8"))
+    stages = {stage["stage"]: stage for stage in stats["stages"]}
+    assert {
+        "config_load",
+        "series_resolve",
+        "fetch",
+        "fetch_all",
+        "dedupe",
+        "db_upsert",
+        "export",
+        "persist",
+    } <= set(stages)
+    fetch = stages["fetch"]
+    assert fetch["source_id"] == "rss1"
+    assert fetch["bytes"] == len(rss_text.encode("utf-8"))
+    assert fetch["items"] == 2
+    assert stages["db_upsert"]["items"] == 2
+
+    assert stats["profile"] == "profile.pstats"
+    assert pstats.Stats(str(output_dir / "profile.pstats")).total_calls > 0
+
+    conn = duckdb.connect(str(db_path))
+    stored = get_run_stages(conn, run_id)
+    conn.close()
+    assert len(stored) == len(stats["stages"])
+    assert {row["stage"] for row in stored} == set(stages)
@@ -0,0 +1,115 @@
+import importlib
+import json
+import re
+from pathlib import Path
+
+import duckdb
+import yaml
+
+from src.core.aho_corasick import AhoCorasick
+from src.core.config_schema import WatchEntity
+from src.core.watchlist import WatchlistMatcher
+
+
+def test_automaton_finds_overlapping_patterns():
+    automaton = AhoCorasick([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+    assert sorted(automaton.iter_matches("ushers")) == [(1, 4, 2), (2, 4, 1), (2, 6, 4)]
+    longest = AhoCorasick([("york", "york"), ("new york city", "nyc")])
+    assert longest.longest_matches("in new york city today") == [(3, 16, "nyc")]
+
+
+def test_matcher_agrees_with_per_entity_regex_scan():
+    names = [f"Company {i}" for i in range(2000)] + ["AI", "Bank of Japan"]
+    entities = [WatchEntity(name=name) for name in [*names, "日本銀行"]]
+    entities.append(WatchEntity(name="Fed", aliases=["Federal Reserve", "ＦＲＢ"]))
+    matcher = WatchlistMatcher(entities)
+    text = "The Federal Reserve and frb said AI; Company 12 beat Company 120. 日本銀行は据え置き"
+
+    found = sorted({entity for _, _, entity in matcher.find(text)})
+    expected = sorted(
+        name
+        for name in names
+        if re.search(rf"(?<!\w){re.escape(name.lower())}(?!\w)", text.lower())
+    )
+    # CJK names have no word boundaries to respect.
+    assert found == sorted(expected + ["Fed", "日本銀行"])
+    assert "Company 1" not in found
+    assert [text[s:e] for s, e, entity in matcher.find(text) if entity == "Fed"] == [
+        "Federal Reserve",
+        "frb",
+    ]
+
+
+def test_match_item_rows():
+    matcher = WatchlistMatcher([WatchEntity(name="Toyota")])
+    rows = matcher.match_item(
+        {
+            "source_id": "s1",
+            "url": "https://a",
+            "title": "TOYOTA recalls cars",
+            "summary": "Toyota said... toyota shares fell",
+        }
+    )
+    assert rows == [
+        {
+            "source_id": "s1",
+            "url": "https://a",
+            "entity": "Toyota",
+            "field": "title",
+            "matched_text": "TOYOTA",
+            "position": 0,
+            "hit_count": 3,
+        }
+    ]
+
+
+def test_pipeline_records_watchlist_matches(tmp_path: Path, monkeypatch):
+    config_dir = tmp_path / "config"
+    config_dir.mkdir()
+    sources = {
+        "sources": [
+            {
+                "id": "rss1",
+                "name": "RSS Source",
+                "category": "jp",
+                "kind": "rss",
+                "url": "https://example.com/rss",
+                "enabled": True,
+            }
+        ]
+    }
+    watchlist = {
+        "watchlist_policy": {"limit_enabled": False},
+        "matching_policy": {"match_order": "linear"},
+        "watch_entities": [{"name": "Second", "aliases": ["item two"]}, {"name": "Absent"}],
+    }
+    (config_dir / "sources.yml").write_text(yaml.safe_dump(sources), encoding="utf-8")
+    (config_dir / "watchlist.yml").write_text(yaml.safe_dump(watchlist), encoding="utf-8")
+    rss_text = Path("tests/fixtures/rss_sample.xml").read_text(encoding="utf-8")
+
+    db_path = tmp_path / "app.duckdb"
+    monkeypatch.setenv("APP_DB_PATH", str(db_path))
+    monkeypatch.setenv("APP_OUTPUT_ROOT", str(tmp_path / "output/runs"))
+    monkeypatch.setenv("RUN_ID", "run-1")
+
+    import src.app.pipeline as pipeline
+
+    importlib.reload(pipeline)
+    run_id, output_dir = pipeline.run_pipeline(
+        config_dir=config_dir, fetcher=lambda url, allowed: rss_text
+    )
+
+    conn = duckdb.connect(str(db_path))
+    rows = conn.execute(
+        "SELECT url, entity, field, matched_text, hit_count FROM fact_item_match WHERE run_id = ?",
+        [run_id],
+    ).fetchall()
+    conn.close()
+    assert rows == [("https://example.com/two", "Second", "title", "Item Two", 2)]
+    stats = json.loads((output_dir / "run_stats.json").read_text(encoding="utf-8"))
+    assert stats["watchlist"] == {
+        "entities": 2,
+        "items_scanned": 2,
+        "items_matched": 1,
+        "matches": 1,
+    }
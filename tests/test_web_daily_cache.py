@@ -0,0 +1,88 @@
+import importlib
+from datetime import datetime
+from pathlib import Path
+
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+from src.app.web.cache import daily_cache
+from src.pipeline.run_manager import finish_run
+from src.storage.migrate import init_db
+
+
+def _add_run(db_path: Path, run_id: str, started_at: datetime, title: str) -> None:
+    conn = duckdb.connect(str(db_path))
+    conn.execute(
+        "INSERT INTO fact_run (run_id, started_at, ended_at, status) VALUES (?, ?, ?, 'success')",
+        [run_id, started_at, started_at],
+    )
+    conn.execute(
+        """
+        INSERT INTO items (run_id, source_id, source_name, title, url, fetched_at)
+        VALUES (?, 's1', 'Source', ?, ?, ?)
+        """,
+        [run_id, title, f"https://example.com/{run_id}", started_at],
+    )
+    conn.close()
+
+
+@pytest.fixture
+def setup(monkeypatch, tmp_path: Path):
+    db_path = tmp_path / "web.duckdb"
+    monkeypatch.setenv("APP_SESSION_SECRET", "test-secret")
+    monkeypatch.setenv("APP_VIEWER_USER", "viewer")
+    monkeypatch.setenv("APP_VIEWER_PASS", "viewerpass")
+    monkeypatch.setenv("APP_DB_PATH", str(db_path))
+    init_db(db_path=db_path)
+    _add_run(db_path, "run-1", datetime(2024, 1, 1), "First headline")
+
+    import src.app.auth.deps as deps
+
+    deps.get_session_manager.cache_clear()
+    daily_cache.invalidate()
+    import src.app.main as main
+
+    importlib.reload(main)
+    with TestClient(main.app) as client:
+        main.app.state.database.run_lock_path = tmp_path / "run.lock"
+        client.post(
+            "/login",
+            data={"username": "viewer", "password": "viewerpass"},
+            follow_redirects=False,
+        )
+        yield client, db_path, main.app
+
+
+def test_daily_etag_and_not_modified(setup):
+    client, db_path, app = setup
+    first = client.get("/daily")
+    assert first.status_code == 200
+    assert "First headline" in first.text
+    etag = first.headers["etag"]
+
+    again = client.get("/daily", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    # A finished run invalidates the cache and changes the validator.
+    app.state.database.reopen()
+    _add_run(db_path, "run-2", datetime(2024, 1, 2), "Second headline")
+    finish_run("run-2", "success", conn=duckdb.connect(str(db_path)))
+    assert daily_cache.latest() is None
+
+    fresh = client.get("/daily", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert "Second headline" in fresh.text
+    assert fresh.headers["etag"] != etag
+
+
+def test_daily_serves_cached_page_while_run_holds_database(setup, tmp_path: Path):
+    client, _, _ = setup
+    first = client.get("/daily")
+
+    (tmp_path / "run.lock").write_text("running", encoding="utf-8")
+    during = client.get("/daily")
+    assert during.status_code == 200
+    assert "First headline" in during.text
+    assert during.headers["etag"] == first.headers["etag"]